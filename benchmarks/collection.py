@@ -0,0 +1,169 @@
+"""
+Génère une collection synthétique réaliste dans un dossier de données FlashMaster :
+textes de longueurs variées, images partagées entre cartes, historique de réponses.
+
+Utilisation :
+    python -m benchmarks.collection DOSSIER [--decks 10] [--cards 100000] [--backend sqlite]
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import struct
+import tempfile
+import time
+import zlib
+
+from models.deck_manager import DeckManager
+
+
+# Fichier écrit à la fin de la génération : un dossier sans ce fichier est incomplet
+MARKER_FILE = "collection.json"
+
+WORDS = (
+    "mémoire", "répétition", "espacée", "capitale", "fleuve", "montagne", "équation", "dérivée",
+    "intégrale", "théorème", "molécule", "atome", "cellule", "protéine", "siècle", "révolution",
+    "empire", "traité", "verbe", "subjonctif", "participe", "accord", "vocabulaire", "définition",
+    "synonyme", "antonyme", "exemple", "règle", "exception", "formule", "fonction", "variable",
+    "algorithme", "complexité", "tableau", "liste", "pays", "frontière", "population", "climat",
+    "énergie", "vitesse", "masse", "force", "onde", "lumière", "électron", "réaction", "acide",
+    "base", "peinture", "sculpture", "roman", "poème", "auteur", "œuvre", "musique", "accord",
+    "le", "la", "les", "de", "du", "des", "et", "ou", "en", "dans", "pour", "avec", "sur", "par",
+)
+
+
+def _text(rng, mean_words, max_words):
+    """Texte d'une longueur aléatoire (loi exponentielle de moyenne mean_words mots)."""
+    count = min(max_words, 1 + int(rng.expovariate(1 / mean_words)))
+    return " ".join(rng.choices(WORDS, k=count))
+
+
+def card_rows(rng, count):
+    """Paires (question, réponse) : questions courtes, réponses plus longues et plus variables."""
+    for index in range(count):
+        yield f"{_text(rng, 8, 30)} ({index}) ?", _text(rng, 18, 120)
+
+
+def _png(width, height, pixels):
+    """Fichier PNG d'une image RVB 8 bits (pixels : width * height * 3 octets, ligne par ligne)."""
+    def chunk(kind, data):
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+    row = width * 3
+    raw = b"".join(b"\x00" + pixels[y * row:(y + 1) * row] for y in range(height))
+    return (b"\x89PNG\r\n\x1a\n"
+            + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+            + chunk(b"IDAT", zlib.compress(raw, 1))
+            + chunk(b"IEND", b""))
+
+
+def make_media_pool(directory, rng, count=64):
+    """
+    Écrit count images PNG de bruit (de 8 à 64 Ko, incompressibles) dans directory :
+    elles se décodent comme de vraies images (miniatures, affichage en session d'étude).
+
+    Returns:
+        Liste des chemins des fichiers.
+    """
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for index in range(count):
+        width = rng.choice((64, 96, 128))
+        height = rng.randint(8, 64) * 1024 // (width * 3)
+        path = os.path.join(directory, f"image-{index}.png")
+        with open(path, "wb") as f:
+            f.write(_png(width, height, rng.randbytes(width * height * 3)))
+        paths.append(path)
+    return paths
+
+
+def generate_collection(data_dir, deck_count=10, cards_per_deck=100_000, backend="sqlite",
+                        media_ratio=0.05, studied_ratio=0.2, seed=0):
+    """
+    Génère une collection synthétique dans data_dir (qui ne doit pas encore exister).
+
+    Args:
+        data_dir: Le dossier de données à créer.
+        deck_count: Nombre de decks.
+        cards_per_deck: Nombre de cartes par deck.
+        backend: Le moteur de stockage ('sqlite', 'shards' ou 'json').
+        media_ratio: Part des cartes illustrées par une image (tirée d'un lot de 64 images partagées).
+        studied_ratio: Part des cartes ayant déjà reçu de une à trois réponses.
+        seed: Graine du générateur aléatoire (même graine, même collection).
+
+    Returns:
+        Dictionnaire décrivant la collection (paramètres et durée de génération).
+    """
+    rng = random.Random(seed)
+    start = time.perf_counter()
+    media_dir = tempfile.mkdtemp(prefix="flashmaster-media-")
+    try:
+        pool = make_media_pool(media_dir, rng)
+        deck_manager = DeckManager(data_dir, backend=backend, max_loaded_decks=None)
+        try:
+            for number in range(deck_count):
+                with deck_manager.batch():
+                    deck_id = deck_manager.create_deck(f"Deck {number}", _text(rng, 10, 40))
+                    deck_manager.import_cards(deck_id, card_rows(rng, cards_per_deck))
+                    for card in deck_manager.get_cards(deck_id):
+                        if rng.random() < media_ratio:
+                            deck_manager.add_media_to_card(deck_id, card.id, "image", rng.choice(pool))
+                        if rng.random() < studied_ratio:
+                            for _ in range(rng.randint(1, 3)):
+                                deck_manager.update_card_result(deck_id, card.id, rng.random() < 0.85)
+                # Les cartes du deck terminé sont libérées (moteurs à chargement différé)
+                deck_manager.flush()
+                deck_manager.evict_deck(deck_id)
+        finally:
+            deck_manager.close()
+    finally:
+        shutil.rmtree(media_dir, ignore_errors=True)
+
+    description = {
+        "backend": backend,
+        "decks": deck_count,
+        "cards_per_deck": cards_per_deck,
+        "media_ratio": media_ratio,
+        "studied_ratio": studied_ratio,
+        "seed": seed,
+        "generation_seconds": round(time.perf_counter() - start, 3),
+    }
+    with open(os.path.join(data_dir, MARKER_FILE), "w", encoding="utf-8") as f:
+        json.dump(description, f, indent=2)
+    return description
+
+
+def cached_collection(cache_dir, deck_count, cards_per_deck, backend, seed=0):
+    """
+    Retourne le dossier d'une collection générée dans cache_dir, en la générant si nécessaire
+    (une génération interrompue est recommencée).
+    """
+    data_dir = os.path.join(cache_dir, f"{backend}-{deck_count}x{cards_per_deck}-seed{seed}")
+    if not os.path.exists(os.path.join(data_dir, MARKER_FILE)):
+        shutil.rmtree(data_dir, ignore_errors=True)
+        generate_collection(data_dir, deck_count, cards_per_deck, backend, seed=seed)
+    return data_dir
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("data_dir", help="dossier de données à créer")
+    parser.add_argument("--decks", type=int, default=10, help="nombre de decks")
+    parser.add_argument("--cards", type=int, default=100_000, help="nombre de cartes par deck")
+    parser.add_argument("--backend", default="sqlite", choices=("sqlite", "shards", "json"))
+    parser.add_argument("--media", type=float, default=0.05, help="part des cartes illustrées")
+    parser.add_argument("--studied", type=float, default=0.2, help="part des cartes déjà étudiées")
+    parser.add_argument("--seed", type=int, default=0, help="graine du générateur aléatoire")
+    args = parser.parse_args()
+
+    if os.path.exists(args.data_dir):
+        parser.error(f"le dossier existe déjà : {args.data_dir}")
+    description = generate_collection(args.data_dir, args.decks, args.cards, args.backend,
+                                      args.media, args.studied, args.seed)
+    print(f"{args.decks} decks de {args.cards} cartes ({args.backend}) générés "
+          f"en {description['generation_seconds']:.1f} s dans {args.data_dir}")
+
+
+if __name__ == "__main__":
+    main()
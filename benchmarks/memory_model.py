@@ -0,0 +1,94 @@
+"""
+Compare l'empreinte mémoire d'une collection synthétique selon sa représentation :
+dictionnaires au format JSON historique, ou objets Deck/Card à __slots__.
+
+Utilisation :
+    python -m benchmarks.memory_model [--cards 200000] [--decks 20]
+"""
+import argparse
+import gc
+import time
+import tracemalloc
+import uuid
+from datetime import datetime
+
+from models.entities import Card, Deck, DeckSummary
+
+
+def _card_texts(index):
+    """Textes recto/verso de longueur réaliste pour la carte numéro index."""
+    return (f"Question {index} : quel est le sens du mot numéro {index} ?",
+            f"Réponse {index} : définition détaillée du mot numéro {index}.")
+
+
+def build_dict_collection(deck_count, card_count):
+    """Construit la collection au format historique (dictionnaires, dates ISO, uuid en texte)."""
+    decks = []
+    now = datetime.now().isoformat()
+    for d in range(deck_count):
+        deck = {"id": str(uuid.uuid4()), "name": f"Deck {d}", "description": "",
+                "created_at": now, "last_studied": None, "cards": []}
+        for i in range(d, card_count, deck_count):
+            front, back = _card_texts(i)
+            deck["cards"].append({
+                "id": str(uuid.uuid4()),
+                "front": front,
+                "back": back,
+                "created_at": datetime.now().isoformat(),
+                "correct_count": 0,
+                "incorrect_count": 0,
+                "media": []
+            })
+        decks.append(deck)
+    return decks
+
+
+def build_object_collection(deck_count, card_count):
+    """Construit la même collection avec les objets Deck/Card."""
+    decks = []
+    now = int(time.time())
+    for d in range(deck_count):
+        deck = Deck(str(uuid.uuid4()), f"Deck {d}", "", now, summary=DeckSummary(), cards=[])
+        for i in range(d, card_count, deck_count):
+            front, back = _card_texts(i)
+            deck.cards.append(Card(str(uuid.uuid4()), front, back, int(time.time())))
+        deck.summary.card_count = len(deck.cards)
+        decks.append(deck)
+    return decks
+
+
+def measure(builder, deck_count, card_count):
+    """
+    Mesure la mémoire allouée par une collection construite par builder.
+
+    Returns:
+        Nombre d'octets encore alloués une fois la collection construite.
+    """
+    gc.collect()
+    tracemalloc.start()
+    collection = builder(deck_count, card_count)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del collection
+    gc.collect()
+    return size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--cards", type=int, default=200_000, help="nombre total de cartes")
+    parser.add_argument("--decks", type=int, default=20, help="nombre de decks")
+    args = parser.parse_args()
+
+    dict_size = measure(build_dict_collection, args.decks, args.cards)
+    object_size = measure(build_object_collection, args.decks, args.cards)
+
+    mb = 1024 * 1024
+    print(f"Collection : {args.cards} cartes dans {args.decks} decks")
+    print(f"  dictionnaires : {dict_size / mb:8.1f} Mo ({dict_size / args.cards:6.0f} octets/carte)")
+    print(f"  objets slots  : {object_size / mb:8.1f} Mo ({object_size / args.cards:6.0f} octets/carte)")
+    print(f"  gain          : {(1 - object_size / dict_size) * 100:8.1f} %")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,336 @@
+"""
+Mesure les opérations principales du DeckManager sur des collections synthétiques de plusieurs tailles,
+et compare les résultats à une référence enregistrée (détection des régressions).
+
+Utilisation :
+    python -m benchmarks.suite [--sizes 100,1000,10000] [--decks 10] [--backends sqlite,shards,json]
+                               [--save NOM | --output FICHIER] [--compare NOM|FICHIER] [--threshold 0.5]
+    python -m benchmarks.suite --compare reference --against resultats.json
+
+Les références sont enregistrées dans benchmarks/baselines/<NOM>.json. Les collections générées
+sont gardées dans le dossier --cache (par défaut dans le dossier temporaire) et réutilisées ;
+chaque répétition travaille sur une copie, qui n'est jamais conservée.
+Le code de sortie vaut 1 si une régression est détectée, ce qui permet de vérifier chaque
+modification du stockage par un simple appel, et 2 si les résultats ne sont pas comparables
+à la référence (paramètres de mesure différents, aucune mesure commune).
+"""
+import argparse
+import io
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+from datetime import datetime
+
+from benchmarks.collection import cached_collection
+from models.deck_manager import DeckManager
+
+
+BASELINE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines")
+RESULTS_FORMAT = 1
+
+# Opérations mesurées, dans l'ordre d'exécution, et unité de leur durée
+OPERATIONS = (
+    ("load_decks", "appel"),
+    ("get_deck_stats", "appel"),
+    ("load_cards", "deck"),
+    ("get_study_cards", "deck"),
+    ("create_card", "carte"),
+    ("update_card_result", "réponse"),
+    ("save_decks", "appel"),
+)
+
+WRITES = 200            # Cartes créées et réponses enregistrées par répétition, au plus
+WRITE_BUDGET = 2.0      # Durée maximale de chaque série d'écritures, en secondes
+STATS_CALLS = 1000      # Appels à get_deck_stats par répétition
+MIN_DELTA = 1e-5        # Écart minimal (en secondes) pour qu'un ralentissement compte comme régression
+
+
+def _timed(function, *args):
+    """Exécute function et retourne (résultat, durée en secondes)."""
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def _timed_calls(function, count, budget=WRITE_BUDGET):
+    """
+    Appelle function(index) jusqu'à count fois, en s'arrêtant après budget secondes
+    (au moins 3 appels) : les écritures qui réécrivent tout un fichier restent mesurables.
+
+    Returns:
+        Tuple (liste des résultats, durée moyenne d'un appel en secondes).
+    """
+    results = []
+    start = time.perf_counter()
+    while len(results) < count and (len(results) < 3 or time.perf_counter() - start < budget):
+        results.append(function(len(results)))
+    return results, (time.perf_counter() - start) / len(results)
+
+
+def run_once(source_dir, backend):
+    """
+    Mesure une fois chaque opération sur une copie de la collection de source_dir : chaque mesure
+    porte sur la collection générée, sans les cartes et les réponses ajoutées par les précédentes.
+
+    Les écritures sont synchrones (background_writes=False) : chaque mesure comprend le travail
+    du moteur de stockage, sans le délai de regroupement du thread d'écriture.
+
+    Returns:
+        Dictionnaire opération -> durée d'une opération, en secondes.
+
+    Raises:
+        RuntimeError: Si le stockage a signalé une erreur (une écriture échouée serait mesurée
+            comme une écriture rapide).
+    """
+    work_dir = tempfile.mkdtemp(prefix="flashmaster-bench-")
+    try:
+        data_dir = os.path.join(work_dir, "data")
+        shutil.copytree(source_dir, data_dir)
+        # Les moteurs signalent leurs erreurs par un message : il est capturé pour faire échouer la mesure
+        output = io.StringIO()
+        with redirect_stdout(output):
+            timings = _measure(data_dir, backend)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    errors = [line for line in output.getvalue().splitlines() if line.startswith("Erreur")]
+    if errors:
+        raise RuntimeError(f"{backend} : {errors[0]} ({len(errors)} erreur(s))")
+    return timings
+
+
+def _measure(data_dir, backend):
+    """Mesure une fois chaque opération sur la collection de data_dir (modifiée par les écritures)."""
+    timings = {}
+    deck_manager = DeckManager(data_dir, backend=backend, max_loaded_decks=None,
+                               background_writes=False, load=False)
+    try:
+        _, timings["load_decks"] = _timed(deck_manager.load_decks)
+        deck_ids = [deck.id for deck in deck_manager.get_decks()]
+
+        start = time.perf_counter()
+        for index in range(STATS_CALLS):
+            deck_manager.get_deck_stats(deck_ids[index % len(deck_ids)])
+        timings["get_deck_stats"] = (time.perf_counter() - start) / STATS_CALLS
+
+        # Première lecture des cartes de chaque deck, puis première sélection des cartes
+        # à étudier (construction de la file de révision du deck)
+        start = time.perf_counter()
+        for deck_id in deck_ids:
+            deck_manager.get_cards(deck_id)
+        timings["load_cards"] = (time.perf_counter() - start) / len(deck_ids)
+
+        start = time.perf_counter()
+        for deck_id in deck_ids:
+            deck_manager.get_study_cards(deck_id)
+        timings["get_study_cards"] = (time.perf_counter() - start) / len(deck_ids)
+
+        deck_id = deck_ids[0]
+        created, timings["create_card"] = _timed_calls(
+            lambda index: deck_manager.create_card(deck_id, f"Question de mesure {index} ?", "Réponse de mesure"),
+            WRITES)
+        # Chaque carte créée reçoit trois bonnes réponses puis une erreur, qui remet son intervalle
+        # à un jour : l'échéance reste réaliste même quand peu de cartes ont pu être créées
+        _, timings["update_card_result"] = _timed_calls(
+            lambda index: deck_manager.update_card_result(
+                deck_id, created[index % len(created)], (index // len(created)) % 4 != 3),
+            WRITES)
+
+        start = time.perf_counter()
+        deck_manager.save_decks()
+        timings["save_decks"] = time.perf_counter() - start
+    finally:
+        deck_manager.close()
+    return timings
+
+
+def run_suite(sizes, deck_count, backends, repeat, cache_dir, seed=0, log=print):
+    """
+    Mesure les opérations pour chaque moteur et chaque taille de collection.
+
+    Args:
+        sizes: Nombres de cartes par deck.
+        deck_count: Nombre de decks des collections.
+        backends: Moteurs de stockage mesurés.
+        repeat: Nombre de répétitions ; la plus rapide est retenue (le bruit de mesure
+            ne fait que ralentir une mesure, jamais l'accélérer).
+        cache_dir: Dossier des collections générées.
+        seed: Graine des collections.
+        log: Fonction d'affichage de la progression.
+
+    Returns:
+        Dictionnaire des résultats, au format des fichiers de référence.
+    """
+    results = []
+    for backend in backends:
+        for size in sizes:
+            log(f"{backend} : {deck_count} decks de {size} cartes...")
+            data_dir = cached_collection(cache_dir, deck_count, size, backend, seed)
+            runs = [run_once(data_dir, backend) for _ in range(repeat)]
+            for operation, unit in OPERATIONS:
+                results.append({
+                    "backend": backend,
+                    "cards_per_deck": size,
+                    "operation": operation,
+                    "unit": unit,
+                    "seconds": min(run[operation] for run in runs),
+                })
+
+    return {
+        "format": RESULTS_FORMAT,
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "machine": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "processor": platform.processor() or platform.machine(),
+            "cpu_count": os.cpu_count(),
+        },
+        "settings": {"decks": deck_count, "repeat": repeat, "seed": seed, "writes": WRITES,
+                     "write_budget": WRITE_BUDGET, "stats_calls": STATS_CALLS},
+        "results": results,
+    }
+
+
+def baseline_path(name_or_path):
+    """Chemin d'un fichier de résultats : un nom simple désigne une référence de benchmarks/baselines."""
+    if os.sep in name_or_path or name_or_path.endswith(".json"):
+        return name_or_path
+    return os.path.join(BASELINE_DIR, f"{name_or_path}.json")
+
+
+def load_results(name_or_path):
+    """Lit un fichier de résultats (ou une référence désignée par son nom)."""
+    with open(baseline_path(name_or_path), "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_results(results, name_or_path):
+    """Enregistre des résultats en JSON et retourne le chemin du fichier écrit."""
+    path = baseline_path(name_or_path)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2, ensure_ascii=False)
+        f.write("\n")
+    return path
+
+
+def settings_mismatch(baseline, current):
+    """
+    Retourne les paramètres de mesure qui diffèrent entre deux résultats (liste vide s'ils sont
+    comparables) : des mesures faites dans d'autres conditions ne disent rien d'une régression.
+    """
+    keys = sorted(set(baseline["settings"]) | set(current["settings"]))
+    return [f"{key} : {baseline['settings'].get(key)} -> {current['settings'].get(key)}"
+            for key in keys if baseline["settings"].get(key) != current["settings"].get(key)]
+
+
+def compare_results(baseline, current, threshold=0.5, min_delta=MIN_DELTA):
+    """
+    Compare deux résultats mesure par mesure (même moteur, même taille, même opération).
+
+    Une mesure est une régression si elle est plus lente que la référence de plus de threshold
+    (en proportion) et d'au moins min_delta secondes : les écarts de quelques microsecondes
+    sur les opérations très rapides relèvent du bruit de mesure.
+
+    Returns:
+        Liste de tuples (moteur, taille, opération, référence, mesure, rapport, régression),
+        dans l'ordre des résultats courants ; les mesures absentes de la référence sont ignorées.
+    """
+    reference = {(entry["backend"], entry["cards_per_deck"], entry["operation"]): entry["seconds"]
+                 for entry in baseline["results"]}
+    rows = []
+    for entry in current["results"]:
+        key = (entry["backend"], entry["cards_per_deck"], entry["operation"])
+        before = reference.get(key)
+        if before is None:
+            continue
+        after = entry["seconds"]
+        ratio = after / before if before > 0 else float("inf")
+        regression = ratio > 1 + threshold and after - before >= min_delta
+        rows.append(key + (before, after, ratio, regression))
+    return rows
+
+
+def _format_seconds(seconds):
+    """Durée dans l'unité la plus lisible (s, ms ou µs), sur une largeur fixe."""
+    if seconds >= 1:
+        return f"{seconds:8.2f} s "
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:8.2f} ms"
+    return f"{seconds * 1e6:8.1f} µs"
+
+
+def print_results(results):
+    """Affiche le tableau des résultats."""
+    print(f"{'moteur':<8}{'cartes/deck':>12}  {'opération':<20}{'durée':>12}")
+    for entry in results["results"]:
+        print(f"{entry['backend']:<8}{entry['cards_per_deck']:>12}  {entry['operation']:<20}"
+              f"{_format_seconds(entry['seconds'])} / {entry['unit']}")
+
+
+def print_comparison(rows, threshold):
+    """Affiche la comparaison avec la référence, régressions signalées."""
+    print(f"{'moteur':<8}{'cartes/deck':>12}  {'opération':<20}{'référence':>12}{'mesure':>12}{'écart':>9}")
+    for backend, size, operation, before, after, ratio, regression in rows:
+        flag = "  RÉGRESSION" if regression else ""
+        print(f"{backend:<8}{size:>12}  {operation:<20}{_format_seconds(before)}{_format_seconds(after)}"
+              f"{(ratio - 1) * 100:+8.1f}%{flag}")
+    regressions = sum(1 for row in rows if row[-1])
+    print(f"{regressions} régression(s) au-delà de {threshold * 100:.0f} % sur {len(rows)} mesure(s)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default="100,1000,10000",
+                        help="nombres de cartes par deck, séparés par des virgules")
+    parser.add_argument("--decks", type=int, default=10, help="nombre de decks des collections")
+    parser.add_argument("--backends", default="sqlite,shards,json", help="moteurs de stockage mesurés")
+    parser.add_argument("--repeat", type=int, default=5, help="nombre de répétitions (la plus rapide est retenue)")
+    parser.add_argument("--seed", type=int, default=0, help="graine des collections générées")
+    parser.add_argument("--cache", default=os.path.join(tempfile.gettempdir(), "flashmaster-benchmarks"),
+                        help="dossier des collections générées, réutilisées d'une exécution à l'autre")
+    parser.add_argument("--save", metavar="NOM", help="enregistre les résultats comme référence NOM")
+    parser.add_argument("--output", metavar="FICHIER", help="enregistre les résultats dans FICHIER")
+    parser.add_argument("--compare", metavar="NOM|FICHIER", help="référence à laquelle comparer les résultats")
+    parser.add_argument("--against", metavar="FICHIER",
+                        help="résultats déjà enregistrés à comparer (au lieu de lancer les mesures)")
+    parser.add_argument("--threshold", type=float, default=0.5,
+                        help="ralentissement relatif signalé comme régression (0.5 pour 50 %%)")
+    args = parser.parse_args()
+
+    if args.against and not args.compare:
+        parser.error("--against demande --compare")
+
+    if args.against:
+        current = load_results(args.against)
+    else:
+        sizes = [int(size) for size in args.sizes.split(",")]
+        backends = [backend.strip() for backend in args.backends.split(",")]
+        current = run_suite(sizes, args.decks, backends, args.repeat, args.cache, args.seed)
+        print_results(current)
+        for target in filter(None, (args.save, args.output)):
+            print(f"Résultats enregistrés dans {save_results(current, target)}")
+
+    if args.compare:
+        baseline = load_results(args.compare)
+        mismatch = settings_mismatch(baseline, current)
+        if mismatch:
+            print("Comparaison impossible, les paramètres de mesure diffèrent de la référence :")
+            print("\n".join(f"  {line}" for line in mismatch))
+            sys.exit(2)
+        rows = compare_results(baseline, current, args.threshold)
+        if not rows:
+            print("Comparaison impossible : aucune mesure commune avec la référence (moteurs ou tailles)")
+            sys.exit(2)
+        print_comparison(rows, args.threshold)
+        if any(row[-1] for row in rows):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,352 @@
+"""
+Mesure la réactivité de l'interface sur une collection synthétique, sans écran (plateforme Qt offscreen) :
+les vraies fenêtres sont pilotées par un scénario (ouverture de la fenêtre, liste des decks, vues des decks,
+ajout de cartes, session d'étude, statistiques), et chaque action est chronométrée jusqu'au retour
+dans la boucle d'événements, dessin compris.
+
+Utilisation :
+    python -m benchmarks.ui_latency [--decks 10] [--cards 10000] [--answers 1000] [--backend sqlite]
+                                    [--save NOM | --output FICHIER] [--compare NOM|FICHIER] [--threshold 0.5]
+
+Les résultats ont le format de benchmarks.suite (références dans benchmarks/baselines/), avec en plus
+la mémoire maximale du processus ; le code de sortie vaut 1 si une action ou la mémoire a régressé,
+2 si les résultats ne sont pas comparables à la référence.
+"""
+import argparse
+import multiprocessing
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+try:
+    import resource
+except ImportError:  # Windows : la mémoire maximale n'est pas mesurée
+    resource = None
+
+# Sans écran : la plateforme doit être choisie avant la création de l'application Qt
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtCore import QEventLoop, QTimer
+from PyQt5.QtWidgets import QApplication, QDialog, QMessageBox
+
+from benchmarks.collection import cached_collection
+from benchmarks.suite import (RESULTS_FORMAT, compare_results, load_results, print_comparison, save_results,
+                              settings_mismatch)
+from models.deck_manager import DeckManager
+from ui.card_editor import CardEditorDialog
+from ui.main_window import MainWindow
+from ui.style import apply_stylesheet
+
+
+REPEAT = 20             # Répétitions des actions rapides (liste des decks, tableau des cartes, ajout de carte)
+MIN_DELTA = 2e-3        # Écart minimal (en secondes) d'une régression : les actions uniques varient de l'ordre de la ms
+
+
+def settle():
+    """
+    Laisse la boucle d'événements traiter tout ce qu'une action a mis en attente (mises à jour,
+    dessin des widgets) : un minuteur à zéro ne se déclenche qu'après les événements déjà postés.
+    """
+    loop = QEventLoop()
+    QTimer.singleShot(0, loop.quit)
+    loop.exec_()
+
+
+def peak_rss_kb():
+    """Mémoire maximale du processus depuis son lancement, en Ko (None si la plateforme ne la fournit pas)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak  # Octets sous macOS, Ko sous Linux
+
+
+class LatencyRecorder:
+    """Durées des actions de l'interface, regroupées par opération, et mémoire maximale après chaque étape."""
+
+    def __init__(self):
+        self.samples = {}   # opération -> durées en secondes, dans l'ordre
+        self.units = {}     # opération -> unité d'une durée
+        self.memory = []    # (étape, mémoire maximale en Ko), dans l'ordre
+
+    def measure(self, operation, unit, action, *args):
+        """
+        Exécute action(*args) et la chronomètre jusqu'au retour dans la boucle d'événements.
+
+        Returns:
+            Le résultat de l'action.
+        """
+        start = time.perf_counter()
+        result = action(*args)
+        settle()
+        self.samples.setdefault(operation, []).append(time.perf_counter() - start)
+        self.units[operation] = unit
+        return result
+
+    def record(self, operation, unit, seconds):
+        """Ajoute une durée mesurée ailleurs (par exemple dans un thread de travail)."""
+        self.samples.setdefault(operation, []).append(seconds)
+        self.units[operation] = unit
+
+    def checkpoint(self, step):
+        """Note la mémoire maximale atteinte à la fin d'une étape du scénario."""
+        self.memory.append((step, peak_rss_kb()))
+
+
+def _percentile(values, fraction):
+    """Valeur de rang fraction (entre 0 et 1) des valeurs triées, sans interpolation."""
+    ordered = sorted(values)
+    return ordered[round(fraction * (len(ordered) - 1))]
+
+
+def _scripted_card_editor(dialog):
+    """Remplace la saisie dans la boîte de dialogue d'ajout de carte : le dialogue est accepté aussitôt."""
+    dialog.front_edit.setPlainText("Question ajoutée pendant la mesure ?")
+    dialog.back_edit.setPlainText("Réponse ajoutée pendant la mesure")
+    return QDialog.Accepted
+
+
+def run_scenario(data_dir, backend, answers, log=print):
+    """
+    Joue le scénario de l'interface sur la collection de data_dir (qui est modifiée).
+
+    Les boîtes de dialogue modales sont remplacées pendant le scénario : l'éditeur de carte est accepté
+    avec un texte fixe et le message de fin de session n'est pas affiché.
+
+    Args:
+        data_dir: Dossier de données de la collection.
+        backend: Moteur de stockage de la collection.
+        answers: Nombre de cartes à répondre dans la session d'étude (au plus).
+        log: Fonction d'affichage de la progression.
+
+    Returns:
+        LatencyRecorder contenant les mesures.
+    """
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    apply_stylesheet(app)
+    recorder = LatencyRecorder()
+    recorder.checkpoint("Application Qt")
+
+    card_editor_exec = CardEditorDialog.exec_
+    message_box_information = QMessageBox.information
+    CardEditorDialog.exec_ = _scripted_card_editor
+    QMessageBox.information = staticmethod(lambda *args, **kwargs: QMessageBox.Ok)
+
+    # Sans quotas quotidiens (la génération de la collection les a déjà entamés) : la session d'étude
+    # compte toutes les cartes du deck, et le scénario s'arrête après answers réponses
+    deck_manager = DeckManager(data_dir, backend=backend, new_cards_per_day=sys.maxsize,
+                               reviews_per_day=sys.maxsize, load=False)
+    window = None
+    try:
+        log("Fenêtre principale et liste des decks...")
+        start = time.perf_counter()
+
+        def build_window():
+            built = MainWindow(deck_manager)
+            built.show()
+            return built
+
+        window = recorder.measure("window_build", "vue", build_window)
+        if window.loader is not None:
+            ready = QEventLoop()
+            window.decks_ready.connect(ready.quit)
+            ready.exec_()
+            settle()
+        recorder.record("deck_list_ready", "vue", time.perf_counter() - start)
+        for _ in range(REPEAT):
+            recorder.measure("refresh_deck_list", "appel", window.refresh_deck_list)
+        recorder.checkpoint("Liste des decks")
+
+        log("Vues des decks...")
+        deck_ids = [deck.id for deck in deck_manager.get_decks()]
+        for deck_id in deck_ids:
+            recorder.measure("deck_view_build", "vue", window.select_deck, deck_id)
+        # Réaffichage des vues gardées en cache (les plus récentes), remises à jour sans être reconstruites
+        for deck_id in reversed(deck_ids[-window.max_cached_views:]):
+            recorder.measure("deck_view_show", "vue", window.select_deck, deck_id)
+        recorder.checkpoint("Vues des decks")
+
+        deck_id = deck_ids[-1]
+        window.select_deck(deck_id)
+        settle()
+        deck_view = window.view_cache.get(("deck", deck_id))
+        for _ in range(REPEAT):
+            recorder.measure("refresh_cards", "appel", deck_view.refresh_cards)
+        for _ in range(REPEAT):
+            recorder.measure("add_card", "carte", deck_view.add_card)
+        recorder.checkpoint("Tableau des cartes")
+
+        log(f"Session d'étude ({answers} cartes)...")
+        recorder.measure("study_view_build", "vue", deck_view.start_study)
+        study_view = window.view_cache.get(("study", deck_id))
+        answered = 0
+        while answered < answers and not study_view.session.finished:
+            recorder.measure("reveal_answer", "carte", study_view.toggle_answer)
+            recorder.measure("next_card", "réponse", study_view.process_answer, answered % 5 != 0)
+            answered += 1
+        if answered < answers:
+            log(f"  session terminée après {answered} réponses")
+        recorder.measure("close_study_view", "vue", study_view.return_to_deck)
+        recorder.checkpoint("Session d'étude")
+
+        log("Statistiques...")
+        recorder.measure("stats_view_build", "vue", window.show_stats_view, deck_id)
+        recorder.measure("stats_view_build", "vue", window.show_stats_view)
+        recorder.checkpoint("Statistiques")
+    finally:
+        if window is not None:
+            window.close()
+            settle()
+        deck_manager.close()
+        CardEditorDialog.exec_ = card_editor_exec
+        QMessageBox.information = message_box_information
+    return recorder
+
+
+def _generate_collection(cache_dir, deck_count, cards_per_deck, backend, seed):
+    """
+    Génère la collection dans un processus à part : la mémoire de la génération ne compte pas
+    dans la mémoire maximale mesurée pendant le scénario.
+    """
+    process = multiprocessing.Process(target=cached_collection,
+                                      args=(cache_dir, deck_count, cards_per_deck, backend, seed))
+    process.start()
+    process.join()
+    if process.exitcode != 0:
+        raise RuntimeError("échec de la génération de la collection")
+    return cached_collection(cache_dir, deck_count, cards_per_deck, backend, seed)
+
+
+def run_harness(deck_count, cards_per_deck, backend, answers, cache_dir, seed=0, log=print):
+    """
+    Joue le scénario de l'interface sur une copie d'une collection synthétique.
+
+    Args:
+        deck_count: Nombre de decks de la collection.
+        cards_per_deck: Nombre de cartes par deck.
+        backend: Moteur de stockage.
+        answers: Nombre de cartes à répondre dans la session d'étude.
+        cache_dir: Dossier des collections générées (la collection n'y est jamais modifiée).
+        seed: Graine de la collection.
+        log: Fonction d'affichage de la progression.
+
+    Returns:
+        Dictionnaire des résultats, au format des fichiers de référence de benchmarks.suite ;
+        chaque durée est la médiane des répétitions de l'action, complétée du 95e centile et du maximum.
+    """
+    source = _generate_collection(cache_dir, deck_count, cards_per_deck, backend, seed)
+    work_dir = tempfile.mkdtemp(prefix="flashmaster-ui-")
+    try:
+        data_dir = os.path.join(work_dir, "data")
+        shutil.copytree(source, data_dir)
+        recorder = run_scenario(data_dir, backend, answers, log)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    results = []
+    for operation, samples in recorder.samples.items():
+        results.append({
+            "backend": backend,
+            "cards_per_deck": cards_per_deck,
+            "operation": operation,
+            "unit": recorder.units[operation],
+            "seconds": _percentile(samples, 0.5),
+            "p95": _percentile(samples, 0.95),
+            "max": max(samples),
+            "count": len(samples),
+        })
+
+    return {
+        "format": RESULTS_FORMAT,
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "machine": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "processor": platform.processor() or platform.machine(),
+            "cpu_count": os.cpu_count(),
+            "qt_platform": os.environ["QT_QPA_PLATFORM"],
+        },
+        "settings": {"decks": deck_count, "answers": answers, "seed": seed, "repeat": REPEAT},
+        "results": results,
+        "memory": {"peak_rss_kb": peak_rss_kb(), "steps": [list(step) for step in recorder.memory]},
+    }
+
+
+def _format_ms(seconds):
+    """Durée en millisecondes, sur une largeur fixe."""
+    return f"{seconds * 1e3:9.2f}"
+
+
+def print_results(results):
+    """Affiche les durées des actions (médiane, 95e centile, maximum) et la mémoire maximale par étape."""
+    print(f"{'opération':<20}{'médiane':>10}{'95e c.':>10}{'max':>10}  (ms)")
+    for entry in results["results"]:
+        print(f"{entry['operation']:<20}{_format_ms(entry['seconds'])} {_format_ms(entry['p95'])} "
+              f"{_format_ms(entry['max'])}  / {entry['unit']} x {entry['count']}")
+    if results["memory"]["peak_rss_kb"] is not None:
+        print("Mémoire maximale (Mo) :")
+        for step, peak in results["memory"]["steps"]:
+            print(f"  {step:<20}{peak / 1024:9.1f}")
+
+
+def compare_memory(baseline, current, threshold):
+    """
+    Compare la mémoire maximale à celle de la référence.
+
+    Returns:
+        True si elle a augmenté de plus de threshold (en proportion).
+    """
+    before = baseline.get("memory", {}).get("peak_rss_kb")
+    after = current["memory"]["peak_rss_kb"]
+    if not before or after is None:
+        return False
+    ratio = after / before
+    regression = ratio > 1 + threshold
+    flag = "  RÉGRESSION" if regression else ""
+    print(f"Mémoire maximale : {before / 1024:.1f} Mo -> {after / 1024:.1f} Mo ({(ratio - 1) * 100:+.1f}%){flag}")
+    return regression
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--decks", type=int, default=10, help="nombre de decks de la collection")
+    parser.add_argument("--cards", type=int, default=10_000, help="nombre de cartes par deck")
+    parser.add_argument("--answers", type=int, default=1000, help="nombre de cartes répondues en session d'étude")
+    parser.add_argument("--backend", default="sqlite", choices=("sqlite", "shards", "json"))
+    parser.add_argument("--seed", type=int, default=0, help="graine de la collection générée")
+    parser.add_argument("--cache", default=os.path.join(tempfile.gettempdir(), "flashmaster-benchmarks"),
+                        help="dossier des collections générées, réutilisées d'une exécution à l'autre")
+    parser.add_argument("--save", metavar="NOM", help="enregistre les résultats comme référence NOM")
+    parser.add_argument("--output", metavar="FICHIER", help="enregistre les résultats dans FICHIER")
+    parser.add_argument("--compare", metavar="NOM|FICHIER", help="référence à laquelle comparer les résultats")
+    parser.add_argument("--threshold", type=float, default=0.5,
+                        help="ralentissement relatif signalé comme régression (0.5 pour 50 %%)")
+    args = parser.parse_args()
+
+    results = run_harness(args.decks, args.cards, args.backend, args.answers, args.cache, args.seed)
+    print_results(results)
+    for target in filter(None, (args.save, args.output)):
+        print(f"Résultats enregistrés dans {save_results(results, target)}")
+
+    if args.compare:
+        baseline = load_results(args.compare)
+        mismatch = settings_mismatch(baseline, results)
+        if mismatch:
+            print("Comparaison impossible, les paramètres de mesure diffèrent de la référence :")
+            print("\n".join(f"  {line}" for line in mismatch))
+            sys.exit(2)
+        rows = compare_results(baseline, results, args.threshold, MIN_DELTA)
+        if not rows:
+            print("Comparaison impossible : aucune mesure commune avec la référence (moteurs ou tailles)")
+            sys.exit(2)
+        print_comparison(rows, args.threshold)
+        memory_regression = compare_memory(baseline, results, args.threshold)
+        if memory_regression or any(row[-1] for row in rows):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
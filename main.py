@@ -1,28 +1,118 @@
 import sys
+import time
+
+# Début du démarrage : référence des mesures de --startup-profile
+START_TIME = time.perf_counter()
+
+from PyQt5.QtCore import QObject, QEvent, QTimer
 from PyQt5.QtWidgets import QApplication
 from ui.main_window import MainWindow
 from models.deck_manager import DeckManager
 from ui.style import apply_stylesheet
 
+IMPORTS_TIME = time.perf_counter()
+
+
+class StartupProfile(QObject):
+    """
+    Mesure les étapes du démarrage et en affiche le détail (option --startup-profile).
+
+    Le chargement des decks se fait dans un thread de travail, en même temps que le premier
+    affichage de la fenêtre : le détail est affiché quand les deux sont terminés.
+    """
+
+    def __init__(self, start):
+        """
+        Constructeur du profil de démarrage.
+
+        :param start: Instant du début du démarrage (time.perf_counter)
+        """
+        super().__init__()
+        self.start = start
+        self.last = start
+        self.steps = []           # (étape, durée en secondes), dans l'ordre
+        self.window = None
+        self.shown_at = None      # Fin du premier affichage de la fenêtre
+        self.ready_at = None      # Liste des decks remplie
+
+    def step(self, name, now=None):
+        """Termine une étape du démarrage, commencée à la fin de la précédente."""
+        now = time.perf_counter() if now is None else now
+        self.steps.append((name, now - self.last))
+        self.last = now
+
+    def watch(self, window):
+        """Suit le premier affichage de la fenêtre et la fin du chargement des decks."""
+        self.window = window
+        window.installEventFilter(self)
+        window.decks_ready.connect(self.decks_ready)
+
+    def eventFilter(self, watched, event):
+        if event.type() == QEvent.Paint and self.shown_at is None:
+            watched.removeEventFilter(self)
+            # Le reste de la fenêtre est dessiné dans la foulée : mesure au retour dans la boucle d'événements
+            QTimer.singleShot(0, self.first_paint)
+        return False
+
+    def first_paint(self):
+        self.shown_at = time.perf_counter()
+        self.step("Premier affichage", self.shown_at)
+        self.report()
+
+    def decks_ready(self):
+        self.ready_at = time.perf_counter()
+        self.report()
+
+    def report(self):
+        """Affiche le détail du démarrage, une fois la fenêtre affichée et les decks chargés."""
+        if self.shown_at is None or self.ready_at is None:
+            return
+        lines = ["Démarrage de FlashMaster (ms) :"]
+        lines += [f"  {name:<32}{seconds * 1000:9.1f}" for name, seconds in self.steps]
+        lines.append(f"  {'Chargement des decks':<32}{self.window.loading_time * 1000:9.1f}"
+                     "  (thread de travail, pendant l'affichage)")
+        lines.append(f"  {'Fenêtre affichée après':<32}{(self.shown_at - self.start) * 1000:9.1f}")
+        lines.append(f"  {'Decks affichés après':<32}{(self.ready_at - self.start) * 1000:9.1f}")
+        print("\n".join(lines))
+
 
 def main():
     """
     Point d'entrée principal de l'application FlashMaster.
-    Initialise l'application, applique le style, crée la fenêtre principale
-    et lance la boucle événementielle.
+    Initialise l'application, applique le style, affiche la fenêtre principale
+    puis charge les decks en arrière-plan, et lance la boucle événementielle.
+
+    Avec l'option --startup-profile, le détail du temps de démarrage est affiché :
+    importations, feuille de style, chargement des données et premier affichage.
     """
+    profile = None
+    if "--startup-profile" in sys.argv:
+        sys.argv.remove("--startup-profile")
+        profile = StartupProfile(START_TIME)
+        profile.step("Importations", IMPORTS_TIME)
+
     # Création de l'application Qt
     app = QApplication(sys.argv)
     app.setApplicationName("FlashMaster")
+    if profile:
+        profile.step("Application Qt")
 
     # Application du thème personnalisé
     apply_stylesheet(app)
+    if profile:
+        profile.step("Feuille de style")
 
-    # Chargement du gestionnaire de paquets de cartes
-    deck_manager = DeckManager()
+    # Ouverture du stockage ; les decks sont chargés par la fenêtre, dans un thread de travail
+    deck_manager = DeckManager(load=False)
+    app.aboutToQuit.connect(deck_manager.close)  # Fermeture propre du stockage
+    if profile:
+        profile.step("Ouverture des données")
 
     # Création et affichage de la fenêtre principale
     window = MainWindow(deck_manager)
+    if profile:
+        profile.step("Fenêtre principale")
+        profile.watch(window)
     window.show()
 
     # Lancement de la boucle événementielle Qt
@@ -30,4 +120,4 @@ def main():
 
 # Vérifie si le script est exécuté directement (et non importé)
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
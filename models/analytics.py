@@ -0,0 +1,205 @@
+import time
+from datetime import date, timedelta
+
+import numpy as np
+
+from models.scheduler import DAY
+
+
+# Nombre de jours de la moyenne glissante de la précision
+TREND_WINDOW = 7
+
+# Cartes les plus difficiles retenues, et nombre minimal de réponses pour y figurer
+HARDEST_CARDS = 20
+MIN_REVIEWS = 3
+
+# Bornes (en millisecondes) de l'histogramme des temps de réponse
+DURATION_EDGES = np.array([0, 1000, 2000, 3000, 5000, 8000, 13000, 21000, 34000, 60000, 2 ** 32], dtype=np.int64)
+
+# Nombre de tranches de l'histogramme des taux de réussite par carte
+ACCURACY_BINS = 10
+
+
+def day_to_date(day):
+    """Convertit un numéro de jour (jours depuis le 1er janvier 1970) en date."""
+    return date(1970, 1, 1) + timedelta(days=int(day))
+
+
+def _ratio(numerator, denominator):
+    """Divise terme à terme ; NaN là où le dénominateur est nul."""
+    numerator = np.asarray(numerator, dtype=np.float64)
+    denominator = np.asarray(denominator, dtype=np.float64)
+    result = np.full(numerator.shape, np.nan)
+    np.divide(numerator, denominator, out=result, where=denominator > 0)
+    return result
+
+
+def _rolling_sum(values, window):
+    """Somme glissante sur window éléments (fenêtre tronquée au début)."""
+    cumulative = np.cumsum(values, dtype=np.float64)
+    cumulative[window:] = cumulative[window:] - cumulative[:-window]
+    return cumulative
+
+
+def compute_review_stats(history, days=None, now=None):
+    """
+    Calcule les statistiques de l'historique des révisions, par opérations vectorisées NumPy.
+
+    L'historique est parcouru tranche par tranche (un bloc de l'historique à la fois) et chaque
+    tranche est réduite par np.bincount : la mémoire utilisée ne dépend pas du nombre de réponses,
+    seulement du nombre de cartes, de decks et de jours.
+
+    La rétention est la part de réponses correctes aux cartes déjà vues au moins une fois
+    (la toute première réponse à une carte n'en mesure pas la mémorisation) ;
+    la précision porte sur toutes les réponses.
+
+    Args:
+        history: Données préparées par DeckManager.review_history.
+        days: Nombre de jours analysés jusqu'à aujourd'hui (None pour tout l'historique).
+        now: Timestamp de référence (par défaut, maintenant).
+
+    Returns:
+        Dictionnaire des statistiques (tableaux NumPy indexés par jour, par deck, par heure...).
+    """
+    now = int(time.time() if now is None else now)
+    utc_offset = time.localtime(now).tm_gmtoff
+    today = (now + utc_offset) // DAY
+
+    slices = history["slices"]
+    card_decks = np.asarray(history["card_decks"], dtype=np.int32)
+    deck_count = len(history["decks"])
+    card_count = len(card_decks)
+
+    if days is not None:
+        first_day = today - max(1, days) + 1
+    else:
+        # Tout l'historique : à partir de la première réponse (les horodatages sont croissants)
+        first_day = today
+        for columns in slices:
+            if len(columns.timestamps):
+                first_day = min(today, (int(columns.timestamps[0]) + utc_offset) // DAY)
+                break
+    day_count = today - first_day + 1
+    start = first_day * DAY - utc_offset
+
+    reviews_per_day = np.zeros(day_count, dtype=np.int64)
+    correct_per_day = np.zeros(day_count, dtype=np.int64)
+    recalls_per_day = np.zeros(day_count, dtype=np.int64)
+    recalled_per_day = np.zeros(day_count, dtype=np.int64)
+    deck_reviews = np.zeros(deck_count, dtype=np.int64)
+    deck_correct = np.zeros(deck_count, dtype=np.int64)
+    deck_recalls = np.zeros(deck_count, dtype=np.int64)
+    deck_recalled = np.zeros(deck_count, dtype=np.int64)
+    card_reviews = np.zeros(card_count, dtype=np.int64)
+    card_failures = np.zeros(card_count, dtype=np.int64)
+    hours = np.zeros(24, dtype=np.int64)
+    durations = np.zeros(len(DURATION_EDGES) - 1, dtype=np.int64)
+    duration_total = 0
+    seen = np.zeros(card_count, dtype=bool)  # Cartes ayant déjà reçu une réponse
+
+    for columns in slices:
+        timestamps = np.asarray(columns.timestamps)
+        cards = np.asarray(columns.cards)
+        split = int(np.searchsorted(timestamps, start))
+
+        # Réponses antérieures à la période : servent seulement à reconnaître les premières réponses
+        if split:
+            seen[cards[:split]] = True
+        if split == len(timestamps):
+            continue
+
+        cards = cards[split:]
+        decks = card_decks[cards]
+        in_scope = decks >= 0
+        if not in_scope.all():
+            # Cartes d'autres decks (ou supprimées) : elles comptent comme vues, sans être analysées
+            seen[cards[~in_scope]] = True
+        cards = cards[in_scope]
+        if not len(cards):
+            continue
+        decks = decks[in_scope]
+        timestamps = timestamps[split:][in_scope]
+        results = np.asarray(columns.results)[split:][in_scope].astype(np.int64)
+        response_times = np.asarray(columns.durations)[split:][in_scope]
+
+        # Première réponse de chaque carte dans la tranche, qui n'est une première réponse
+        # que si la carte n'a jamais été vue avant
+        unique_cards, first_rows = np.unique(cards, return_index=True)
+        first_review = np.zeros(len(cards), dtype=bool)
+        first_review[first_rows[~seen[unique_cards]]] = True
+        seen[unique_cards] = True
+        recall = ~first_review
+
+        local = timestamps + utc_offset
+        day = np.clip(local // DAY - first_day, 0, day_count - 1)
+        reviews_per_day += np.bincount(day, minlength=day_count)
+        correct_per_day += np.bincount(day, weights=results, minlength=day_count).astype(np.int64)
+        recalls_per_day += np.bincount(day[recall], minlength=day_count)
+        recalled_per_day += np.bincount(day[recall], weights=results[recall], minlength=day_count).astype(np.int64)
+
+        deck_reviews += np.bincount(decks, minlength=deck_count)
+        deck_correct += np.bincount(decks, weights=results, minlength=deck_count).astype(np.int64)
+        deck_recalls += np.bincount(decks[recall], minlength=deck_count)
+        deck_recalled += np.bincount(decks[recall], weights=results[recall], minlength=deck_count).astype(np.int64)
+
+        card_reviews += np.bincount(cards, minlength=card_count)
+        card_failures += np.bincount(cards, weights=1 - results, minlength=card_count).astype(np.int64)
+
+        hours += np.bincount((local % DAY) // 3600, minlength=24)
+        durations += np.histogram(response_times, bins=DURATION_EDGES)[0]
+        duration_total += int(response_times.sum(dtype=np.int64))
+
+    total_reviews = int(reviews_per_day.sum())
+    total_recalls = int(recalls_per_day.sum())
+
+    # Cartes les plus difficiles : taux d'échec lissé (les cartes peu vues ne dominent pas le classement)
+    hardest = []
+    candidates = np.flatnonzero(card_reviews >= MIN_REVIEWS)
+    if len(candidates):
+        difficulty = (card_failures[candidates] + 1) / (card_reviews[candidates] + 2)
+        count = min(HARDEST_CARDS, len(candidates))
+        top = np.argpartition(-difficulty, count - 1)[:count]
+        top = top[np.argsort(-difficulty[top], kind="stable")]
+        card_ids = history["card_ids"]
+        deck_ids = [deck_id for deck_id, _ in history["decks"]]
+        for number in candidates[top]:
+            card_id = card_ids[number]
+            hardest.append((card_id, deck_ids[card_decks[number]], history["fronts"].get(card_id, ""),
+                            int(card_reviews[number]), int(card_failures[number])))
+
+    # Compteurs par carte (depuis la création des cartes) : taux de réussite des cartes d'un deck
+    accuracy_histogram = None
+    unanswered_cards = None
+    if history.get("counters") is not None:
+        correct = np.asarray(history["counters"][0], dtype=np.int64)
+        incorrect = np.asarray(history["counters"][1], dtype=np.int64)
+        answered = (correct + incorrect) > 0
+        unanswered_cards = int((~answered).sum())
+        success = correct[answered] / (correct[answered] + incorrect[answered])
+        accuracy_histogram = np.histogram(success, bins=ACCURACY_BINS, range=(0.0, 1.0))[0]
+
+    summaries = np.asarray(history["summaries"], dtype=np.int64).reshape(-1, 2)
+
+    return {
+        "first_day": first_day,
+        "decks": history["decks"],
+        "reviews_per_day": reviews_per_day,
+        "accuracy_per_day": _ratio(correct_per_day, reviews_per_day),
+        "retention_per_day": _ratio(recalled_per_day, recalls_per_day),
+        "accuracy_trend": _ratio(_rolling_sum(correct_per_day, TREND_WINDOW),
+                                 _rolling_sum(reviews_per_day, TREND_WINDOW)),
+        "deck_reviews": deck_reviews,
+        "deck_accuracy": _ratio(deck_correct, deck_reviews),
+        "deck_retention": _ratio(deck_recalled, deck_recalls),
+        "deck_all_time_accuracy": _ratio(summaries[:, 0], summaries.sum(axis=1)),
+        "hardest": hardest,
+        "hour_histogram": hours,
+        "duration_histogram": durations,
+        "accuracy_histogram": accuracy_histogram,
+        "unanswered_cards": unanswered_cards,
+        "total_reviews": total_reviews,
+        "active_days": int(np.count_nonzero(reviews_per_day)),
+        "accuracy": float(correct_per_day.sum() / total_reviews) if total_reviews else None,
+        "retention": float(recalled_per_day.sum() / total_recalls) if total_recalls else None,
+        "mean_duration_ms": duration_total / total_reviews if total_reviews else None,
+    }
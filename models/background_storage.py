@@ -0,0 +1,200 @@
+import threading
+import time
+from contextlib import contextmanager
+
+from models.storage import StorageBackend
+
+
+class BackgroundStorage(StorageBackend):
+    """
+    Enveloppe un moteur de stockage pour exécuter ses écritures dans un thread dédié :
+    les modifications ne bloquent plus l'interface le temps d'écrire sur disque.
+
+    Chaque écriture demandée est mise en file puis rendue immédiatement. Le thread d'écriture
+    attend COALESCE_DELAY secondes après la première demande d'une rafale, puis applique toutes
+    les demandes en attente dans une seule transaction du moteur : une rafale de modifications
+    ne produit qu'une réécriture du fichier JSON ou qu'une validation SQLite.
+
+    Les demandes référencent les objets Deck et Card partagés avec l'interface : le thread
+    d'écriture les lit en tenant le verrou de la collection (lock), que le DeckManager prend
+    lui-même pendant ses modifications. L'état écrit est donc toujours un instantané cohérent,
+    et les écritures sur disque (fichiers, validation SQLite) se font hors du verrou.
+
+    Les écritures d'une transaction ne sont mises en file qu'à la sortie du bloc le plus externe ;
+    si une exception est levée, elles sont abandonnées. flush attend que tout soit écrit,
+    close attend la fin des écritures avant de fermer le moteur.
+    """
+
+    COALESCE_DELAY = 0.05
+
+    def __init__(self, storage, lock):
+        """
+        Démarre le thread d'écriture.
+
+        Args:
+            storage: Le moteur de stockage enveloppé.
+            lock: Verrou de la collection (threading.RLock) partagé avec le DeckManager.
+        """
+        self.storage = storage
+        self.lock = lock
+        self.lazy_loading = storage.lazy_loading
+        self.supports_search = storage.supports_search
+        storage.snapshot_lock = lock
+
+        self._condition = threading.Condition()
+        self._queue = []         # Écritures en attente : (nom de la méthode, arguments)
+        self._running = []       # Écritures de la rafale en cours
+        self._closed = False
+        self._group = None       # Écritures de la transaction en cours, None hors transaction
+        self._group_depth = 0
+        self.last_error = None   # Dernière erreur rencontrée par le thread d'écriture
+
+        self._thread = threading.Thread(target=self._run, name="flashmaster-writer", daemon=True)
+        self._thread.start()
+
+    def _submit(self, method, *args):
+        """Met une écriture en file, ou la rattache à la transaction en cours."""
+        if self._group is not None:
+            self._group.append((method, args))
+            return
+        with self._condition:
+            self._queue.append((method, args))
+            self._condition.notify_all()
+
+    def _run(self):
+        """Boucle du thread d'écriture : applique les écritures en attente par rafales."""
+        while True:
+            with self._condition:
+                while not self._queue and not self._closed:
+                    self._condition.wait()
+                if not self._queue:
+                    return
+                closing = self._closed
+
+            # Laisse le temps au reste de la rafale d'arriver
+            if not closing:
+                time.sleep(self.COALESCE_DELAY)
+            with self._condition:
+                operations, self._queue = self._queue, []
+                self._running = operations
+
+            try:
+                with self.storage.transaction():
+                    with self.lock:
+                        for method, args in operations:
+                            getattr(self.storage, method)(*args)
+            except Exception as e:
+                self.last_error = e
+                print(f"Erreur lors de l'enregistrement en arrière-plan: {e}")
+
+            with self._condition:
+                self._running = []
+                self._condition.notify_all()
+
+    def has_pending_writes(self, deck_id=None):
+        """
+        Indique si des écritures sont en attente ou en cours.
+
+        Args:
+            deck_id: Si indiqué, ne considère que les écritures portant sur ce deck
+                (un instantané complet porte sur tous les decks).
+        """
+        with self._condition:
+            operations = self._queue + self._running + (self._group or [])
+        if deck_id is None:
+            return bool(operations)
+        for method, args in operations:
+            target = args[0]
+            if method == "save_all" or getattr(target, "id", target) == deck_id:
+                return True
+        return False
+
+    def flush(self):
+        """
+        Attend que toutes les écritures en file soient appliquées.
+        Ne doit pas être appelé en tenant le verrou de la collection.
+        """
+        with self._condition:
+            while (self._queue or self._running) and self._thread.is_alive():
+                self._condition.wait()
+
+    # Lectures : les cartes d'un deck absent de la mémoire sont lues directement, sans attendre
+    # les écritures en cours. Le moteur fragmenté peut alors réintégrer le journal en même temps,
+    # y compris dans le fichier de ce deck : sa lecture est protégée par snapshot_lock (le verrou
+    # de la collection). Les autres lectures attendent la fin des écritures
+    def load_decks(self):
+        self.flush()
+        return self.storage.load_decks()
+
+    def load_cards(self, deck_id):
+        return self.storage.load_cards(deck_id)
+
+    def load_card_fronts(self, deck_id):
+        self.flush()
+        return self.storage.load_card_fronts(deck_id)
+
+    def search_cards(self, query, limit):
+        self.flush()
+        return self.storage.search_cards(query, limit)
+
+    def is_empty(self):
+        self.flush()
+        return self.storage.is_empty()
+
+    # Écritures : mises en file pour le thread d'écriture
+    def save_all(self, decks):
+        self._submit("save_all", decks)
+
+    def save_deck(self, deck):
+        self._submit("save_deck", deck)
+
+    def delete_deck(self, deck_id):
+        self._submit("delete_deck", deck_id)
+
+    def save_card(self, deck, card):
+        self._submit("save_card", deck, card)
+
+    def save_cards(self, deck, cards):
+        self._submit("save_cards", deck, list(cards))
+
+    def delete_card(self, deck, card_id):
+        self._submit("delete_card", deck, card_id)
+
+    def delete_cards(self, deck, card_ids):
+        self._submit("delete_cards", deck, list(card_ids))
+
+    def record_result(self, deck, card):
+        self._submit("record_result", deck, card)
+
+    @contextmanager
+    def transaction(self):
+        """
+        Retient les écritures du bloc le plus externe et les met en file à sa sortie.
+        Si une exception est levée, elles sont abandonnées.
+        """
+        if self._group is None:
+            self._group = []
+        self._group_depth += 1
+        try:
+            yield
+        except BaseException:
+            self._group_depth -= 1
+            if self._group_depth == 0:
+                self._group = None
+            raise
+        self._group_depth -= 1
+        if self._group_depth == 0:
+            operations, self._group = self._group, None
+            if operations:
+                with self._condition:
+                    self._queue.extend(operations)
+                    self._condition.notify_all()
+
+    def close(self):
+        """Attend la fin des écritures, arrête le thread puis ferme le moteur."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join()
+        self.storage.snapshot_lock = StorageBackend.snapshot_lock
+        self.storage.close()
@@ -1,65 +1,341 @@
 import os
+import time
+import threading
 import uuid
-import json
-from datetime import datetime
-import random
+from array import array
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+
+from models.entities import Card, DailyProgress, Deck, DeckSummary, Media
+from models.scheduler import QUALITY_CORRECT, QUALITY_INCORRECT, DueQueue, reset_card, review_card
+from models.background_storage import BackgroundStorage
+from models.fuzzy_index import TrigramIndex
+from models.media_store import MediaStore
+from models.review_log import ReviewLog
+from models.search_index import SearchIndex
+from models.study_session import StudySession
+from models.storage import DEFAULT_BACKEND, create_storage, migrate_legacy_json
 
 
 class DeckManager:
     """
-    Gère le stockage et la manipulation des decks et des cartes de l'application FlashMaster.
-    Utilise un fichier JSON pour la persistance des données.
+    Gère le stockage et la manipulation des decks et des cartes (objets Deck et Card)
+    de l'application FlashMaster.
+    La persistance est déléguée à un moteur de stockage interchangeable (SQLite par défaut,
+    fichier JSON historique en option).
+
+    Deux index par identifiant sont maintenus à jour pour des accès en temps constant :
+    id de deck -> position dans self.decks, et id de carte -> (deck, position dans deck.cards).
+    Les suppressions déplacent le dernier élément de la liste dans la case libérée au lieu de
+    décaler toute la liste ; l'ordre des decks et des cartes n'est donc pas garanti après une suppression.
+
+    Le chargement des decks peut être confié à un thread de travail (load=False, puis load_decks) :
+    l'application affiche sa fenêtre sans l'attendre.
+
+    Avec un moteur à chargement différé, seules les métadonnées des decks sont lues au démarrage :
+    deck.cards vaut None tant que les cartes du deck n'ont pas été demandées. Au-delà de
+    max_loaded_decks decks chargés, les cartes des decks les moins récemment utilisés sont libérées.
+
+    Chaque deck porte un résumé deck.summary (nombre de cartes, totaux de réponses correctes et
+    incorrectes) tenu à jour à chaque modification et enregistré avec les métadonnées du deck, à part
+    des cartes : la liste des decks peut ainsi être affichée sans lire aucune carte.
+
+    Les sessions d'étude suivent l'algorithme de répétition espacée SM-2 : chaque deck chargé
+    dispose d'une file de priorité (DueQueue) des cartes à réviser, construite à la demande,
+    et le nombre de cartes nouvelles et de révisions par jour est limité. La session en cours
+    de chaque deck (StudySession) est gardée pour être reprise là où elle s'était arrêtée.
+    Chaque réponse est ajoutée à l'historique des révisions (ReviewLog, dossier reviews/).
+
+    La recherche plein texte (search_cards) s'appuie sur l'index du moteur de stockage s'il en a un
+    (FTS5 pour SQLite) ; sinon, un index inversé en mémoire (SearchIndex) est construit à la première
+    recherche puis tenu à jour à chaque création, modification ou suppression de carte.
+    La recherche approximative des noms de decks et des rectos de cartes (ouverture rapide) utilise
+    un index trigramme (TrigramIndex), tenu à jour de la même façon dès sa création.
+
+    Par défaut, les écritures sont confiées à un thread d'écriture (BackgroundStorage) qui regroupe
+    les rafales de modifications : les méthodes qui modifient les decks et les cartes tiennent
+    le verrou de la collection (self._lock) pour que ce thread n'écrive jamais un état à moitié modifié.
+
+    Les fichiers des médias sont copiés dans un magasin indexé par contenu (MediaStore, dossier
+    media/ du dossier de données) : Media.path contient alors le nom du fichier dans le magasin.
+    Les références sont décomptées à la suppression des cartes et des decks.
     """
 
-    def __init__(self, data_dir="data"):
+    def __init__(self, data_dir="data", backend=DEFAULT_BACKEND, max_loaded_decks=32,
+                 new_cards_per_day=20, reviews_per_day=200, background_writes=True, load=True):
         """
         Initialise le gestionnaire de decks.
 
         Args:
-            data_dir: Le répertoire où sont stockés les fichiers de données JSON.
+            data_dir: Le répertoire où sont stockés les fichiers de données.
+            backend: Le moteur de stockage à utiliser ('sqlite', 'shards' ou 'json').
+            max_loaded_decks: Nombre maximal de decks gardant leurs cartes en mémoire
+                (None pour ne jamais libérer de deck).
+            new_cards_per_day: Nombre maximal de cartes nouvelles étudiées par jour et par deck.
+            reviews_per_day: Nombre maximal de révisions par jour et par deck.
+            background_writes: Si True, les écritures sont faites dans un thread à part
+                (flush attend qu'elles soient terminées) ; sinon, à chaque modification.
+            load: Si False, les decks ne sont pas chargés par le constructeur : load_decks
+                doit être appelé avant toute autre méthode (par exemple dans un thread de travail,
+                pendant que la fenêtre principale s'affiche).
         """
         self.data_dir = data_dir
-        self.decks_file = os.path.join(data_dir, "decks.json")
         self.decks = []
+        self.loaded = False     # True une fois les decks chargés par load_decks
+        self.max_loaded_decks = max_loaded_decks
+        self.new_cards_per_day = new_cards_per_day
+        self.reviews_per_day = reviews_per_day
+        self._due_queues = {}   # id de deck -> DueQueue, pour les decks chargés
+        self._study_sessions = {}  # id de deck -> StudySession en cours, reprise à la réouverture
+        self._batch_depth = 0
+        # Références au magasin de médias retirées, décomptées une fois l'effacement des cartes écrit
+        self._released_media = []
+        self._acquired_media = []  # Médias ajoutés dans le bloc batch en cours, décomptés s'il est annulé
+        self._lock = threading.RLock()  # Verrou de la collection, partagé avec le thread d'écriture
+        self._search_index = None  # SearchIndex, construit à la première recherche si le moteur n'indexe pas
+        self._fuzzy_index = None   # TrigramIndex des noms de decks et des rectos, créé à la demande
+        self._deck_index = {}   # id de deck -> position dans self.decks
+        self._card_index = {}   # id de carte -> (deck, position dans deck.cards)
+        self._loaded_decks = OrderedDict()  # ids des decks dont les cartes sont en mémoire, du plus ancien au plus récent
 
         # Création du dossier de données s’il n’existe pas
         if not os.path.exists(data_dir):
             os.makedirs(data_dir)
 
-        # Chargement des decks existants à partir du fichier
-        self.load_decks()
+        self.storage = create_storage(backend, data_dir)
+        self.media_store = MediaStore(os.path.join(data_dir, "media"))
+        self.review_log = ReviewLog(os.path.join(data_dir, "reviews"))
+
+        # Import unique de l'ancien fichier decks.json dans le nouveau moteur
+        migrated = migrate_legacy_json(data_dir, self.storage)
+        if migrated:
+            print(f"{migrated} deck(s) importé(s) depuis decks.json")
+
+        if background_writes:
+            self.storage = BackgroundStorage(self.storage, self._lock)
+
+        # Chargement des decks existants
+        if load:
+            self.load_decks()
 
     def load_decks(self):
         """
-        Charge les decks depuis le fichier JSON. Si le fichier est introuvable ou corrompu, initialise une liste vide.
+        Charge les decks depuis le moteur de stockage. En cas d'erreur, initialise une liste vide.
+        Peut être appelé depuis un thread de travail : le verrou de la collection est tenu
+        pendant tout le chargement.
         """
-        if os.path.exists(self.decks_file):
+        with self._lock:
             try:
-                with open(self.decks_file, 'r', encoding='utf-8') as f:
-                    self.decks = json.load(f)
+                self.decks = self.storage.load_decks()
             except Exception as e:
                 print(f"Erreur lors du chargement des decks: {e}")
                 self.decks = []
+            self._rebuild_indexes()
+
+            # Les données enregistrées avant l'ajout des résumés sont complétées une fois pour toutes
+            missing = [deck for deck in self.decks if not deck.summary]
+            if missing:
+                with self.storage.transaction():
+                    for deck in missing:
+                        deck.summary = self._compute_summary(self._ensure_cards(deck))
+                        self.storage.save_deck(deck)
+            self.loaded = True
+
+    @staticmethod
+    def _compute_summary(cards):
+        """
+        Calcule le résumé d'un deck en parcourant toutes ses cartes.
+
+        Args:
+            cards: La liste des cartes du deck.
+
+        Returns:
+            Le DeckSummary avec le nombre de cartes et les totaux de réponses.
+        """
+        return DeckSummary(
+            len(cards),
+            sum(card.correct_count for card in cards),
+            sum(card.incorrect_count for card in cards)
+        )
+
+    def _rebuild_indexes(self):
+        """
+        Reconstruit les index par identifiant à partir des listes de decks et de cartes.
+        """
+        self._deck_index = {}
+        self._card_index = {}
+        self._loaded_decks = OrderedDict()
+        self._due_queues = {}
+        self._study_sessions = {}
+        self._search_index = None
+        self._fuzzy_index = None
+        for deck_position, deck in enumerate(self.decks):
+            self._deck_index[deck.id] = deck_position
+            if deck.cards is not None:
+                self._index_cards(deck)
+
+    def _index_cards(self, deck):
+        """Ajoute les cartes d'un deck chargé à l'index des cartes."""
+        for card_position, card in enumerate(deck.cards):
+            self._card_index[card.id] = (deck, card_position)
+        self._loaded_decks[deck.id] = True
+
+    def _ensure_cards(self, deck, evict=True):
+        """
+        Garantit que les cartes d'un deck sont en mémoire, en les chargeant au besoin.
+
+        Args:
+            deck: Le deck concerné.
+            evict: Si True, libère les decks les moins récemment utilisés au-delà de la limite.
+
+        Returns:
+            La liste des cartes du deck.
+        """
+        if deck.cards is None:
+            deck.cards = self.storage.load_cards(deck.id)
+            self._index_cards(deck)
         else:
-            self.decks = []
+            self._loaded_decks[deck.id] = True
+        self._loaded_decks.move_to_end(deck.id)
+
+        if evict:
+            self._evict_unused()
+        return deck.cards
+
+    def _evict_unused(self):
+        """Libère les cartes des decks les moins récemment utilisés au-delà de max_loaded_decks."""
+        if self.max_loaded_decks is None or not self.storage.lazy_loading:
+            return
+        while len(self._loaded_decks) > max(self.max_loaded_decks, 1):
+            deck_id = next(iter(self._loaded_decks))
+            if not self.evict_deck(deck_id):
+                break
+
+    def is_deck_loaded(self, deck_id):
+        """
+        Indique si les cartes d'un deck sont actuellement en mémoire.
 
-    def save_decks(self):
+        Args:
+            deck_id: L'identifiant du deck.
         """
-        Sauvegarde les decks dans le fichier JSON pour assurer la persistance des données.
+        deck = self.get_deck(deck_id)
+        return deck is not None and deck.cards is not None
+
+    def evict_deck(self, deck_id):
         """
-        temp_file = self.decks_file + ".tmp"
-        try:
-            with open(temp_file, 'w', encoding='utf-8') as f:
-                json.dump(self.decks, f, ensure_ascii=False, indent=2)
+        Libère de la mémoire les cartes d'un deck ; elles seront relues à la prochaine demande.
+        Sans effet avec un moteur qui ne sait pas charger les cartes à la demande, et différé
+        tant que des écritures sont en attente (elles peuvent porter sur ces cartes).
 
-            if os.path.exists(self.decks_file):
-                os.remove(self.decks_file)
-            os.rename(temp_file, self.decks_file)
+        Args:
+            deck_id: L'identifiant du deck.
 
+        Returns:
+            True si les cartes ont été libérées, False sinon.
+        """
+        deck = self.get_deck(deck_id)
+        if not deck or deck.cards is None or not self.storage.lazy_loading:
+            return False
+        if self.storage.has_pending_writes(deck_id):
+            return False
+
+        for card in deck.cards:
+            self._card_index.pop(card.id, None)
+        deck.cards = None
+        self._loaded_decks.pop(deck_id, None)
+        self._due_queues.pop(deck_id, None)
+        return True
+
+    @staticmethod
+    def _swap_remove(items, position):
+        """
+        Retire l'élément à la position donnée en O(1) : le dernier élément prend sa place.
+
+        Args:
+            items: La liste à modifier.
+            position: La position de l'élément à retirer.
+
+        Returns:
+            L'élément déplacé dans la case libérée, ou None si l'élément retiré était le dernier.
+        """
+        last = items.pop()
+        if position < len(items):
+            items[position] = last
+            return last
+        return None
+
+    def save_decks(self):
+        """
+        Écrit un instantané complet de tous les decks dans le moteur de stockage.
+        """
+        try:
+            with self._lock:
+                for deck in self.decks:
+                    self._ensure_cards(deck, evict=False)
+                self.storage.save_all(self.decks)
+            self._evict_unused()
         except Exception as e:
             print(f"Erreur critique sauvegarde: {e}")
-            if os.path.exists(temp_file):
-                os.remove(temp_file)
+
+    def flush(self):
+        """
+        Attend que toutes les modifications soient écrites par le moteur de stockage,
+        puis libère les decks dont la libération attendait la fin de ces écritures.
+        """
+        self.storage.flush()
+        self._commit_media_releases()
+        self._evict_unused()
+
+    def close(self):
+        """
+        Ferme proprement le moteur de stockage (à appeler à la fermeture de l'application),
+        après avoir attendu la fin des écritures en cours. Les médias qui ne sont plus
+        référencés sont ensuite supprimés du magasin.
+        """
+        self.storage.close()
+        self._commit_media_releases()
+        self.media_store.purge()
+        self.review_log.close()
+
+    @contextmanager
+    def batch(self):
+        """
+        Regroupe plusieurs modifications : elles sont enregistrées ensemble à la sortie du bloc.
+
+        Si une exception est levée dans le bloc, rien n'est enregistré et les decks sont relus
+        depuis le stockage, ce qui annule aussi les modifications faites en mémoire.
+        Les blocs imbriqués rejoignent le bloc le plus externe ; celui-ci attend d'abord la fin
+        des écritures en cours, puis tient le verrou de la collection jusqu'à sa sortie.
+        L'index du magasin de médias n'est enregistré qu'une fois pour tout le bloc.
+
+        Exemple :
+            with deck_manager.batch():
+                deck_manager.delete_card(deck_id, card_id)
+                deck_manager.create_card(deck_id, "question", "réponse")
+        """
+        self._batch_depth += 1
+        try:
+            if self._batch_depth == 1:
+                self.storage.flush()
+                self._commit_media_releases()
+            with self._lock, self.storage.transaction():
+                yield self
+                if self._batch_depth == 1:
+                    # Les médias ajoutés sont comptés dans l'index avant l'écriture des cartes
+                    self.media_store.save()
+        except BaseException:
+            if self._batch_depth == 1:
+                # Les médias ajoutés dans le bloc ne sont référencés par aucune carte enregistrée
+                self._released_media = []
+                for name in self._acquired_media:
+                    self.media_store.release(name)
+                self.load_decks()
+            raise
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self._acquired_media = []
 
     def get_decks(self):
         """
@@ -79,16 +355,15 @@ class DeckManager:
             L’ID du nouveau deck créé.
         """
         deck_id = str(uuid.uuid4())
-        new_deck = {
-            "id": deck_id,
-            "name": name,
-            "description": description,
-            "created_at": datetime.now().isoformat(),
-            "last_studied": None,
-            "cards": []
-        }
-        self.decks.append(new_deck)
-        self.save_decks()
+        new_deck = Deck(deck_id, name, description, int(time.time()),
+                        summary=DeckSummary(), cards=[])
+        with self._lock:
+            self._deck_index[deck_id] = len(self.decks)
+            self.decks.append(new_deck)
+            self._ensure_cards(new_deck)
+            if self._fuzzy_index is not None:
+                self._fuzzy_index.add(("deck", deck_id), name)
+            self.storage.save_deck(new_deck)
         return deck_id
 
     def get_deck(self, deck_id):
@@ -99,12 +374,12 @@ class DeckManager:
             deck_id: L'identifiant du deck.
 
         Returns:
-            Le dictionnaire du deck ou None s’il n’existe pas.
+            Le Deck ou None s’il n’existe pas.
         """
-        for deck in self.decks:
-            if deck["id"] == deck_id:
-                return deck
-        return None
+        position = self._deck_index.get(deck_id)
+        if position is None:
+            return None
+        return self.decks[position]
 
     def update_deck(self, deck_id, name, description):
         """
@@ -118,13 +393,17 @@ class DeckManager:
         Returns:
             True si la mise à jour a réussi, False sinon.
         """
-        for deck in self.decks:
-            if deck["id"] == deck_id:
-                deck["name"] = name
-                deck["description"] = description
-                self.save_decks()
-                return True
-        return False
+        deck = self.get_deck(deck_id)
+        if not deck:
+            return False
+
+        with self._lock:
+            deck.name = name
+            deck.description = description
+            if self._fuzzy_index is not None:
+                self._fuzzy_index.add(("deck", deck.id), name)
+            self.storage.save_deck(deck)
+        return True
 
     def delete_deck(self, deck_id):
         """
@@ -136,12 +415,32 @@ class DeckManager:
         Returns:
             True si la suppression a réussi, False sinon.
         """
-        for i, deck in enumerate(self.decks):
-            if deck["id"] == deck_id:
-                del self.decks[i]
-                self.save_decks()
-                return True
-        return False
+        with self._lock:
+            position = self._deck_index.pop(deck_id, None)
+            if position is None:
+                return False
+
+            deck = self.decks[position]
+            if len(self.media_store):
+                # Les cartes d'un deck non chargé sont relues pour décompter leurs médias
+                self._release_media(deck.cards if deck.cards is not None else self.storage.load_cards(deck_id))
+            for card in deck.cards or []:
+                del self._card_index[card.id]
+            self._loaded_decks.pop(deck_id, None)
+            self._due_queues.pop(deck_id, None)
+            self._study_sessions.pop(deck_id, None)
+            if self._search_index is not None:
+                self._search_index.remove_deck(deck_id)
+            if self._fuzzy_index is not None:
+                self._fuzzy_index.remove(("deck", deck_id))
+                self._fuzzy_index.remove_if(lambda key, card_deck_id: card_deck_id == deck_id)
+
+            moved = self._swap_remove(self.decks, position)
+            if moved is not None:
+                self._deck_index[moved.id] = position
+
+            self.storage.delete_deck(deck_id)
+        return True
 
     def get_cards(self, deck_id):
         """
@@ -155,9 +454,52 @@ class DeckManager:
         """
         deck = self.get_deck(deck_id)
         if deck:
-            return deck["cards"]
+            return self._ensure_cards(deck)
         return []
 
+    def _attach_card(self, deck, card):
+        """Ajoute une carte à un deck chargé : liste, index, résumé et file de révision."""
+        self._card_index[card.id] = (deck, len(deck.cards))
+        deck.cards.append(card)
+
+        summary = deck.summary
+        summary.card_count += 1
+        summary.correct_answers += card.correct_count
+        summary.incorrect_answers += card.incorrect_count
+
+        if deck.id in self._due_queues:
+            self._due_queues[deck.id].add(card)
+        if self._search_index is not None:
+            self._search_index.add(deck.id, card)
+        if self._fuzzy_index is not None:
+            self._fuzzy_index.add(("card", card.id), card.front, deck.id)
+
+    def _detach_card(self, card_id):
+        """
+        Retire une carte indexée de son deck : liste, index, résumé et file de révision.
+
+        Returns:
+            La carte retirée.
+        """
+        deck, position = self._card_index.pop(card_id)
+        card = deck.cards[position]
+        moved = self._swap_remove(deck.cards, position)
+        if moved is not None:
+            self._card_index[moved.id] = (deck, position)
+
+        summary = deck.summary
+        summary.card_count -= 1
+        summary.correct_answers -= card.correct_count
+        summary.incorrect_answers -= card.incorrect_count
+
+        if deck.id in self._due_queues:
+            self._due_queues[deck.id].remove(card_id)
+        if self._search_index is not None:
+            self._search_index.remove(card_id)
+        if self._fuzzy_index is not None:
+            self._fuzzy_index.remove(("card", card_id))
+        return card
+
     def create_card(self, deck_id, front, back):
         """
         Crée une nouvelle carte dans un deck donné.
@@ -173,23 +515,75 @@ class DeckManager:
         deck = self.get_deck(deck_id)
         if not deck:
             return None
+        self._ensure_cards(deck)
 
         card_id = str(uuid.uuid4())
 
-        new_card = {
-            "id": card_id,
-            "front": front,
-            "back": back,
-            "created_at": datetime.now().isoformat(),
-            "correct_count": 0,
-            "incorrect_count": 0,
-            "media": []
-        }
+        new_card = Card(card_id, front, back, int(time.time()))
+        with self._lock:
+            self._attach_card(deck, new_card)
 
-        deck["cards"].append(new_card)
-        self.save_decks()
+            with self.storage.transaction():
+                self.storage.save_card(deck, new_card)
+                self.storage.save_deck(deck)
         return card_id
 
+    def import_cards(self, deck_id, rows, batch_size=500, progress=None):
+        """
+        Importe en masse des cartes dans un deck, par exemple depuis read_card_rows.
+
+        Recto et verso sont débarrassés des espaces superflus et une ligne dont l'un des deux
+        est vide est ignorée ; la progression est signalée toutes les batch_size lignes.
+        Les cartes ne sont ajoutées au deck et enregistrées qu'à la fin, en une seule écriture :
+        un import annulé ou interrompu par une erreur de lecture ne laisse donc aucune carte.
+
+        Args:
+            deck_id: L'identifiant du deck.
+            rows: Itérable de paires (question, réponse).
+            batch_size: Nombre de lignes lues entre deux appels à progress.
+            progress: Fonction appelée après chaque lot avec le nombre de lignes lues ;
+                si elle retourne False, l'import est annulé.
+
+        Returns:
+            Tuple (cartes importées, lignes ignorées), ou None si le deck est introuvable
+            ou si l'import a été annulé.
+        """
+        deck = self.get_deck(deck_id)
+        if not deck:
+            return None
+
+        new_cards = []
+        skipped = 0
+        read = 0
+        now = int(time.time())
+
+        for front, back in rows:
+            read += 1
+            front = front.strip()
+            back = back.strip()
+            if front and back:
+                new_cards.append(Card(str(uuid.uuid4()), front, back, now))
+            else:
+                skipped += 1
+
+            if read % batch_size == 0 and progress is not None and progress(read) is False:
+                return None
+        if read % batch_size and progress is not None and progress(read) is False:
+            return None
+
+        if not new_cards:
+            return 0, skipped
+
+        with self._lock:
+            self._ensure_cards(deck)
+            for card in new_cards:
+                self._attach_card(deck, card)
+
+            with self.storage.transaction():
+                self.storage.save_cards(deck, new_cards)
+                self.storage.save_deck(deck)
+        return len(new_cards), skipped
+
     def get_card(self, deck_id, card_id):
         """
         Récupère une carte à partir de son ID dans un deck.
@@ -199,13 +593,17 @@ class DeckManager:
             card_id: L'identifiant de la carte.
 
         Returns:
-            Le dictionnaire de la carte ou None si introuvable.
+            La Card ou None si introuvable.
         """
-        cards = self.get_cards(deck_id)
-        for card in cards:
-            if card["id"] == card_id:
-                return card
-        return None
+        deck = self.get_deck(deck_id)
+        if not deck:
+            return None
+        self._ensure_cards(deck)
+
+        entry = self._card_index.get(card_id)
+        if entry is None or entry[0] is not deck:
+            return None
+        return deck.cards[entry[1]]
 
     def update_card(self, deck_id, card_id, front, back):
         """
@@ -220,17 +618,19 @@ class DeckManager:
         Returns:
             True si la mise à jour a réussi, False sinon.
         """
-        deck = self.get_deck(deck_id)
-        if not deck:
+        card = self.get_card(deck_id, card_id)
+        if not card:
             return False
 
-        for card in deck["cards"]:
-            if card["id"] == card_id:
-                card["front"] = front
-                card["back"] = back
-                self.save_decks()
-                return True
-        return False
+        with self._lock:
+            card.front = front
+            card.back = back
+            if self._search_index is not None:
+                self._search_index.add(deck_id, card)
+            if self._fuzzy_index is not None:
+                self._fuzzy_index.add(("card", card.id), front, deck_id)
+            self.storage.save_card(self.get_deck(deck_id), card)
+        return True
 
     def delete_card(self, deck_id, card_id):
         """
@@ -243,34 +643,281 @@ class DeckManager:
         Returns:
             True si la suppression a réussi, False sinon.
         """
+        if self.get_card(deck_id, card_id) is None:
+            return False
+
+        with self._lock:
+            deck = self.get_deck(deck_id)
+            self._release_media([self._detach_card(card_id)])
+
+            with self.storage.transaction():
+                self.storage.delete_card(deck, card_id)
+                self.storage.save_deck(deck)
+        return True
+
+    def _deck_cards(self, deck, card_ids):
+        """Retourne les cartes d'un deck chargé correspondant aux identifiants (les inconnus sont ignorés)."""
+        cards = []
+        for card_id in card_ids:
+            entry = self._card_index.get(card_id)
+            if entry is not None and entry[0] is deck:
+                cards.append(deck.cards[entry[1]])
+        return cards
+
+    def delete_cards(self, deck_id, card_ids):
+        """
+        Supprime plusieurs cartes d'un deck en une seule écriture.
+
+        Args:
+            deck_id: L'identifiant du deck.
+            card_ids: Les identifiants des cartes à supprimer.
+
+        Returns:
+            Le nombre de cartes supprimées.
+        """
         deck = self.get_deck(deck_id)
         if not deck:
-            return False
+            return 0
+
+        with self.batch():
+            self._ensure_cards(deck)
+            cards = self._deck_cards(deck, card_ids)
+            for card in cards:
+                self._detach_card(card.id)
+            self._release_media(cards)
+            if cards:
+                self.storage.delete_cards(deck, [card.id for card in cards])
+                self.storage.save_deck(deck)
+        return len(cards)
+
+    def move_cards(self, deck_id, card_ids, target_deck_id):
+        """
+        Déplace plusieurs cartes vers un autre deck en une seule écriture.
+        Les cartes gardent leurs statistiques et leur planification.
 
-        for i, card in enumerate(deck["cards"]):
-            if card["id"] == card_id:
-                del deck["cards"][i]
-                self.save_decks()
-                return True
-        return False
+        Args:
+            deck_id: L'identifiant du deck d'origine.
+            card_ids: Les identifiants des cartes à déplacer.
+            target_deck_id: L'identifiant du deck de destination.
 
-    def get_study_cards(self, deck_id):
+        Returns:
+            Le nombre de cartes déplacées.
         """
-        Récupère les cartes d’un deck dans un ordre aléatoire pour une session d’étude.
+        deck = self.get_deck(deck_id)
+        target = self.get_deck(target_deck_id)
+        if not deck or not target or deck is target:
+            return 0
+
+        with self.batch():
+            # Les deux decks doivent rester chargés pendant tout le déplacement
+            self._ensure_cards(deck, evict=False)
+            self._ensure_cards(target, evict=False)
+            cards = self._deck_cards(deck, card_ids)
+            for card in cards:
+                self._detach_card(card.id)
+                self._attach_card(target, card)
+            if cards:
+                self.storage.delete_cards(deck, [card.id for card in cards])
+                self.storage.save_cards(target, cards)
+                self.storage.save_deck(deck)
+                self.storage.save_deck(target)
+        self._evict_unused()
+        return len(cards)
+
+    def reset_cards(self, deck_id, card_ids):
+        """
+        Remet à zéro les statistiques de plusieurs cartes en une seule écriture :
+        compteurs de réponses et planification (elles redeviennent des cartes nouvelles).
 
         Args:
             deck_id: L'identifiant du deck.
+            card_ids: Les identifiants des cartes.
 
         Returns:
-            Liste mélangée des cartes du deck.
+            Le nombre de cartes réinitialisées.
         """
-        cards = self.get_cards(deck_id)
-        random.shuffle(cards)
-        return cards
+        deck = self.get_deck(deck_id)
+        if not deck:
+            return 0
+
+        with self.batch():
+            self._ensure_cards(deck)
+            cards = self._deck_cards(deck, card_ids)
+            for card in cards:
+                deck.summary.correct_answers -= card.correct_count
+                deck.summary.incorrect_answers -= card.incorrect_count
+                card.correct_count = 0
+                card.incorrect_count = 0
+                reset_card(card)
+                if deck_id in self._due_queues:
+                    self._due_queues[deck_id].add(card)
+            if cards:
+                self.storage.save_cards(deck, cards)
+                self.storage.save_deck(deck)
+        return len(cards)
+
+    def _due_queue(self, deck):
+        """Retourne la file de priorité d'un deck, construite à la première demande."""
+        queue = self._due_queues.get(deck.id)
+        if queue is None:
+            queue = DueQueue(self._ensure_cards(deck))
+            self._due_queues[deck.id] = queue
+        return queue
+
+    @staticmethod
+    def _today_progress(deck):
+        """Retourne la progression du jour d'un deck, remise à zéro au changement de jour."""
+        today = date.today().isoformat()
+        if deck.progress is None or deck.progress.day != today:
+            deck.progress = DailyProgress(today)
+        return deck.progress
+
+    @staticmethod
+    def _end_of_day():
+        """Timestamp de minuit ce soir : une carte échue dans la journée est proposée dès le matin."""
+        tomorrow = date.today() + timedelta(days=1)
+        return int(datetime.combine(tomorrow, datetime.min.time()).timestamp())
+
+    def get_study_cards(self, deck_id, limit=None):
+        """
+        Récupère les cartes à étudier aujourd'hui dans un deck : d'abord les révisions échues,
+        par échéance, puis les cartes nouvelles, dans la limite des quotas quotidiens.
+
+        Args:
+            deck_id: L'identifiant du deck.
+            limit: Nombre maximal de cartes à retourner (None pour appliquer seulement les quotas).
+
+        Returns:
+            Liste des cartes à étudier.
+        """
+        deck = self.get_deck(deck_id)
+        if not deck:
+            return []
+
+        queue = self._due_queue(deck)
+        progress = self._today_progress(deck)
+        review_quota = max(0, self.reviews_per_day - progress.reviews)
+        new_quota = max(0, self.new_cards_per_day - progress.new_cards)
+        if limit is not None:
+            review_quota = min(review_quota, limit)
+
+        cards = queue.due_cards(self._end_of_day(), review_quota)
+        if limit is not None:
+            new_quota = min(new_quota, limit - len(cards))
+        return cards + queue.new_cards(new_quota)
+
+    def start_study_session(self, deck_id, limit=None, shuffle=False):
+        """
+        Démarre une session d'étude d'un deck, ou reprend la session en cours si elle a été
+        commencée aujourd'hui et n'est pas terminée.
+
+        Args:
+            deck_id: L'identifiant du deck.
+            limit: Nombre maximal de cartes de la session (None pour appliquer seulement les quotas).
+            shuffle: Si True, les cartes sont présentées dans un ordre aléatoire.
+
+        Returns:
+            La session (StudySession), ou None si le deck est introuvable.
+        """
+        if not self.get_deck(deck_id):
+            return None
+
+        session = self._study_sessions.get(deck_id)
+        started_today = session is not None and date.fromtimestamp(session.started_at) == date.today()
+        if not started_today or session.finished:
+            card_ids = [card.id for card in self.get_study_cards(deck_id, limit)]
+            session = StudySession(deck_id, card_ids, shuffle=shuffle, session_id=self.review_log.new_session())
+            self._study_sessions[deck_id] = session
+        return session
+
+    def record_review(self, card_id, is_correct, duration_ms, session_id):
+        """
+        Ajoute une réponse à l'historique des révisions (toutes les réponses d'une session,
+        y compris celles aux cartes reproposées).
+
+        Args:
+            card_id: L'identifiant de la carte.
+            is_correct: True si la réponse était correcte, False sinon.
+            duration_ms: Temps passé sur la carte avant de répondre, en millisecondes.
+            session_id: Numéro de la session d'étude (StudySession.session_id).
+        """
+        try:
+            self.review_log.append(card_id, time.time(), is_correct, duration_ms, session_id)
+        except OSError as e:
+            print(f"Erreur lors de l'enregistrement de l'historique des révisions: {e}")
+
+    def review_history(self, deck_id=None):
+        """
+        Prépare l'analyse de l'historique des révisions (models.analytics.compute_review_stats),
+        qui peut ensuite être confiée à un thread de travail.
+
+        Les cartes des decks non chargés sont repérées par leur seul recto (load_card_fronts),
+        sans charger les decks. Les compteurs de chaque carte ne sont relus que pour un seul deck ;
+        pour tous les decks, les agrégats des résumés en tiennent lieu.
+
+        Args:
+            deck_id: L'identifiant du deck analysé (None pour tous les decks).
+
+        Returns:
+            Dictionnaire : tranches figées de l'historique ("slices"), identifiants des cartes de
+            l'historique ("card_ids") et position de leur deck dans "decks" ou -1 hors du périmètre
+            ("card_decks"), decks (id, nom), recto des cartes analysées ("fronts"), compteurs
+            des résumés des decks ("summaries") et, pour un seul deck, compteurs de ses cartes
+            ("counters"). None si le deck est introuvable.
+        """
+        if deck_id is not None:
+            deck = self.get_deck(deck_id)
+            if not deck:
+                return None
+            decks = [deck]
+        else:
+            decks = list(self.decks)
+
+        # Les tranches sont figées avant de copier les identifiants : elles n'en référencent aucun nouveau
+        slices = self.review_log.snapshot()
+        card_ids = list(self.review_log.card_ids)
+        card_decks = array('i', [-1]) * len(card_ids)
+        fronts = {}
+        for position, deck in enumerate(decks):
+            if deck.cards is not None:
+                deck_fronts = [(card.id, card.front) for card in deck.cards]
+            else:
+                deck_fronts = self.storage.load_card_fronts(deck.id)
+            for card_id, front in deck_fronts:
+                number = self.review_log.card_number(card_id)
+                if number is not None and number < len(card_decks):
+                    card_decks[number] = position
+                    fronts[card_id] = front
+
+        counters = None
+        if deck_id is not None:
+            cards = self.get_cards(deck_id)
+            counters = (array('I', (card.correct_count for card in cards)),
+                        array('I', (card.incorrect_count for card in cards)))
+
+        return {
+            "slices": slices,
+            "card_ids": card_ids,
+            "card_decks": card_decks,
+            "decks": [(deck.id, deck.name) for deck in decks],
+            "fronts": fronts,
+            "summaries": [(deck.summary.correct_answers, deck.summary.incorrect_answers) for deck in decks],
+            "counters": counters,
+        }
+
+    def end_study_session(self, deck_id):
+        """
+        Termine la session d'étude d'un deck : la prochaine session repartira des cartes à étudier.
+
+        Args:
+            deck_id: L'identifiant du deck.
+        """
+        self._study_sessions.pop(deck_id, None)
 
     def update_card_result(self, deck_id, card_id, is_correct):
         """
-        Met à jour les statistiques de réponse d’une carte après révision.
+        Met à jour les statistiques de réponse d’une carte après révision et planifie
+        sa prochaine révision.
 
         Args:
             deck_id: L'identifiant du deck.
@@ -280,23 +927,115 @@ class DeckManager:
         Returns:
             True si la mise à jour a réussi, False sinon.
         """
-        deck = self.get_deck(deck_id)
-        if not deck:
+        card = self.get_card(deck_id, card_id)
+        if not card:
             return False
 
-        for card in deck["cards"]:
-            if card["id"] == card_id:
-                if is_correct:
-                    card["correct_count"] = card.get("correct_count", 0) + 1
-                else:
-                    card["incorrect_count"] = card.get("incorrect_count", 0) + 1
+        with self._lock:
+            deck = self.get_deck(deck_id)
+            if is_correct:
+                card.correct_count += 1
+                deck.summary.correct_answers += 1
+            else:
+                card.incorrect_count += 1
+                deck.summary.incorrect_answers += 1
+
+            # Décompte pour les limites quotidiennes, puis planification de la prochaine révision
+            progress = self._today_progress(deck)
+            if card.due is None:
+                progress.new_cards += 1
+            else:
+                progress.reviews += 1
+
+            now = int(time.time())
+            review_card(card, QUALITY_CORRECT if is_correct else QUALITY_INCORRECT, now)
+            if deck_id in self._due_queues:
+                self._due_queues[deck_id].add(card)
+
+            # Mise à jour de la date de dernière révision du deck
+            deck.last_studied = now
+            self.storage.record_result(deck, card)
+        return True
+
+    def _iter_all_cards(self):
+        """
+        Parcourt les cartes de tous les decks sous forme de paires (deck, carte) ; les cartes
+        des decks non chargés sont lues sans être gardées en mémoire.
+        """
+        for deck in self.decks:
+            cards = deck.cards if deck.cards is not None else self.storage.load_cards(deck.id)
+            for card in cards:
+                yield deck, card
+
+    def _ensure_search_index(self):
+        """Construit l'index en mémoire de toutes les cartes au premier appel."""
+        if self._search_index is None:
+            index = SearchIndex()
+            for deck, card in self._iter_all_cards():
+                index.add(deck.id, card)
+            self._search_index = index
+        return self._search_index
+
+    def search_cards(self, query, limit=50):
+        """
+        Recherche des cartes de tous les decks par le texte de leur recto ou de leur verso,
+        sans tenir compte des accents ni de la casse. Tous les mots de la requête doivent
+        être présents ; le dernier peut n'être qu'un début de mot.
 
-                # Mise à jour de la date de dernière révision du deck
-                deck["last_studied"] = datetime.now().isoformat()
-                self.save_decks()
-                return True
+        Args:
+            query: Le texte recherché.
+            limit: Nombre maximal de résultats.
 
-        return False
+        Returns:
+            Liste de dictionnaires (deck_id, deck_name, card_id, front, back, score),
+            du plus pertinent au moins pertinent.
+        """
+        if self.storage.supports_search:
+            hits = self.storage.search_cards(query, limit)
+        else:
+            hits = []
+            for deck_id, card_id, score in self._ensure_search_index().search(query, limit):
+                card = self.get_card(deck_id, card_id)
+                if card is not None:
+                    hits.append((deck_id, card_id, card.front, card.back, score))
+
+        results = []
+        for deck_id, card_id, front, back, score in hits:
+            deck = self.get_deck(deck_id)
+            if deck is None:
+                continue
+            results.append({
+                "deck_id": deck_id,
+                "deck_name": deck.name,
+                "card_id": card_id,
+                "front": front,
+                "back": back,
+                "score": score
+            })
+        return results
+
+    def fuzzy_index(self):
+        """
+        Retourne l'index trigramme des noms de decks et des rectos de cartes, pour l'ouverture rapide.
+
+        Au premier appel, l'index est créé vide avec la liste de ses entrées en attente : il est tenu
+        à jour dès ce moment, et le chargement des entrées (index.load_pending) peut être confié
+        à un thread de travail. Les clés sont ("deck", id du deck) et ("card", id de la carte) ;
+        la donnée d'une carte est l'identifiant de son deck.
+
+        Returns:
+            Le TrigramIndex.
+        """
+        if self._fuzzy_index is None:
+            entries = [(("deck", deck.id), deck.name, None) for deck in self.decks]
+            for deck in self.decks:
+                if deck.cards is not None:
+                    fronts = [(card.id, card.front) for card in deck.cards]
+                else:
+                    fronts = self.storage.load_card_fronts(deck.id)
+                entries.extend((("card", card_id), front, deck.id) for card_id, front in fronts)
+            self._fuzzy_index = TrigramIndex(entries)
+        return self._fuzzy_index
 
     def get_card_count(self, deck_id):
         """
@@ -309,46 +1048,98 @@ class DeckManager:
             Nombre total de cartes ou 0 si le deck est introuvable.
         """
         deck = self.get_deck(deck_id)
-        if deck:
-            return len(deck["cards"])
-        return 0
+        if not deck:
+            return 0
+        return deck.summary.card_count
 
-    def get_deck_stats(self, deck_id):
+    def get_deck_summary(self, deck_id):
         """
-        Calcule des statistiques globales pour un deck : nombre de réponses correctes/incorrectes et taux de réussite.
+        Retourne le résumé d'un deck (nom, nombre de cartes, réponses, timestamp de dernière étude)
+        sans charger ses cartes.
 
         Args:
             deck_id: L'identifiant du deck.
 
         Returns:
-            Dictionnaire des statistiques ou None si le deck est introuvable.
+            Dictionnaire du résumé ou None si le deck est introuvable.
         """
         deck = self.get_deck(deck_id)
         if not deck:
             return None
 
-        total_correct = 0
-        total_incorrect = 0
-
-        for card in deck["cards"]:
-            total_correct += card.get("correct_count", 0)
-            total_incorrect += card.get("incorrect_count", 0)
-
-        total_answers = total_correct + total_incorrect
+        summary = deck.summary
+        total_answers = summary.correct_answers + summary.incorrect_answers
         success_rate = 0
         if total_answers > 0:
-            success_rate = (total_correct / total_answers) * 100
+            success_rate = (summary.correct_answers / total_answers) * 100
+
+        return {
+            "id": deck.id,
+            "name": deck.name,
+            "card_count": summary.card_count,
+            "correct_answers": summary.correct_answers,
+            "incorrect_answers": summary.incorrect_answers,
+            "success_rate": success_rate,
+            "last_studied": deck.last_studied
+        }
+
+    def get_deck_summaries(self):
+        """
+        Retourne le résumé de tous les decks, dans l'ordre de la liste des decks.
+        """
+        return [self.get_deck_summary(deck.id) for deck in self.decks]
+
+    def get_deck_stats(self, deck_id):
+        """
+        Retourne des statistiques globales pour un deck : nombre de réponses correctes/incorrectes et taux de réussite.
+        Les totaux sont lus dans les agrégats du deck, tenus à jour à chaque modification : aucune carte n'est parcourue.
+
+        Args:
+            deck_id: L'identifiant du deck.
+
+        Returns:
+            Dictionnaire des statistiques ou None si le deck est introuvable.
+        """
+        summary = self.get_deck_summary(deck_id)
+        if not summary:
+            return None
 
         return {
-            "total_cards": len(deck["cards"]),
-            "correct_answers": total_correct,
-            "incorrect_answers": total_incorrect,
-            "success_rate": success_rate
+            "total_cards": summary["card_count"],
+            "correct_answers": summary["correct_answers"],
+            "incorrect_answers": summary["incorrect_answers"],
+            "success_rate": summary["success_rate"]
         }
 
+    def check_deck_stats(self, repair=True):
+        """
+        Vérifie que les agrégats de chaque deck correspondent à ses cartes, en les recalculant
+        à partir des compteurs de chaque carte. Les decks non chargés sont lus puis libérés.
+
+        Args:
+            repair: Si True, remplace et enregistre les agrégats incohérents.
+
+        Returns:
+            Liste des identifiants des decks dont les agrégats étaient incohérents.
+        """
+        inconsistent = []
+        with self._lock, self.storage.transaction():
+            for deck in self.decks:
+                was_loaded = deck.cards is not None
+                computed = self._compute_summary(self._ensure_cards(deck, evict=False))
+                if computed != deck.summary:
+                    inconsistent.append(deck.id)
+                    if repair:
+                        deck.summary = computed
+                        self.storage.save_deck(deck)
+                if not was_loaded:
+                    self.evict_deck(deck.id)
+        return inconsistent
+
     def add_media_to_card(self, deck_id, card_id, media_type, file_path):
         """
-        Associe un média (image, audio, etc.) à une carte.
+        Associe un média (image, audio, etc.) à une carte. Le fichier est copié dans le magasin
+        de médias, sauf si un fichier de même contenu y est déjà.
 
         Args:
             deck_id: L'identifiant du deck.
@@ -357,26 +1148,83 @@ class DeckManager:
             file_path: Chemin d’accès au fichier média.
 
         Returns:
-            True si le média a été ajouté avec succès, False sinon.
+            L'identifiant du média ajouté, ou None si la carte est introuvable
+            ou si le fichier n'a pas pu être copié.
         """
-        deck = self.get_deck(deck_id)
-        if not deck:
+        card = self.get_card(deck_id, card_id)
+        if not card:
+            return None
+
+        try:
+            name = self.media_store.add_file(file_path)
+        except OSError as e:
+            print(f"Erreur lors de l'ajout du média: {e}")
+            return None
+        if self._batch_depth > 0:
+            self._acquired_media.append(name)
+        else:
+            self.media_store.save()  # Le média est compté dans l'index avant l'écriture de la carte
+
+        media_id = str(uuid.uuid4())
+        with self._lock:
+            card.media.append(Media(media_id, media_type, name))
+            self.storage.save_card(self.get_deck(deck_id), card)
+        return media_id
+
+    def remove_media_from_card(self, deck_id, card_id, media_id):
+        """
+        Retire un média d'une carte.
+
+        Args:
+            deck_id: L'identifiant du deck.
+            card_id: L'identifiant de la carte.
+            media_id: L'identifiant du média.
+
+        Returns:
+            True si le média a été retiré, False sinon.
+        """
+        card = self.get_card(deck_id, card_id)
+        if not card or not card.has_media:
             return False
 
-        for card in deck["cards"]:
-            if card["id"] == card_id:
-                if "media" not in card:
-                    card["media"] = []
+        with self._lock:
+            for position, media in enumerate(card.media):
+                if media.id == media_id:
+                    del card.media[position]
+                    break
+            else:
+                return False
+            self._release_media_paths([media.path])
+            self.storage.save_card(self.get_deck(deck_id), card)
+        return True
+
+    def media_path(self, media):
+        """
+        Retourne le chemin du fichier d'un média : fichier du magasin, ou chemin externe
+        pour les médias ajoutés avant le magasin.
 
-                media_id = str(uuid.uuid4())
-                media = {
-                    "id": media_id,
-                    "type": media_type,
-                    "path": file_path
-                }
+        Args:
+            media: Le média (objet Media).
+        """
+        if MediaStore.is_stored_name(media.path):
+            return self.media_store.path(media.path)
+        return media.path
 
-                card["media"].append(media)
-                self.save_decks()
-                return True
+    def _release_media(self, cards):
+        """Décompte les références au magasin des médias de cartes supprimées."""
+        self._release_media_paths([media.path for card in cards if card.has_media for media in card.media])
 
-        return False
\ No newline at end of file
+    def _release_media_paths(self, paths):
+        """
+        Retire des références au magasin. Elles ne sont décomptées qu'une fois l'effacement
+        des cartes écrit (flush, close ou début du bloc batch suivant) : l'index enregistré
+        ne compte jamais moins de références que les cartes enregistrées.
+        """
+        self._released_media.extend(path for path in paths if MediaStore.is_stored_name(path))
+
+    def _commit_media_releases(self):
+        """Décompte les références retirées, une fois les écritures terminées, et enregistre l'index."""
+        released, self._released_media = self._released_media, []
+        for name in released:
+            self.media_store.release(name)
+        self.media_store.save()
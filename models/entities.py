@@ -0,0 +1,255 @@
+from datetime import datetime
+
+
+# Facilité initiale d'une carte pour l'algorithme de répétition espacée (SM-2)
+DEFAULT_EASE = 2.5
+
+
+def to_timestamp(value):
+    """
+    Convertit une date ISO 8601 (format du fichier JSON) en timestamp entier.
+
+    Args:
+        value: La date au format ISO, un timestamp déjà converti ou None.
+
+    Returns:
+        Le nombre de secondes depuis l'epoch, ou None.
+    """
+    if value is None or isinstance(value, int):
+        return value
+    return int(datetime.fromisoformat(value).timestamp())
+
+
+def to_iso(timestamp):
+    """
+    Convertit un timestamp entier en date ISO 8601 pour l'écriture au format JSON.
+
+    Args:
+        timestamp: Le nombre de secondes depuis l'epoch, ou None.
+
+    Returns:
+        La date au format ISO, ou None.
+    """
+    if timestamp is None:
+        return None
+    return datetime.fromtimestamp(timestamp).isoformat()
+
+
+class Media:
+    """
+    Média (image, audio, etc.) associé à une carte.
+    """
+
+    __slots__ = ("id", "type", "path")
+
+    def __init__(self, media_id, media_type, path):
+        self.id = media_id
+        self.type = media_type
+        self.path = path
+
+    def to_dict(self):
+        """Retourne le média au format du fichier JSON."""
+        return {"id": self.id, "type": self.type, "path": self.path}
+
+    @classmethod
+    def from_dict(cls, data):
+        """Crée un média à partir de sa forme JSON."""
+        return cls(data["id"], data["type"], data["path"])
+
+
+class Card:
+    """
+    Carte d'un deck.
+
+    Les dates sont stockées en timestamps entiers et la liste des médias n'est créée
+    qu'au premier média ajouté, la plupart des cartes n'en ayant aucun.
+
+    ease, interval (en jours), repetitions et due portent l'état de la répétition espacée ;
+    due vaut None tant que la carte n'a jamais été révisée (carte nouvelle).
+    """
+
+    __slots__ = ("id", "front", "back", "created_at", "correct_count", "incorrect_count",
+                 "ease", "interval", "repetitions", "due", "_media")
+
+    def __init__(self, card_id, front, back, created_at=None, correct_count=0, incorrect_count=0,
+                 ease=DEFAULT_EASE, interval=0, repetitions=0, due=None):
+        self.id = card_id
+        self.front = front
+        self.back = back
+        self.created_at = created_at
+        self.correct_count = correct_count
+        self.incorrect_count = incorrect_count
+        self.ease = ease
+        self.interval = interval
+        self.repetitions = repetitions
+        self.due = due
+        self._media = None
+
+    @property
+    def media(self):
+        """Liste des médias de la carte, créée à la première utilisation."""
+        if self._media is None:
+            self._media = []
+        return self._media
+
+    @property
+    def has_media(self):
+        """Indique si la carte possède au moins un média, sans créer la liste."""
+        return bool(self._media)
+
+    def to_dict(self):
+        """Retourne la carte au format du fichier JSON."""
+        return {
+            "id": self.id,
+            "front": self.front,
+            "back": self.back,
+            "created_at": to_iso(self.created_at),
+            "correct_count": self.correct_count,
+            "incorrect_count": self.incorrect_count,
+            "ease": self.ease,
+            "interval": self.interval,
+            "repetitions": self.repetitions,
+            "due": to_iso(self.due),
+            "media": [media.to_dict() for media in self._media] if self._media else []
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """Crée une carte à partir de sa forme JSON."""
+        card = cls(
+            data["id"],
+            data["front"],
+            data["back"],
+            to_timestamp(data.get("created_at")),
+            data.get("correct_count", 0),
+            data.get("incorrect_count", 0),
+            data.get("ease", DEFAULT_EASE),
+            data.get("interval", 0),
+            data.get("repetitions", 0),
+            to_timestamp(data.get("due"))
+        )
+        if data.get("media"):
+            card._media = [Media.from_dict(media) for media in data["media"]]
+        return card
+
+
+class DeckSummary:
+    """
+    Résumé d'un deck : nombre de cartes et totaux de réponses, stockés à part des cartes.
+    """
+
+    __slots__ = ("card_count", "correct_answers", "incorrect_answers")
+
+    def __init__(self, card_count=0, correct_answers=0, incorrect_answers=0):
+        self.card_count = card_count
+        self.correct_answers = correct_answers
+        self.incorrect_answers = incorrect_answers
+
+    def __eq__(self, other):
+        if not isinstance(other, DeckSummary):
+            return NotImplemented
+        return (self.card_count, self.correct_answers, self.incorrect_answers) == \
+            (other.card_count, other.correct_answers, other.incorrect_answers)
+
+    def to_dict(self):
+        """Retourne le résumé au format JSON."""
+        return {
+            "card_count": self.card_count,
+            "correct_answers": self.correct_answers,
+            "incorrect_answers": self.incorrect_answers
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """Crée un résumé à partir de sa forme JSON ; retourne None si data est vide."""
+        if not data:
+            return None
+        return cls(data.get("card_count", 0), data.get("correct_answers", 0),
+                   data.get("incorrect_answers", 0))
+
+
+class DailyProgress:
+    """
+    Nombre de cartes nouvelles et de révisions étudiées dans un deck pendant une journée,
+    pour appliquer les limites quotidiennes de la répétition espacée.
+    """
+
+    __slots__ = ("day", "new_cards", "reviews")
+
+    def __init__(self, day, new_cards=0, reviews=0):
+        self.day = day
+        self.new_cards = new_cards
+        self.reviews = reviews
+
+    def to_dict(self):
+        """Retourne la progression au format JSON."""
+        return {"day": self.day, "new_cards": self.new_cards, "reviews": self.reviews}
+
+    @classmethod
+    def from_dict(cls, data):
+        """Crée une progression à partir de sa forme JSON ; retourne None si data est vide."""
+        if not data:
+            return None
+        return cls(data["day"], data.get("new_cards", 0), data.get("reviews", 0))
+
+
+class Deck:
+    """
+    Deck de cartes.
+
+    cards vaut None tant que les cartes n'ont pas été chargées depuis le stockage.
+    progress est la progression quotidienne du dernier jour d'étude (None si jamais étudié).
+    """
+
+    __slots__ = ("id", "name", "description", "created_at", "last_studied", "summary", "progress", "cards")
+
+    def __init__(self, deck_id, name, description="", created_at=None, last_studied=None,
+                 summary=None, cards=None, progress=None):
+        self.id = deck_id
+        self.name = name
+        self.description = description
+        self.created_at = created_at
+        self.last_studied = last_studied
+        self.summary = summary
+        self.progress = progress
+        self.cards = cards
+
+    def to_dict(self, include_cards=True):
+        """
+        Retourne le deck au format du fichier JSON.
+
+        Args:
+            include_cards: Si False, seules les métadonnées et le résumé sont exportés.
+        """
+        data = {
+            "id": self.id,
+            "name": self.name,
+            "description": self.description,
+            "created_at": to_iso(self.created_at),
+            "last_studied": to_iso(self.last_studied),
+            "summary": self.summary.to_dict() if self.summary else None,
+            "progress": self.progress.to_dict() if self.progress else None
+        }
+        if include_cards:
+            data["cards"] = [card.to_dict() for card in self.cards or []]
+        return data
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Crée un deck à partir de sa forme JSON. Si la clé "cards" est absente,
+        les cartes restent à charger (cards vaut None).
+        """
+        cards = None
+        if data.get("cards") is not None:
+            cards = [Card.from_dict(card) for card in data["cards"]]
+        return cls(
+            data["id"],
+            data["name"],
+            data.get("description", ""),
+            to_timestamp(data.get("created_at")),
+            to_timestamp(data.get("last_studied")),
+            DeckSummary.from_dict(data.get("summary")),
+            cards,
+            DailyProgress.from_dict(data.get("progress"))
+        )
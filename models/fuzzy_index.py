@@ -0,0 +1,232 @@
+import threading
+from array import array
+from collections import Counter
+
+from models.search_index import normalize, tokenize
+
+
+# Part minimale des trigrammes de la requête qu'un texte doit contenir pour être proposé
+MIN_COVERAGE = 0.4
+
+# Seuls les premiers caractères d'un texte sont indexés (noms de decks, début du recto)
+MAX_TEXT_LENGTH = 100
+
+# Nombre d'entrées chargées entre deux prises du verrou, pour ne pas bloquer les mises à jour
+LOAD_CHUNK_SIZE = 5000
+
+
+def trigrams(text):
+    """
+    Retourne l'ensemble des trigrammes d'un texte normalisé : chaque mot est encadré
+    d'espaces ("  mot ") pour que le début des mots pèse davantage.
+
+    Args:
+        text: Le texte.
+
+    Returns:
+        Ensemble de chaînes de trois caractères.
+    """
+    grams = set()
+    for word in tokenize(text):
+        padded = f"  {word} "
+        for position in range(len(padded) - 2):
+            grams.add(padded[position:position + 3])
+    return grams
+
+
+class TrigramIndex:
+    """
+    Index trigramme pour la recherche approximative (tolérante aux fautes de frappe)
+    dans des textes courts : noms de decks et recto des cartes.
+
+    Chaque entrée a une clé unique, un texte et une donnée libre rendue avec les résultats.
+    Pour chaque trigramme, l'index garde un tableau compact des documents qui le contiennent ;
+    une entrée modifiée ou supprimée est marquée comme morte, et les documents morts sont purgés
+    quand ils deviennent majoritaires. Un texte est proposé s'il contient au moins MIN_COVERAGE
+    des trigrammes de la requête ; les résultats sont classés par part de trigrammes communs.
+
+    L'index peut être interrogé depuis un thread de travail pendant que l'interface le met à jour :
+    toutes les opérations passent par un verrou. Les entrées initiales peuvent être chargées
+    plus tard (load_pending), par exemple dans ce thread ; les clés ajoutées ou supprimées entre-temps
+    ne sont pas écrasées par ce chargement.
+    """
+
+    def __init__(self, entries=None):
+        """
+        Crée l'index.
+
+        Args:
+            entries: Liste facultative de tuples (clé, texte, donnée) à charger avec load_pending.
+        """
+        self._lock = threading.Lock()
+        self._postings = {}     # trigramme -> array des documents
+        self._docs = []         # document -> (clé, texte, donnée), None si mort
+        self._sizes = array('I')  # document -> nombre de trigrammes
+        self._doc_of_key = {}   # clé -> document vivant
+        self._dead = 0
+        self._pending = list(entries) if entries is not None else None
+        self._touched = set()   # clés modifiées depuis la création, ignorées par load_pending
+
+    @property
+    def ready(self):
+        """Indique si les entrées initiales ont été chargées."""
+        return self._pending is None
+
+    def __len__(self):
+        return len(self._doc_of_key)
+
+    def add(self, key, text, data=None):
+        """
+        Ajoute une entrée, ou remplace celle qui a la même clé.
+
+        Args:
+            key: La clé de l'entrée.
+            text: Le texte cherché.
+            data: Donnée rendue avec les résultats.
+        """
+        with self._lock:
+            if self._pending is not None:
+                self._touched.add(key)
+            self._add(key, text, data)
+
+    def remove(self, key):
+        """
+        Retire une entrée.
+
+        Args:
+            key: La clé de l'entrée.
+        """
+        with self._lock:
+            if self._pending is not None:
+                self._touched.add(key)
+            self._remove(key)
+
+    def remove_if(self, predicate):
+        """
+        Retire toutes les entrées vérifiant une condition (par exemple les cartes d'un deck supprimé).
+
+        Args:
+            predicate: Fonction appelée avec (clé, donnée), qui retourne True pour retirer l'entrée.
+        """
+        with self._lock:
+            for entry in self._docs:
+                if entry is not None and predicate(entry[0], entry[2]):
+                    if self._pending is not None:
+                        self._touched.add(entry[0])
+                    self._remove(entry[0])
+
+    def load_pending(self, cancelled=None):
+        """
+        Charge les entrées initiales par lots, en rendant le verrou entre deux lots.
+        Ne fait rien si elles sont déjà chargées.
+
+        Args:
+            cancelled: Fonction facultative consultée entre deux lots ; si elle retourne True,
+                le chargement s'arrête et pourra être repris par un nouvel appel.
+
+        Returns:
+            True si toutes les entrées sont chargées, False si le chargement a été interrompu.
+        """
+        entries = self._pending
+        if entries is None:
+            return True
+        for start in range(0, len(entries), LOAD_CHUNK_SIZE):
+            if cancelled is not None and cancelled():
+                return False
+            with self._lock:
+                for key, text, data in entries[start:start + LOAD_CHUNK_SIZE]:
+                    if key not in self._touched:
+                        self._add(key, text, data)
+        with self._lock:
+            self._pending = None
+            self._touched = set()
+        return True
+
+    def _add(self, key, text, data):
+        self._remove(key)
+        text = text[:MAX_TEXT_LENGTH]
+        grams = trigrams(text)
+        doc = len(self._docs)
+        self._docs.append((key, text, data))
+        self._sizes.append(len(grams))
+        self._doc_of_key[key] = doc
+        for gram in grams:
+            postings = self._postings.get(gram)
+            if postings is None:
+                postings = self._postings[gram] = array('I')
+            postings.append(doc)
+
+    def _remove(self, key):
+        doc = self._doc_of_key.pop(key, None)
+        if doc is None:
+            return
+        self._docs[doc] = None
+        self._dead += 1
+        if self._dead > 1000 and self._dead > len(self._doc_of_key):
+            self._compact()
+
+    def _compact(self):
+        """Renumérote les documents vivants et purge les documents morts des listes."""
+        renumbered = {}
+        docs = []
+        sizes = array('I')
+        for doc, entry in enumerate(self._docs):
+            if entry is not None:
+                renumbered[doc] = len(docs)
+                docs.append(entry)
+                sizes.append(self._sizes[doc])
+
+        postings = {}
+        for gram, gram_docs in self._postings.items():
+            new_docs = array('I', (renumbered[doc] for doc in gram_docs if doc in renumbered))
+            if new_docs:
+                postings[gram] = new_docs
+
+        self._docs = docs
+        self._sizes = sizes
+        self._postings = postings
+        self._doc_of_key = {entry[0]: doc for doc, entry in enumerate(docs)}
+        self._dead = 0
+
+    def search(self, query, limit=20):
+        """
+        Recherche les textes les plus proches de la requête, même mal orthographiée.
+
+        Args:
+            query: Le texte recherché.
+            limit: Nombre maximal de résultats.
+
+        Returns:
+            Liste de tuples (clé, texte, donnée, score entre 0 et 1), du plus proche au moins proche.
+        """
+        query_grams = trigrams(query)
+        if not query_grams:
+            return []
+        min_shared = max(1, int(len(query_grams) * MIN_COVERAGE + 0.999))
+
+        with self._lock:
+            shared = Counter()
+            for gram in query_grams:
+                postings = self._postings.get(gram)
+                if postings is not None:
+                    shared.update(postings)
+
+            scored = []
+            for doc, count in shared.items():
+                if count < min_shared or self._docs[doc] is None:
+                    continue
+                coverage = count / len(query_grams)
+                # À couverture égale, le texte le plus court (le plus proche de la requête) passe devant
+                similarity = 2 * count / (len(query_grams) + self._sizes[doc])
+                scored.append((coverage, similarity, doc))
+
+            scored.sort(reverse=True)
+            results = []
+            for coverage, similarity, doc in scored[:limit]:
+                key, text, data = self._docs[doc]
+                results.append((key, text, data, (coverage + similarity) / 2))
+
+        # Une correspondance exacte du début du texte passe devant les autres
+        prefix = normalize(query.strip())
+        results.sort(key=lambda result: not normalize(result[1]).startswith(prefix))
+        return results
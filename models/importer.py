@@ -0,0 +1,66 @@
+import os
+import csv
+
+
+# Séparateur utilisé selon l'extension du fichier lorsqu'aucun n'est précisé
+DELIMITERS = {".tsv": "\t", ".tab": "\t", ".txt": "\t", ".csv": ","}
+
+
+def guess_delimiter(path):
+    """
+    Devine le séparateur d'un fichier d'après son extension (virgule par défaut).
+
+    Args:
+        path: Chemin du fichier.
+    """
+    return DELIMITERS.get(os.path.splitext(path)[1].lower(), ",")
+
+
+def count_lines(path):
+    """
+    Compte les lignes d'un fichier sans le décoder, pour dimensionner une barre de progression.
+
+    Args:
+        path: Chemin du fichier.
+
+    Returns:
+        Le nombre de lignes (un majorant du nombre de lignes CSV si des champs contiennent des retours à la ligne).
+    """
+    lines = 0
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 16), b""):
+            lines += block.count(b"\n")
+    return lines
+
+
+def read_card_rows(path, delimiter=None, front_column=0, back_column=1, skip_header=False,
+                   encoding="utf-8-sig"):
+    """
+    Lit un fichier CSV/TSV ligne par ligne et produit les paires (question, réponse).
+
+    Le fichier n'est jamais chargé entièrement en mémoire. Une ligne trop courte pour
+    contenir les deux colonnes produit une paire vide, qui sera ignorée à l'import.
+
+    Args:
+        path: Chemin du fichier.
+        delimiter: Séparateur de colonnes (deviné d'après l'extension si None).
+        front_column: Indice (à partir de 0) de la colonne des questions.
+        back_column: Indice (à partir de 0) de la colonne des réponses.
+        skip_header: Si True, la première ligne est ignorée.
+        encoding: Encodage du fichier (UTF-8, avec ou sans BOM, par défaut).
+
+    Yields:
+        Tuples (question, réponse).
+    """
+    if delimiter is None:
+        delimiter = guess_delimiter(path)
+
+    with open(path, 'r', encoding=encoding, newline='') as f:
+        reader = csv.reader(f, delimiter=delimiter)
+        if skip_header:
+            next(reader, None)
+        for row in reader:
+            if len(row) <= max(front_column, back_column):
+                yield "", ""
+                continue
+            yield row[front_column], row[back_column]
@@ -0,0 +1,88 @@
+import os
+import json
+
+
+class ReviewJournal:
+    """
+    Journal en ajout seul des résultats de révision.
+
+    Chaque réponse est écrite comme une petite ligne JSON à la fin du fichier, ce qui évite
+    de réécrire toute la collection ; la ligne est synchronisée sur disque avant de rendre
+    la main. Un enregistrement contient l'état final des compteurs de la carte et du deck
+    (et non un incrément) : rejouer deux fois le même journal donne donc le même résultat.
+    """
+
+    def __init__(self, journal_file):
+        """
+        Ouvre (ou crée) le journal.
+
+        Args:
+            journal_file: Chemin du fichier journal (une entrée JSON par ligne).
+        """
+        self.journal_file = journal_file
+        self._file = None
+        self._entry_count = 0
+
+    def __len__(self):
+        """Nombre d'entrées présentes dans le journal depuis le dernier compactage."""
+        return self._entry_count
+
+    def append(self, deck_id, card_id, card_fields, deck_fields):
+        """
+        Ajoute le résultat d'une révision à la fin du journal.
+
+        Args:
+            deck_id: L'identifiant du deck.
+            card_id: L'identifiant de la carte.
+            card_fields: Dictionnaire des champs de la carte modifiés par la révision.
+            deck_fields: Dictionnaire des champs du deck modifiés par la révision
+                (date de dernière étude, résumé).
+        """
+        if self._file is None:
+            self._file = open(self.journal_file, 'a', encoding='utf-8')
+
+        record = {"d": deck_id, "c": card_id, "f": card_fields, "df": deck_fields}
+        self._file.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._entry_count += 1
+
+    def replay(self):
+        """
+        Relit toutes les entrées du journal dans leur ordre d'écriture.
+
+        Une dernière ligne incomplète (coupure pendant l'écriture) est ignorée.
+
+        Returns:
+            Liste de tuples (deck_id, card_id, card_fields, deck_fields).
+        """
+        entries = []
+        if not os.path.exists(self.journal_file):
+            self._entry_count = 0
+            return entries
+
+        with open(self.journal_file, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                entries.append((record["d"], record["c"], record["f"], record.get("df", {})))
+
+        self._entry_count = len(entries)
+        return entries
+
+    def truncate(self):
+        """
+        Vide le journal, une fois son contenu intégré à l'instantané principal.
+        """
+        self.close()
+        if os.path.exists(self.journal_file):
+            os.remove(self.journal_file)
+        self._entry_count = 0
+
+    def close(self):
+        """Ferme le fichier journal s'il est ouvert."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
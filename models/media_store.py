@@ -0,0 +1,241 @@
+import os
+import re
+import json
+import shutil
+import hashlib
+
+from models.storage import fsync_directory, write_json_atomic
+
+
+# Nom d'un fichier du magasin : empreinte SHA-256 du contenu suivie de l'extension d'origine
+STORED_NAME_RE = re.compile(r"^[0-9a-f]{64}(\.[0-9a-z]+)?$")
+
+# Taille des blocs lus pour calculer l'empreinte d'un fichier
+HASH_CHUNK_SIZE = 1 << 20
+
+
+class MediaStore:
+    """
+    Magasin des médias (images, sons) indexé par contenu.
+
+    Chaque fichier est copié une seule fois dans le dossier du magasin sous le nom
+    "<sha256><extension>", rangé dans un sous-dossier des deux premiers caractères :
+    la même image ajoutée à mille cartes n'est stockée qu'une fois. Un compteur de références
+    par fichier est tenu en mémoire et enregistré dans index.json par save, une fois par lot
+    de modifications ; un fichier absent de l'index n'est plus référencé et est supprimé par purge
+    (à la fermeture), y compris s'il l'était devenu avant un arrêt brutal de l'application.
+
+    L'index enregistré ne doit jamais compter moins de références que les cartes enregistrées :
+    les références ajoutées sont enregistrées avant les cartes qui les utilisent, les références
+    retirées après l'effacement de ces cartes (c'est au DeckManager d'appeler save dans cet ordre).
+
+    Les miniatures générées pour l'affichage sont rangées dans thumbnails/<taille>/.
+    """
+
+    INDEX_FILE = "index.json"
+    THUMBNAILS_DIR = "thumbnails"
+
+    def __init__(self, media_dir):
+        """
+        Ouvre (ou crée) le magasin de médias.
+
+        Args:
+            media_dir: Dossier du magasin.
+        """
+        self.media_dir = media_dir
+        self.index_file = os.path.join(media_dir, self.INDEX_FILE)
+        self._refs = {}            # nom du fichier -> nombre de références
+        self._dirty = False        # Compteurs modifiés depuis le dernier enregistrement de l'index
+        # Index illisible : les fichiers non référencés ne peuvent pas être distingués des autres
+        self._index_valid = True
+
+        if not os.path.exists(media_dir):
+            os.makedirs(media_dir)
+        if os.path.exists(self.index_file):
+            try:
+                with open(self.index_file, 'r', encoding='utf-8') as f:
+                    self._refs = json.load(f).get("refs", {})
+            except Exception as e:
+                self._index_valid = False
+                print(f"Erreur lors du chargement de l'index des médias: {e}")
+
+    @staticmethod
+    def is_stored_name(path):
+        """Indique si un chemin de média désigne un fichier du magasin (et non un fichier externe)."""
+        return bool(path) and STORED_NAME_RE.match(path) is not None
+
+    def path(self, name):
+        """
+        Retourne le chemin absolu d'un fichier du magasin.
+
+        Args:
+            name: Nom du fichier dans le magasin.
+        """
+        return os.path.join(self.media_dir, name[:2], name)
+
+    def thumbnail_path(self, name, size):
+        """
+        Retourne le chemin de la miniature d'un fichier (qu'elle existe déjà ou non).
+
+        Args:
+            name: Nom du fichier dans le magasin.
+            size: Taille maximale (en pixels) du plus grand côté de la miniature.
+        """
+        digest = name.split(".", 1)[0]
+        return os.path.join(self.media_dir, self.THUMBNAILS_DIR, str(size), f"{digest}.png")
+
+    def ref_count(self, name):
+        """Retourne le nombre de références d'un fichier du magasin."""
+        return self._refs.get(name, 0)
+
+    def __len__(self):
+        return len(self._refs)
+
+    @staticmethod
+    def _file_digest(file_path):
+        """Calcule l'empreinte SHA-256 d'un fichier, lu par blocs."""
+        digest = hashlib.sha256()
+        with open(file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    @staticmethod
+    def _extension(extension):
+        """Normalise une extension (".PNG" -> ".png") ; une extension inhabituelle est ignorée."""
+        extension = extension.lower()
+        return extension if re.match(r"^\.[0-9a-z]+$", extension) else ""
+
+    def add_file(self, file_path):
+        """
+        Ajoute un fichier au magasin (copié seulement si son contenu n'y est pas déjà)
+        et compte une référence.
+
+        Args:
+            file_path: Chemin du fichier à ajouter.
+
+        Returns:
+            Le nom du fichier dans le magasin.
+
+        Raises:
+            OSError: Si le fichier ne peut pas être lu ou copié.
+        """
+        name = self._file_digest(file_path) + self._extension(os.path.splitext(file_path)[1])
+        target = self.path(name)
+        if not os.path.exists(target):
+            def copy(f):
+                with open(file_path, 'rb') as source:
+                    shutil.copyfileobj(source, f)
+            self._write(target, copy)
+        self.acquire(name)
+        return name
+
+    def add_bytes(self, data, extension=""):
+        """
+        Ajoute au magasin un contenu en mémoire (par exemple une image collée) et compte une référence.
+
+        Args:
+            data: Le contenu (bytes).
+            extension: Extension du fichier, avec le point (".png").
+
+        Returns:
+            Le nom du fichier dans le magasin.
+        """
+        name = hashlib.sha256(data).hexdigest() + self._extension(extension)
+        target = self.path(name)
+        if not os.path.exists(target):
+            self._write(target, lambda f: f.write(data))
+        self.acquire(name)
+        return name
+
+    @staticmethod
+    def _write(target, write):
+        """Écrit un fichier du magasin via un fichier temporaire synchronisé puis renommé."""
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        temp_file = target + ".tmp"
+        try:
+            with open(temp_file, 'wb') as f:
+                write(f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_file, target)
+            fsync_directory(target)
+        except BaseException:
+            if os.path.exists(temp_file):
+                os.remove(temp_file)
+            raise
+
+    def acquire(self, name):
+        """
+        Compte une référence supplémentaire vers un fichier du magasin (carte copiée, annulation).
+
+        Args:
+            name: Nom du fichier dans le magasin.
+        """
+        self._refs[name] = self._refs.get(name, 0) + 1
+        self._dirty = True
+
+    def release(self, name):
+        """
+        Retire une référence vers un fichier du magasin ; sans référence, il sera supprimé au prochain purge.
+
+        Args:
+            name: Nom du fichier dans le magasin.
+        """
+        count = self._refs.get(name, 0) - 1
+        if count > 0:
+            self._refs[name] = count
+        else:
+            self._refs.pop(name, None)
+        self._dirty = True
+
+    def stored_names(self):
+        """Retourne les noms des fichiers présents dans le magasin (miniatures exclues)."""
+        names = []
+        for entry in os.scandir(self.media_dir):
+            if entry.is_dir() and len(entry.name) == 2:
+                names.extend(name for name in os.listdir(entry.path) if STORED_NAME_RE.match(name))
+        return names
+
+    def purge(self):
+        """
+        Supprime les fichiers et miniatures qui ne sont plus référencés : tous les fichiers du magasin
+        absents de l'index, y compris ceux laissés par une session interrompue. L'index est d'abord
+        enregistré ; sans index lisible, rien n'est supprimé.
+
+        Returns:
+            Le nombre de fichiers supprimés.
+        """
+        if not self.save():
+            return 0
+        thumbnails_dir = os.path.join(self.media_dir, self.THUMBNAILS_DIR)
+        sizes = os.listdir(thumbnails_dir) if os.path.isdir(thumbnails_dir) else []
+        removed = 0
+        for name in self.stored_names():
+            if name in self._refs:
+                continue
+            for path in [self.path(name)] + [self.thumbnail_path(name, size) for size in sizes]:
+                if os.path.exists(path):
+                    os.remove(path)
+            removed += 1
+        return removed
+
+    def save(self):
+        """
+        Enregistre les compteurs de références s'ils ont changé depuis le dernier enregistrement.
+        Un index illisible n'est pas remplacé : il ne contiendrait que les références de la session.
+
+        Returns:
+            True si l'index enregistré est à jour, False sinon.
+        """
+        if not self._index_valid:
+            return False
+        if not self._dirty:
+            return True
+        try:
+            write_json_atomic(self.index_file, {"version": 1, "refs": self._refs})
+        except Exception as e:
+            print(f"Erreur lors de l'enregistrement de l'index des médias: {e}")
+            return False
+        self._dirty = False
+        return True
@@ -0,0 +1,395 @@
+import os
+import sys
+import glob
+import mmap
+import struct
+from array import array
+from bisect import bisect_left
+from collections import namedtuple
+
+from models.storage import fsync_directory
+
+
+# En-tête d'un bloc scellé : signature, version, nombre de réponses, nombre de cartes distinctes,
+# numéro de la réponse suivant le bloc, horodatages extrêmes, plus grand numéro de session
+CHUNK_HEADER = struct.Struct("<4sHxxIIQqqI20x")
+CHUNK_MAGIC = b"FMRL"
+
+# En-tête de la queue du journal : signature, version, numéro de sa première réponse
+TAIL_HEADER = struct.Struct("<4sHxxQ")
+TAIL_MAGIC = b"FMRT"
+
+# Une réponse dans la queue : carte, horodatage, résultat, durée (ms), session
+TAIL_RECORD = struct.Struct("<IqBII")
+
+FORMAT_VERSION = 1
+
+# Colonnes d'une tranche de l'historique (séquences de même longueur, une entrée par réponse)
+ReviewColumns = namedtuple("ReviewColumns", "cards timestamps results durations sessions")
+
+# Une réponse de l'historique d'une carte
+Review = namedtuple("Review", "timestamp correct duration_ms session")
+
+
+def _column(buffer, offset, typecode, count):
+    """
+    Lit une colonne petit-boutiste dans un tampon, sans copie sur les machines petit-boutistes.
+
+    Returns:
+        Un memoryview typé (ou un array sur une machine gros-boutiste), et la position suivant la colonne.
+    """
+    end = offset + array(typecode).itemsize * count
+    view = memoryview(buffer)[offset:end]
+    if sys.byteorder == "little":
+        return view.cast(typecode), end
+    column = array(typecode, view.tobytes())
+    column.byteswap()
+    return column, end
+
+
+def _little_endian(column):
+    """Retourne le contenu d'un array en petit-boutiste."""
+    if sys.byteorder == "little":
+        return column.tobytes()
+    column = array(column.typecode, column)
+    column.byteswap()
+    return column.tobytes()
+
+
+class _Chunk:
+    """
+    Bloc scellé de l'historique, projeté en mémoire (mmap) à la première lecture.
+
+    Le fichier contient l'en-tête puis les colonnes (horodatages, cartes, sessions, durées),
+    l'index par carte (cartes distinctes triées, début de chaque carte dans la liste des lignes,
+    lignes triées par carte puis par date) et enfin les résultats.
+    """
+
+    def __init__(self, path, header):
+        self.path = path
+        (_, _, self.count, self.key_count, self.end_row,
+         self.min_timestamp, self.max_timestamp, self.max_session) = header
+        self._map = None
+
+    def _open(self):
+        """Projette le fichier en mémoire et prépare les vues sur ses colonnes."""
+        with open(self.path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        offset = CHUNK_HEADER.size
+        self.timestamps, offset = _column(self._map, offset, 'q', self.count)
+        self.cards, offset = _column(self._map, offset, 'I', self.count)
+        self.sessions, offset = _column(self._map, offset, 'I', self.count)
+        self.durations, offset = _column(self._map, offset, 'I', self.count)
+        self.keys, offset = _column(self._map, offset, 'I', self.key_count)
+        self.starts, offset = _column(self._map, offset, 'I', self.key_count + 1)
+        self.rows, offset = _column(self._map, offset, 'I', self.count)
+        self.results, offset = _column(self._map, offset, 'B', self.count)
+
+    def columns(self):
+        if self._map is None:
+            self._open()
+        return ReviewColumns(self.cards, self.timestamps, self.results, self.durations, self.sessions)
+
+    def rows_of(self, card_index):
+        """Retourne les lignes d'une carte dans le bloc, par date croissante."""
+        if self._map is None:
+            self._open()
+        position = bisect_left(self.keys, card_index)
+        if position == len(self.keys) or self.keys[position] != card_index:
+            return []
+        return self.rows[self.starts[position]:self.starts[position + 1]]
+
+    def close(self):
+        if self._map is None:
+            return
+        for name in ("timestamps", "cards", "sessions", "durations", "keys", "starts", "rows", "results"):
+            column = getattr(self, name)
+            if isinstance(column, memoryview):
+                column.release()
+        try:
+            self._map.close()
+        except BufferError:
+            # Une tranche est encore utilisée par un appelant : la projection sera libérée avec elle
+            pass
+        self._map = None
+
+
+class ReviewLog:
+    """
+    Historique de toutes les réponses données en session d'étude, en format binaire colonnaire.
+
+    Chaque réponse tient en quelques octets : numéro de la carte (les identifiants sont rangés
+    une seule fois dans cards.txt), horodatage, résultat, temps passé sur la carte et numéro de session.
+    Les réponses sont d'abord ajoutées à une queue (tail.bin, enregistrements de taille fixe) ;
+    toutes les CHUNK_SIZE réponses, la queue est scellée en un bloc colonnaire (chunk-<numéro>.bin)
+    accompagné d'un index par carte, puis vidée.
+
+    Les blocs scellés ne sont jamais chargés en entier : ils sont projetés en mémoire à la demande,
+    les lectures par période sautent les blocs hors de la période puis cherchent par dichotomie
+    dans les horodatages (toujours croissants), et les lectures par carte passent par l'index du bloc.
+
+    Une réponse est transmise au système à chaque ajout mais n'est synchronisée sur disque
+    qu'au scellement du bloc : une coupure de courant peut faire perdre les dernières réponses
+    de l'historique, jamais les statistiques des cartes, qui ont leur propre journal.
+    """
+
+    CHUNK_SIZE = 65536
+    CARDS_FILE = "cards.txt"
+    TAIL_FILE = "tail.bin"
+
+    def __init__(self, log_dir):
+        """
+        Ouvre (ou crée) l'historique.
+
+        Args:
+            log_dir: Dossier de l'historique.
+        """
+        self.log_dir = log_dir
+        self.cards_file = os.path.join(log_dir, self.CARDS_FILE)
+        self.tail_file = os.path.join(log_dir, self.TAIL_FILE)
+        self.card_ids = []          # numéro de carte -> identifiant
+        self._card_numbers = {}     # identifiant -> numéro de carte
+        self._chunks = []
+        self._tail = ReviewColumns(array('I'), array('q'), array('B'), array('I'), array('I'))
+        self._tail_start = 0        # Numéro de la première réponse de la queue
+        self._last_timestamp = 0
+        self._last_session = 0
+        self._cards_handle = None
+        self._tail_handle = None
+
+        if not os.path.exists(log_dir):
+            os.makedirs(log_dir)
+        try:
+            self._load()
+        except Exception as e:
+            print(f"Erreur lors du chargement de l'historique des révisions: {e}")
+
+    def _load(self):
+        """Lit le dictionnaire des cartes, les en-têtes des blocs et la queue."""
+        if os.path.exists(self.cards_file):
+            with open(self.cards_file, 'rb') as f:
+                content = f.read()
+            complete = content.rfind(b"\n") + 1
+            if complete < len(content):
+                # Dernière ligne incomplète (coupure pendant l'écriture) : retirée
+                with open(self.cards_file, 'r+b') as f:
+                    f.truncate(complete)
+            self.card_ids = content[:complete].decode('utf-8').splitlines()
+            self._card_numbers = {card_id: number for number, card_id in enumerate(self.card_ids)}
+
+        for path in sorted(glob.glob(os.path.join(self.log_dir, "chunk-*.bin"))):
+            with open(path, 'rb') as f:
+                header = CHUNK_HEADER.unpack(f.read(CHUNK_HEADER.size))
+            if header[0] != CHUNK_MAGIC or header[1] != FORMAT_VERSION:
+                print(f"Bloc d'historique ignoré (format inconnu): {path}")
+                continue
+            chunk = _Chunk(path, header)
+            self._chunks.append(chunk)
+            self._last_timestamp = max(self._last_timestamp, chunk.max_timestamp)
+            self._last_session = max(self._last_session, chunk.max_session)
+
+        sealed = self._chunks[-1].end_row if self._chunks else 0
+        self._tail_start = sealed
+        content = b""
+        if os.path.exists(self.tail_file):
+            with open(self.tail_file, 'rb') as f:
+                content = f.read()
+        if len(content) >= TAIL_HEADER.size:
+            magic, version, start = TAIL_HEADER.unpack_from(content)
+            if magic == TAIL_MAGIC and version == FORMAT_VERSION:
+                records = (len(content) - TAIL_HEADER.size) // TAIL_RECORD.size
+                for number in range(records):
+                    # Réponses déjà scellées (coupure entre le scellement et le vidage de la queue)
+                    if start + number < sealed:
+                        continue
+                    self._append_row(*TAIL_RECORD.unpack_from(content, TAIL_HEADER.size + number * TAIL_RECORD.size))
+
+        # Queue absente, incomplète ou contenant des réponses déjà scellées : réécrite
+        expected = TAIL_HEADER.pack(TAIL_MAGIC, FORMAT_VERSION, sealed)
+        if not content.startswith(expected) or len(content) != len(expected) + len(self._tail.cards) * TAIL_RECORD.size:
+            self._rewrite_tail()
+
+    def __len__(self):
+        """Nombre total de réponses enregistrées."""
+        return self._tail_start + len(self._tail.cards)
+
+    def card_number(self, card_id):
+        """Retourne le numéro d'une carte dans l'historique, ou None si elle n'y figure pas."""
+        return self._card_numbers.get(card_id)
+
+    def new_session(self):
+        """Retourne un nouveau numéro de session d'étude."""
+        self._last_session += 1
+        return self._last_session
+
+    def append(self, card_id, timestamp, correct, duration_ms, session):
+        """
+        Ajoute une réponse à l'historique.
+
+        Args:
+            card_id: L'identifiant de la carte.
+            timestamp: Timestamp de la réponse (secondes) ; un horodatage antérieur à la réponse
+                précédente (changement d'heure système) est ramené à celui-ci.
+            correct: True si la réponse était correcte.
+            duration_ms: Temps passé sur la carte, en millisecondes.
+            session: Numéro de la session d'étude (voir new_session).
+        """
+        number = self._card_numbers.get(card_id)
+        if number is None:
+            number = len(self.card_ids)
+            if self._cards_handle is None:
+                self._cards_handle = open(self.cards_file, 'ab')
+            self._cards_handle.write(card_id.encode('utf-8') + b"\n")
+            self._cards_handle.flush()
+            self.card_ids.append(card_id)
+            self._card_numbers[card_id] = number
+
+        timestamp = max(int(timestamp), self._last_timestamp)
+        duration_ms = min(max(0, int(duration_ms)), 0xFFFFFFFF)
+        row = (number, timestamp, 1 if correct else 0, duration_ms, session)
+        self._append_row(*row)
+        if self._tail_handle is None:
+            self._tail_handle = open(self.tail_file, 'ab')
+        self._tail_handle.write(TAIL_RECORD.pack(*row))
+        self._tail_handle.flush()
+
+        if len(self._tail.cards) >= self.CHUNK_SIZE:
+            self._seal()
+
+    def _append_row(self, card, timestamp, result, duration, session):
+        """Ajoute une réponse aux colonnes de la queue en mémoire."""
+        self._tail.cards.append(card)
+        self._tail.timestamps.append(timestamp)
+        self._tail.results.append(result)
+        self._tail.durations.append(duration)
+        self._tail.sessions.append(session)
+        self._last_timestamp = max(self._last_timestamp, timestamp)
+        self._last_session = max(self._last_session, session)
+
+    def _rewrite_tail(self):
+        """Réécrit le fichier de la queue à partir des réponses en mémoire."""
+        if self._tail_handle is not None:
+            self._tail_handle.close()
+            self._tail_handle = None
+        temp_file = self.tail_file + ".tmp"
+        with open(temp_file, 'wb') as f:
+            f.write(TAIL_HEADER.pack(TAIL_MAGIC, FORMAT_VERSION, self._tail_start))
+            for row in zip(*self._tail):
+                f.write(TAIL_RECORD.pack(*row))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_file, self.tail_file)
+        fsync_directory(self.tail_file)
+
+    def _seal(self):
+        """Écrit la queue sous forme de bloc colonnaire indexé, puis la vide."""
+        tail = self._tail
+        count = len(tail.cards)
+        rows = array('I', sorted(range(count), key=tail.cards.__getitem__))
+        keys = array('I')
+        starts = array('I')
+        for position, row in enumerate(rows):
+            if not keys or keys[-1] != tail.cards[row]:
+                keys.append(tail.cards[row])
+                starts.append(position)
+        starts.append(count)
+
+        end_row = self._tail_start + count
+        header = CHUNK_HEADER.pack(CHUNK_MAGIC, FORMAT_VERSION, count, len(keys), end_row,
+                                   tail.timestamps[0], tail.timestamps[-1], max(tail.sessions))
+        path = os.path.join(self.log_dir, f"chunk-{self._tail_start:012d}.bin")
+        temp_file = path + ".tmp"
+        with open(temp_file, 'wb') as f:
+            f.write(header)
+            for column in (tail.timestamps, tail.cards, tail.sessions, tail.durations, keys, starts, rows, tail.results):
+                f.write(_little_endian(column))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_file, path)
+        fsync_directory(path)
+
+        self._chunks.append(_Chunk(path, CHUNK_HEADER.unpack(header)))
+        self._tail = ReviewColumns(array('I'), array('q'), array('B'), array('I'), array('I'))
+        self._tail_start = end_row
+        self._rewrite_tail()
+
+    def scan(self, start=None, end=None):
+        """
+        Parcourt l'historique par tranches colonnaires, dans l'ordre chronologique.
+
+        Args:
+            start: Timestamp de début inclus (None pour le début de l'historique).
+            end: Timestamp de fin exclu (None pour la fin de l'historique).
+
+        Yields:
+            Des ReviewColumns ; les numéros de cartes se traduisent en identifiants par card_ids.
+        """
+        for chunk in self._chunks:
+            if (start is not None and chunk.max_timestamp < start) or (end is not None and chunk.min_timestamp >= end):
+                continue
+            columns = self._slice(chunk.columns(), start, end)
+            if len(columns.cards):
+                yield columns
+        if len(self._tail.cards):
+            columns = self._slice(self._tail, start, end)
+            if len(columns.cards):
+                yield columns
+
+    def snapshot(self):
+        """
+        Retourne l'historique complet sous forme de tranches colonnaires figées, lisibles depuis
+        un autre thread pendant que des réponses continuent d'être ajoutées : les blocs scellés
+        ne changent plus, et la queue est copiée.
+
+        Returns:
+            Liste de ReviewColumns, dans l'ordre chronologique.
+        """
+        slices = [chunk.columns() for chunk in self._chunks]
+        if len(self._tail.cards):
+            slices.append(ReviewColumns(*(array(column.typecode, column) for column in self._tail)))
+        return slices
+
+    @staticmethod
+    def _slice(columns, start, end):
+        """Restreint des colonnes aux réponses d'une période, par dichotomie sur les horodatages."""
+        first = 0 if start is None else bisect_left(columns.timestamps, start)
+        last = len(columns.timestamps) if end is None else bisect_left(columns.timestamps, end)
+        if first == 0 and last == len(columns.timestamps):
+            return columns
+        return ReviewColumns(*(column[first:last] for column in columns))
+
+    def reviews_for_card(self, card_id):
+        """
+        Retourne l'historique d'une carte.
+
+        Args:
+            card_id: L'identifiant de la carte.
+
+        Returns:
+            Liste de Review (timestamp, correct, duration_ms, session), par date croissante.
+        """
+        number = self._card_numbers.get(card_id)
+        if number is None:
+            return []
+
+        reviews = []
+        for chunk in self._chunks:
+            rows = chunk.rows_of(number)
+            if len(rows):
+                columns = chunk.columns()
+                reviews.extend(Review(columns.timestamps[row], bool(columns.results[row]),
+                                      columns.durations[row], columns.sessions[row]) for row in rows)
+        tail = self._tail
+        reviews.extend(Review(tail.timestamps[row], bool(tail.results[row]), tail.durations[row], tail.sessions[row])
+                       for row in range(len(tail.cards)) if tail.cards[row] == number)
+        return reviews
+
+    def close(self):
+        """Ferme les fichiers ouverts et libère les projections des blocs."""
+        for handle in (self._cards_handle, self._tail_handle):
+            if handle is not None:
+                handle.close()
+        self._cards_handle = None
+        self._tail_handle = None
+        for chunk in self._chunks:
+            chunk.close()
@@ -0,0 +1,162 @@
+import heapq
+from itertools import count
+
+from models.entities import DEFAULT_EASE
+
+
+DAY = 24 * 60 * 60
+
+# Facilité minimale d'une carte (SM-2)
+MIN_EASE = 1.3
+
+# Qualité de la réponse (0 à 5) associée aux boutons Correct / Incorrect
+QUALITY_CORRECT = 4
+QUALITY_INCORRECT = 1
+
+
+def review_card(card, quality, now):
+    """
+    Applique l'algorithme SM-2 à une carte après une réponse.
+
+    Une réponse réussie (qualité >= 3) allonge l'intervalle : 1 jour, puis 6 jours, puis
+    l'intervalle précédent multiplié par la facilité. Un échec remet la carte à 1 jour.
+    La facilité est ajustée selon la qualité, sans descendre sous MIN_EASE.
+
+    Args:
+        card: La carte révisée (ease, interval, repetitions et due sont modifiés).
+        quality: Qualité de la réponse, de 0 (oubli total) à 5 (réponse parfaite).
+        now: Timestamp de la révision.
+    """
+    if quality >= 3:
+        if card.repetitions == 0:
+            card.interval = 1
+        elif card.repetitions == 1:
+            card.interval = 6
+        else:
+            card.interval = max(1, round(card.interval * card.ease))
+        card.repetitions += 1
+    else:
+        card.repetitions = 0
+        card.interval = 1
+
+    ease = card.ease or DEFAULT_EASE
+    card.ease = max(MIN_EASE, ease + 0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02))
+    card.due = now + card.interval * DAY
+
+
+def reset_card(card):
+    """
+    Remet une carte à l'état de carte nouvelle : elle sera reproposée comme une carte jamais révisée.
+
+    Args:
+        card: La carte (ease, interval, repetitions et due sont réinitialisés).
+    """
+    card.ease = DEFAULT_EASE
+    card.interval = 0
+    card.repetitions = 0
+    card.due = None
+
+
+class DueQueue:
+    """
+    File de priorité des cartes d'un deck pour la répétition espacée.
+
+    Les cartes déjà révisées sont dans un tas ordonné par date d'échéance, les cartes nouvelles
+    dans un second tas ordonné par date de création. Une carte modifiée est simplement réinsérée :
+    les anciennes entrées sont reconnues comme périmées et ignorées lorsqu'elles remontent en tête.
+    Obtenir les k prochaines cartes coûte ainsi O(k log n), sans parcourir tout le deck.
+    """
+
+    def __init__(self, cards):
+        """
+        Construit la file à partir des cartes d'un deck.
+
+        Args:
+            cards: La liste des cartes du deck.
+        """
+        self._cards = {}
+        self._sequence = count()
+        self._rebuild(cards)
+
+    def __len__(self):
+        return len(self._cards)
+
+    def _rebuild(self, cards):
+        """Reconstruit les deux tas sans entrée périmée."""
+        self._cards = {card.id: card for card in cards}
+        self._due = []
+        self._new = []
+        for card in cards:
+            self._entries(card).append(self._entry(card))
+        heapq.heapify(self._due)
+        heapq.heapify(self._new)
+
+    def _entries(self, card):
+        """Retourne le tas auquel appartient la carte."""
+        return self._new if card.due is None else self._due
+
+    def _entry(self, card):
+        """Entrée de tas d'une carte : (clé de tri, numéro d'insertion, id)."""
+        key = (card.created_at or 0) if card.due is None else card.due
+        return key, next(self._sequence), card.id
+
+    def _is_current(self, entry, new):
+        """Indique si une entrée de tas correspond encore à l'état de sa carte."""
+        card = self._cards.get(entry[2])
+        if card is None or (card.due is None) != new:
+            return False
+        return new or card.due == entry[0]
+
+    def add(self, card):
+        """Ajoute une carte à la file, ou la reclasse après une modification."""
+        self._cards[card.id] = card
+        heapq.heappush(self._entries(card), self._entry(card))
+
+        # Les entrées périmées s'accumulent à chaque révision : on reconstruit de temps en temps
+        if len(self._due) + len(self._new) > 2 * len(self._cards) + 64:
+            self._rebuild(list(self._cards.values()))
+
+    def remove(self, card_id):
+        """Retire une carte de la file ; ses entrées sont ignorées par la suite."""
+        self._cards.pop(card_id, None)
+
+    def _take(self, heap, new, limit, cutoff=None):
+        """
+        Retourne les limit premières cartes valides d'un tas sans les retirer de la file.
+        """
+        taken = []
+        cards = []
+        seen = set()
+        while heap and len(cards) < limit:
+            entry = heapq.heappop(heap)
+            if entry[2] in seen or not self._is_current(entry, new):
+                continue
+            if cutoff is not None and entry[0] > cutoff:
+                heapq.heappush(heap, entry)
+                break
+            taken.append(entry)
+            seen.add(entry[2])
+            cards.append(self._cards[entry[2]])
+
+        for entry in taken:
+            heapq.heappush(heap, entry)
+        return cards
+
+    def due_cards(self, cutoff, limit):
+        """
+        Retourne, par échéance croissante, au plus limit cartes à réviser avant cutoff.
+
+        Args:
+            cutoff: Timestamp limite d'échéance.
+            limit: Nombre maximal de cartes.
+        """
+        return self._take(self._due, False, limit, cutoff)
+
+    def new_cards(self, limit):
+        """
+        Retourne, par date de création, au plus limit cartes jamais révisées.
+
+        Args:
+            limit: Nombre maximal de cartes.
+        """
+        return self._take(self._new, True, limit)
@@ -0,0 +1,242 @@
+import re
+import math
+import unicodedata
+from array import array
+from collections import Counter
+from bisect import bisect_left
+
+
+TOKEN_RE = re.compile(r"\w+")
+
+# Signes diacritiques combinants laissés par la décomposition NFKD ("é" -> "e" + accent aigu)
+COMBINING_RE = re.compile("[\u0300-\u036f\u1ab0-\u1aff\u1dc0-\u1dff\u20d0-\u20ff\ufe20-\ufe2f]")
+
+# En dessous de cette longueur, le dernier mot d'une requête est cherché en entier et non
+# comme préfixe : une seule lettre correspondrait à une grande partie du vocabulaire
+MIN_PREFIX_LENGTH = 2
+
+# Paramètres du classement BM25
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Poids d'une occurrence au recto par rapport au verso
+FRONT_WEIGHT = 2
+
+
+def normalize(text):
+    """
+    Met un texte sous forme comparable : minuscules et accents retirés ("Été" -> "ete").
+
+    Args:
+        text: Le texte à normaliser.
+    """
+    if text.isascii():
+        return text.lower()
+    return COMBINING_RE.sub("", unicodedata.normalize("NFKD", text)).casefold()
+
+
+def tokenize(text):
+    """
+    Découpe un texte en mots normalisés.
+
+    Args:
+        text: Le texte à découper.
+
+    Returns:
+        Liste des mots, sans accents et en minuscules.
+    """
+    return TOKEN_RE.findall(normalize(text))
+
+
+def parse_query(query):
+    """
+    Découpe une requête de recherche en mots ; le dernier mot est traité comme un préfixe
+    tant que la requête ne se termine pas par un espace (recherche pendant la frappe)
+    et qu'il compte au moins MIN_PREFIX_LENGTH caractères.
+
+    Returns:
+        Tuple (mots, dernier mot en préfixe ou None).
+    """
+    tokens = tokenize(query)
+    if tokens and not query[-1:].isspace() and len(tokens[-1]) >= MIN_PREFIX_LENGTH:
+        return tokens[:-1], tokens[-1]
+    return tokens, None
+
+
+class SearchIndex:
+    """
+    Index inversé en mémoire du recto et du verso des cartes, pour les moteurs de stockage
+    qui n'ont pas d'index plein texte.
+
+    Chaque carte indexée reçoit un numéro de document ; pour chaque mot, l'index garde la liste
+    des documents qui le contiennent et le nombre d'occurrences, dans des tableaux compacts.
+    Une carte modifiée ou supprimée est marquée comme morte et, si elle existe encore, réindexée
+    sous un nouveau numéro ; les documents morts sont purgés quand ils deviennent majoritaires.
+    Les résultats sont classés par BM25.
+    """
+
+    def __init__(self):
+        self._postings = {}      # mot -> (array des documents, array des occurrences)
+        self._docs = []          # document -> (id de deck, id de carte), None si mort
+        self._lengths = array('I')
+        self._doc_of_card = {}   # id de carte -> document vivant
+        self._total_length = 0
+        self._dead = 0
+        self._sorted_tokens = None  # mots triés pour la recherche par préfixe, recalculés à la demande
+
+    def __len__(self):
+        return len(self._doc_of_card)
+
+    def add(self, deck_id, card):
+        """
+        Indexe une carte, ou la réindexe si elle l'était déjà (texte modifié, changement de deck).
+
+        Args:
+            deck_id: L'identifiant du deck de la carte.
+            card: La carte.
+        """
+        self.remove(card.id)
+
+        counts = Counter(tokenize(card.back))
+        for token in tokenize(card.front):
+            counts[token] += FRONT_WEIGHT
+
+        doc = len(self._docs)
+        self._docs.append((deck_id, card.id))
+        self._doc_of_card[card.id] = doc
+        length = sum(counts.values())
+        self._lengths.append(length)
+        self._total_length += length
+
+        for token, count in counts.items():
+            postings = self._postings.get(token)
+            if postings is None:
+                postings = self._postings[token] = (array('I'), array('I'))
+                self._sorted_tokens = None
+            postings[0].append(doc)
+            postings[1].append(count)
+
+    def remove(self, card_id):
+        """
+        Retire une carte de l'index.
+
+        Args:
+            card_id: L'identifiant de la carte.
+        """
+        doc = self._doc_of_card.pop(card_id, None)
+        if doc is None:
+            return
+        self._docs[doc] = None
+        self._total_length -= self._lengths[doc]
+        self._dead += 1
+        if self._dead > 1000 and self._dead > len(self._doc_of_card):
+            self._compact()
+
+    def remove_deck(self, deck_id):
+        """
+        Retire toutes les cartes d'un deck de l'index.
+
+        Args:
+            deck_id: L'identifiant du deck.
+        """
+        for entry in self._docs:
+            if entry is not None and entry[0] == deck_id:
+                self.remove(entry[1])
+
+    def _compact(self):
+        """Renumérote les documents vivants et purge les documents morts des listes."""
+        renumbered = {}
+        docs = []
+        lengths = array('I')
+        for doc, entry in enumerate(self._docs):
+            if entry is not None:
+                renumbered[doc] = len(docs)
+                docs.append(entry)
+                lengths.append(self._lengths[doc])
+
+        postings = {}
+        for token, (token_docs, token_counts) in self._postings.items():
+            new_docs = array('I')
+            new_counts = array('I')
+            for doc, count in zip(token_docs, token_counts):
+                new_doc = renumbered.get(doc)
+                if new_doc is not None:
+                    new_docs.append(new_doc)
+                    new_counts.append(count)
+            if new_docs:
+                postings[token] = (new_docs, new_counts)
+
+        self._docs = docs
+        self._lengths = lengths
+        self._postings = postings
+        self._doc_of_card = {entry[1]: doc for doc, entry in enumerate(docs)}
+        self._dead = 0
+        self._sorted_tokens = None
+
+    def _prefix_tokens(self, prefix):
+        """Retourne les mots de l'index commençant par prefix, par recherche dichotomique."""
+        if self._sorted_tokens is None:
+            self._sorted_tokens = sorted(self._postings)
+        tokens = []
+        position = bisect_left(self._sorted_tokens, prefix)
+        while position < len(self._sorted_tokens) and self._sorted_tokens[position].startswith(prefix):
+            tokens.append(self._sorted_tokens[position])
+            position += 1
+        return tokens
+
+    def _term_scores(self, tokens):
+        """
+        Calcule la contribution BM25 d'un terme (un mot, ou tous les mots d'un préfixe)
+        pour chaque document vivant qui le contient.
+
+        Returns:
+            Dictionnaire document -> score.
+        """
+        live_count = len(self._doc_of_card)
+        average_length = self._total_length / live_count if live_count else 1
+        scores = {}
+        for token in tokens:
+            token_docs, token_counts = self._postings[token]
+            idf = math.log(1 + (live_count - len(token_docs) + 0.5) / (len(token_docs) + 0.5))
+            for doc, count in zip(token_docs, token_counts):
+                if self._docs[doc] is None:
+                    continue
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * self._lengths[doc] / average_length)
+                score = idf * count * (BM25_K1 + 1) / (count + norm)
+                if score > scores.get(doc, 0):
+                    scores[doc] = score
+        return scores
+
+    def search(self, query, limit=50):
+        """
+        Recherche les cartes contenant tous les mots de la requête (le dernier pouvant être
+        un début de mot), sans tenir compte des accents ni de la casse.
+
+        Args:
+            query: Le texte recherché.
+            limit: Nombre maximal de résultats.
+
+        Returns:
+            Liste de tuples (id de deck, id de carte, score), du plus pertinent au moins pertinent.
+        """
+        words, prefix = parse_query(query)
+        terms = [[word] for word in dict.fromkeys(words)]
+        if prefix is not None:
+            terms.append(self._prefix_tokens(prefix))
+        if not terms:
+            return []
+        for term in terms:
+            if not term or any(token not in self._postings for token in term):
+                return []
+
+        # Les termes les plus rares d'abord : ils réduisent le plus vite l'ensemble des candidats
+        terms.sort(key=lambda term: sum(len(self._postings[token][0]) for token in term))
+        scores = self._term_scores(terms[0])
+        for term in terms[1:]:
+            if not scores:
+                return []
+            term_scores = self._term_scores(term)
+            scores = {doc: score + term_scores[doc] for doc, score in scores.items() if doc in term_scores}
+
+        best = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:limit]
+        return [(self._docs[doc][0], self._docs[doc][1], score) for doc, score in best]
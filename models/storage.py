@@ -0,0 +1,1168 @@
+import os
+import json
+import sqlite3
+from contextlib import contextmanager, nullcontext
+
+from models.entities import Card, DailyProgress, Deck, DeckSummary, Media, to_iso, to_timestamp
+from models.journal import ReviewJournal
+from models.search_index import parse_query
+
+
+# Champs d'une carte modifiés par une réponse lors d'une session d'étude :
+# compteurs de réponses et état de la répétition espacée
+RESULT_FIELDS = ("correct_count", "incorrect_count", "ease", "interval", "repetitions", "due")
+
+# Champs d'un deck modifiés par une réponse : date d'étude, résumé (nombre de cartes, totaux)
+# et progression quotidienne
+DECK_RESULT_FIELDS = ("last_studied", "summary", "progress")
+
+
+def result_fields(deck, card):
+    """
+    Extrait, sous forme sérialisable en JSON, les champs de la carte et du deck modifiés par une réponse.
+
+    Returns:
+        Tuple (champs de la carte, champs du deck).
+    """
+    card_fields = {field: getattr(card, field) for field in RESULT_FIELDS}
+    deck_fields = {
+        "last_studied": deck.last_studied,
+        "summary": deck.summary.to_dict() if deck.summary else None,
+        "progress": deck.progress.to_dict() if deck.progress else None
+    }
+    return card_fields, deck_fields
+
+
+def apply_card_fields(card, card_fields):
+    """Applique à une carte des champs extraits par result_fields."""
+    for field, value in card_fields.items():
+        setattr(card, field, value)
+
+
+def apply_deck_fields(deck, deck_fields):
+    """Applique à un deck des champs extraits par result_fields."""
+    if deck_fields.get("last_studied") is not None:
+        deck.last_studied = to_timestamp(deck_fields["last_studied"])
+    if deck_fields.get("summary"):
+        deck.summary = DeckSummary.from_dict(deck_fields["summary"])
+    if deck_fields.get("progress"):
+        deck.progress = DailyProgress.from_dict(deck_fields["progress"])
+
+
+def summary_values(deck):
+    """
+    Retourne le résumé d'un deck sous forme de tuple (nombre de cartes, réponses correctes, incorrectes).
+    """
+    summary = deck.summary or DeckSummary()
+    return summary.card_count, summary.correct_answers, summary.incorrect_answers
+
+
+def progress_values(deck):
+    """
+    Retourne la progression quotidienne d'un deck sous forme de tuple (jour, cartes nouvelles, révisions).
+    """
+    if not deck.progress:
+        return None, 0, 0
+    return deck.progress.day, deck.progress.new_cards, deck.progress.reviews
+
+
+def fsync_directory(path):
+    """
+    Force l'écriture sur disque du dossier contenant un fichier, pour qu'un renommage
+    survive à une coupure de courant. Sans effet sous Windows, qui ne le permet pas.
+
+    Args:
+        path: Chemin du fichier dont le dossier doit être synchronisé.
+    """
+    if os.name == "nt":
+        return
+    fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def write_json_atomic(path, data, indent=None):
+    """
+    Écrit un fichier JSON via un fichier temporaire remplacé atomiquement,
+    pour ne jamais laisser de fichier à moitié écrit. Le fichier temporaire est
+    synchronisé sur disque avant le remplacement : après une coupure, on retrouve
+    soit l'ancienne version, soit la nouvelle complète.
+
+    Args:
+        path: Chemin du fichier de destination.
+        data: Données sérialisables en JSON.
+        indent: Indentation facultative du JSON produit.
+    """
+    temp_file = path + ".tmp"
+    try:
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=indent)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_file, path)
+        fsync_directory(path)
+    except BaseException:
+        if os.path.exists(temp_file):
+            os.remove(temp_file)
+        raise
+
+
+class StorageBackend:
+    """
+    Interface commune des moteurs de stockage utilisés par le DeckManager.
+
+    Le DeckManager garde les decks en mémoire et notifie le moteur de chaque
+    modification (deck, carte, média). Chaque moteur choisit ensuite comment
+    persister ces changements : réécriture complète pour le JSON historique,
+    écritures ciblées et transactionnelles pour SQLite, un fichier par deck
+    pour le stockage fragmenté.
+
+    Les moteurs dont lazy_loading vaut True ne chargent que les métadonnées des decks
+    dans load_decks (deck.cards vaut alors None) ; les cartes sont lues à la demande
+    avec load_cards.
+
+    Les moteurs dont supports_search vaut True tiennent leur propre index plein texte
+    et répondent à search_cards ; pour les autres, le DeckManager indexe les cartes en mémoire.
+
+    Les moteurs manipulent des objets Deck et Card ; les formats JSON restent ceux
+    produits par Deck.to_dict et Card.to_dict.
+
+    Quand les écritures sont exécutées dans un thread à part (BackgroundStorage), snapshot_lock
+    est le verrou de la collection : les moteurs le prennent le temps de sérialiser les objets
+    partagés avec l'interface, et écrivent les fichiers une fois le verrou rendu.
+    """
+
+    lazy_loading = False
+    supports_search = False
+    snapshot_lock = nullcontext()
+
+    def load_decks(self):
+        """
+        Charge les decks depuis le support de stockage.
+
+        Returns:
+            Liste d'objets Deck, avec leurs cartes ou avec cards à None
+            si le moteur charge les cartes à la demande.
+        """
+        raise NotImplementedError
+
+    def load_cards(self, deck_id):
+        """
+        Charge les cartes d'un deck.
+
+        Args:
+            deck_id: L'identifiant du deck.
+
+        Returns:
+            Liste d'objets Card.
+        """
+        raise NotImplementedError
+
+    def load_card_fronts(self, deck_id):
+        """
+        Lit uniquement l'identifiant et le recto des cartes d'un deck (index de recherche).
+
+        Args:
+            deck_id: L'identifiant du deck.
+
+        Returns:
+            Liste de tuples (id de carte, recto).
+        """
+        return [(card.id, card.front) for card in self.load_cards(deck_id)]
+
+    def save_all(self, decks):
+        """
+        Écrit un instantané complet de la collection.
+
+        Args:
+            decks: La liste complète des decks, avec toutes leurs cartes chargées.
+        """
+        raise NotImplementedError
+
+    def save_deck(self, deck):
+        """
+        Persiste les métadonnées d'un deck (nom, description, dates, résumé).
+
+        Args:
+            deck: Le deck.
+        """
+        raise NotImplementedError
+
+    def delete_deck(self, deck_id):
+        """
+        Supprime un deck et toutes ses cartes.
+
+        Args:
+            deck_id: L'identifiant du deck.
+        """
+        raise NotImplementedError
+
+    def save_card(self, deck, card):
+        """
+        Persiste une carte (création ou mise à jour) ainsi que ses médias.
+
+        Args:
+            deck: Le deck contenant la carte.
+            card: La carte.
+        """
+        raise NotImplementedError
+
+    def save_cards(self, deck, cards):
+        """
+        Persiste un lot de cartes d'un même deck en une seule écriture (import en masse).
+
+        Args:
+            deck: Le deck contenant les cartes.
+            cards: Les cartes à enregistrer.
+        """
+        with self.transaction():
+            for card in cards:
+                self.save_card(deck, card)
+
+    def delete_card(self, deck, card_id):
+        """
+        Supprime une carte d'un deck.
+
+        Args:
+            deck: Le deck contenant la carte.
+            card_id: L'identifiant de la carte.
+        """
+        raise NotImplementedError
+
+    def delete_cards(self, deck, card_ids):
+        """
+        Supprime un lot de cartes d'un même deck en une seule écriture.
+
+        Args:
+            deck: Le deck contenant les cartes.
+            card_ids: Les identifiants des cartes.
+        """
+        with self.transaction():
+            for card_id in card_ids:
+                self.delete_card(deck, card_id)
+
+    def record_result(self, deck, card):
+        """
+        Persiste le résultat d'une révision : les champs RESULT_FIELDS de la carte
+        et les champs DECK_RESULT_FIELDS du deck.
+
+        Args:
+            deck: Le deck contenant la carte.
+            card: La carte révisée.
+        """
+        with self.transaction():
+            self.save_card(deck, card)
+            self.save_deck(deck)
+
+    def search_cards(self, query, limit):
+        """
+        Recherche des cartes par leur texte (moteurs dont supports_search vaut True).
+
+        Args:
+            query: Le texte recherché ; le dernier mot peut être un début de mot.
+            limit: Nombre maximal de résultats.
+
+        Returns:
+            Liste de tuples (id de deck, id de carte, recto, verso, score),
+            du plus pertinent au moins pertinent.
+        """
+        raise NotImplementedError
+
+    def is_empty(self):
+        """
+        Indique si le support de stockage ne contient encore aucun deck.
+        """
+        raise NotImplementedError
+
+    @contextmanager
+    def transaction(self):
+        """
+        Regroupe plusieurs écritures : elles sont appliquées ensemble à la sortie du bloc.
+        """
+        yield
+
+    def has_pending_writes(self, deck_id=None):
+        """
+        Indique si des écritures demandées ne sont pas encore appliquées (écritures différées).
+
+        Args:
+            deck_id: Si indiqué, ne considère que les écritures portant sur ce deck.
+        """
+        return False
+
+    def flush(self):
+        """
+        Attend que toutes les écritures demandées soient appliquées (écritures différées).
+        """
+        pass
+
+    def close(self):
+        """
+        Libère les ressources du moteur (connexions, fichiers).
+        """
+        pass
+
+
+class JsonStorage(StorageBackend):
+    """
+    Moteur historique : toute la collection est stockée dans un unique fichier JSON
+    réécrit intégralement à chaque modification.
+
+    Les résultats de révision, beaucoup plus fréquents, sont ajoutés à un journal
+    (decks.journal) rejoué au chargement et réintégré au fichier principal tous les
+    COMPACT_THRESHOLD résultats ainsi qu'à la fermeture. Dans une transaction, ils ne sont
+    ajoutés au journal qu'à la fin du bloc (et pas du tout si le fichier est réécrit).
+    """
+
+    COMPACT_THRESHOLD = 500
+
+    def __init__(self, decks_file):
+        """
+        Initialise le moteur JSON.
+
+        Args:
+            decks_file: Chemin du fichier JSON contenant tous les decks.
+        """
+        self.decks_file = decks_file
+        self.journal = ReviewJournal(os.path.splitext(decks_file)[0] + ".journal")
+        self._decks = []
+        self._transaction_depth = 0
+        self._dirty = False
+        self._pending_entries = []  # Résultats à journaliser à la fin de la transaction
+
+    def load_decks(self):
+        """
+        Charge les decks depuis le fichier JSON. Si le fichier est introuvable ou corrompu, retourne une liste vide.
+        """
+        decks = []
+        if os.path.exists(self.decks_file):
+            try:
+                with open(self.decks_file, 'r', encoding='utf-8') as f:
+                    decks = [Deck.from_dict(data) for data in json.load(f)]
+            except Exception as e:
+                print(f"Erreur lors du chargement des decks: {e}")
+                decks = []
+        self._decks = decks
+        self._replay_journal(decks)
+        return decks
+
+    def _replay_journal(self, decks):
+        """Applique au dernier instantané les résultats enregistrés dans le journal."""
+        entries = self.journal.replay()
+        if not entries:
+            return
+
+        decks_by_id = {deck.id: deck for deck in decks}
+        cards_by_id = {card.id: card for deck in decks for card in deck.cards}
+        for deck_id, card_id, card_fields, deck_fields in entries:
+            card = cards_by_id.get(card_id)
+            if card is not None:
+                apply_card_fields(card, card_fields)
+            deck = decks_by_id.get(deck_id)
+            if deck is not None:
+                apply_deck_fields(deck, deck_fields)
+
+    def save_all(self, decks):
+        """
+        Sauvegarde les decks dans le fichier JSON via un fichier temporaire.
+        """
+        self._decks = decks
+        try:
+            with self.snapshot_lock:
+                data = [deck.to_dict() for deck in decks]
+            write_json_atomic(self.decks_file, data, indent=2)
+
+            # L'instantané contient désormais tous les résultats journalisés
+            self.journal.truncate()
+
+        except Exception as e:
+            print(f"Erreur critique sauvegarde: {e}")
+
+    def load_cards(self, deck_id):
+        for deck in self._decks:
+            if deck.id == deck_id:
+                return deck.cards
+        return []
+
+    @contextmanager
+    def transaction(self):
+        """
+        Diffère la réécriture du fichier jusqu'à la fin du bloc le plus externe.
+        Si une exception est levée, rien n'est écrit.
+        """
+        self._transaction_depth += 1
+        try:
+            yield
+        except BaseException:
+            self._transaction_depth -= 1
+            if self._transaction_depth == 0:
+                self._dirty = False
+                self._pending_entries = []
+            raise
+        self._transaction_depth -= 1
+        if self._transaction_depth > 0:
+            return
+
+        entries, self._pending_entries = self._pending_entries, []
+        if self._dirty:
+            # La réécriture contient déjà les résultats de la transaction
+            self._dirty = False
+            self.save_all(self._decks)
+        elif entries:
+            for entry in entries:
+                self.journal.append(*entry)
+            if len(self.journal) >= self.COMPACT_THRESHOLD:
+                self.compact()
+
+    def _touch(self):
+        """Réécrit le fichier, ou le marque à réécrire si une transaction est ouverte."""
+        if self._transaction_depth > 0:
+            self._dirty = True
+        else:
+            self.save_all(self._decks)
+
+    # Le format JSON ne permet pas d'écriture partielle : toute modification
+    # entraîne la réécriture de la collection suivie par le moteur.
+    def save_deck(self, deck):
+        self._touch()
+
+    def delete_deck(self, deck_id):
+        self._touch()
+
+    def save_card(self, deck, card):
+        self._touch()
+
+    def delete_card(self, deck, card_id):
+        self._touch()
+
+    def record_result(self, deck, card):
+        """
+        Ajoute le résultat au journal au lieu de réécrire toute la collection.
+        Dans une transaction, le résultat n'est journalisé qu'à la fin du bloc,
+        pour pouvoir être annulé avec le reste.
+        """
+        card_fields, deck_fields = result_fields(deck, card)
+        if self._transaction_depth > 0:
+            self._pending_entries.append((deck.id, card.id, card_fields, deck_fields))
+            return
+        self.journal.append(deck.id, card.id, card_fields, deck_fields)
+        if len(self.journal) >= self.COMPACT_THRESHOLD:
+            self.compact()
+
+    def compact(self):
+        """
+        Réintègre le journal dans le fichier principal puis le vide.
+        """
+        if len(self.journal) > 0:
+            self.save_all(self._decks)
+
+    def is_empty(self):
+        return not os.path.exists(self.decks_file)
+
+    def close(self):
+        self.compact()
+        self.journal.close()
+
+
+class SqliteStorage(StorageBackend):
+    """
+    Moteur SQLite : decks, cartes et médias sont stockés dans des tables indexées,
+    chaque modification n'écrit que les lignes concernées dans une transaction.
+    Les cartes d'un deck sont lues à la demande grâce à l'index sur deck_id.
+    """
+
+    lazy_loading = True
+
+    SCHEMA_VERSION = 3
+
+    # Les colonnes ajoutées par chaque version du schéma, pour mettre à niveau une base existante
+    UPGRADES = {
+        3: {
+            "decks": ("study_day TEXT", "new_studied INTEGER NOT NULL DEFAULT 0",
+                      "reviews_studied INTEGER NOT NULL DEFAULT 0"),
+            "cards": ("ease REAL NOT NULL DEFAULT 2.5", "interval INTEGER NOT NULL DEFAULT 0",
+                      "repetitions INTEGER NOT NULL DEFAULT 0", "due INTEGER")
+        }
+    }
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS decks (
+            id TEXT PRIMARY KEY,
+            name TEXT NOT NULL,
+            description TEXT NOT NULL DEFAULT '',
+            created_at TEXT,
+            last_studied TEXT,
+            card_count INTEGER NOT NULL DEFAULT 0,
+            correct_answers INTEGER NOT NULL DEFAULT 0,
+            incorrect_answers INTEGER NOT NULL DEFAULT 0,
+            study_day TEXT,
+            new_studied INTEGER NOT NULL DEFAULT 0,
+            reviews_studied INTEGER NOT NULL DEFAULT 0
+        );
+
+        CREATE TABLE IF NOT EXISTS cards (
+            id TEXT PRIMARY KEY,
+            deck_id TEXT NOT NULL REFERENCES decks(id) ON DELETE CASCADE,
+            front TEXT NOT NULL DEFAULT '',
+            back TEXT NOT NULL DEFAULT '',
+            created_at TEXT,
+            correct_count INTEGER NOT NULL DEFAULT 0,
+            incorrect_count INTEGER NOT NULL DEFAULT 0,
+            ease REAL NOT NULL DEFAULT 2.5,
+            interval INTEGER NOT NULL DEFAULT 0,
+            repetitions INTEGER NOT NULL DEFAULT 0,
+            due INTEGER  -- timestamp de la prochaine révision, NULL pour une carte nouvelle
+        );
+
+        CREATE INDEX IF NOT EXISTS idx_cards_deck ON cards(deck_id);
+
+        CREATE TABLE IF NOT EXISTS media (
+            id TEXT PRIMARY KEY,
+            card_id TEXT NOT NULL REFERENCES cards(id) ON DELETE CASCADE,
+            type TEXT NOT NULL,
+            path TEXT NOT NULL
+        );
+
+        CREATE INDEX IF NOT EXISTS idx_media_card ON media(card_id);
+    """
+
+    # Index plein texte du recto et du verso (FTS5, accents ignorés), tenu à jour par des triggers
+    SEARCH_SCHEMA = """
+        CREATE VIRTUAL TABLE IF NOT EXISTS cards_fts USING fts5(
+            front, back, content='cards', content_rowid='rowid',
+            tokenize='unicode61 remove_diacritics 2'
+        );
+
+        CREATE TRIGGER IF NOT EXISTS cards_fts_insert AFTER INSERT ON cards BEGIN
+            INSERT INTO cards_fts (rowid, front, back) VALUES (new.rowid, new.front, new.back);
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS cards_fts_delete AFTER DELETE ON cards BEGIN
+            INSERT INTO cards_fts (cards_fts, rowid, front, back)
+            VALUES ('delete', old.rowid, old.front, old.back);
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS cards_fts_update AFTER UPDATE OF front, back ON cards BEGIN
+            INSERT INTO cards_fts (cards_fts, rowid, front, back)
+            VALUES ('delete', old.rowid, old.front, old.back);
+            INSERT INTO cards_fts (rowid, front, back) VALUES (new.rowid, new.front, new.back);
+        END;
+    """
+
+    # Poids du recto et du verso dans le classement bm25
+    SEARCH_WEIGHTS = (2.0, 1.0)
+
+    def __init__(self, db_file):
+        """
+        Ouvre (ou crée) la base SQLite et prépare le schéma.
+
+        Args:
+            db_file: Chemin du fichier de base de données.
+        """
+        self.db_file = db_file
+        # isolation_level=None : les transactions sont gérées explicitement.
+        # check_same_thread=False : les écritures peuvent venir du thread de BackgroundStorage
+        self.conn = sqlite3.connect(db_file, isolation_level=None, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self._transaction_depth = 0
+        self._create_schema()
+
+    def _create_schema(self):
+        """Crée les tables et index si nécessaire, puis met à niveau une base plus ancienne."""
+        version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+        self.conn.executescript(self.SCHEMA)
+
+        if 0 < version < 2:
+            # Version 2 : résumé de chaque deck stocké dans la table decks
+            with self.transaction():
+                for column in ("card_count", "correct_answers", "incorrect_answers"):
+                    self.conn.execute(f"ALTER TABLE decks ADD COLUMN {column} INTEGER NOT NULL DEFAULT 0")
+                self.conn.execute(
+                    """
+                    UPDATE decks SET
+                        card_count = (SELECT COUNT(*) FROM cards WHERE cards.deck_id = decks.id),
+                        correct_answers = (SELECT COALESCE(SUM(correct_count), 0)
+                                           FROM cards WHERE cards.deck_id = decks.id),
+                        incorrect_answers = (SELECT COALESCE(SUM(incorrect_count), 0)
+                                             FROM cards WHERE cards.deck_id = decks.id)
+                    """
+                )
+
+        if 0 < version < 3:
+            # Version 3 : état de la répétition espacée (cartes) et progression quotidienne (decks)
+            with self.transaction():
+                for table, columns in self.UPGRADES[3].items():
+                    for column in columns:
+                        self.conn.execute(f"ALTER TABLE {table} ADD COLUMN {column}")
+
+        self.conn.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+        self._create_search_index()
+
+    def _create_search_index(self):
+        """
+        Crée l'index plein texte des cartes et l'alimente avec les cartes existantes.
+        Sans FTS5 dans la version de SQLite, supports_search reste à False.
+        """
+        exists = self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'cards_fts'"
+        ).fetchone() is not None
+        try:
+            self.conn.executescript(self.SEARCH_SCHEMA)
+        except sqlite3.OperationalError as e:
+            print(f"Recherche plein texte SQLite indisponible : {e}")
+            return
+
+        if not exists:
+            with self.transaction():
+                self.conn.execute("INSERT INTO cards_fts (cards_fts) VALUES ('rebuild')")
+        self.supports_search = True
+
+    @contextmanager
+    def transaction(self):
+        """
+        Ouvre une transaction ; les appels imbriqués rejoignent la transaction en cours.
+        Annule toutes les écritures si une exception est levée.
+        """
+        if self._transaction_depth > 0:
+            self._transaction_depth += 1
+            try:
+                yield self.conn
+            finally:
+                self._transaction_depth -= 1
+            return
+
+        self.conn.execute("BEGIN")
+        self._transaction_depth = 1
+        try:
+            yield self.conn
+        except BaseException:
+            self._transaction_depth = 0
+            self.conn.execute("ROLLBACK")
+            raise
+        self._transaction_depth = 0
+        self.conn.execute("COMMIT")
+
+    def load_decks(self):
+        """
+        Charge uniquement les métadonnées et résumés des decks ; les cartes restent sur disque.
+        """
+        decks = []
+        for row in self.conn.execute("SELECT * FROM decks ORDER BY rowid"):
+            decks.append(Deck(
+                row["id"],
+                row["name"],
+                row["description"],
+                to_timestamp(row["created_at"]),
+                to_timestamp(row["last_studied"]),
+                DeckSummary(row["card_count"], row["correct_answers"], row["incorrect_answers"]),
+                progress=DailyProgress(row["study_day"], row["new_studied"], row["reviews_studied"])
+                if row["study_day"] else None
+            ))
+        return decks
+
+    def load_cards(self, deck_id):
+        """
+        Charge les cartes d'un deck et leurs médias en deux requêtes indexées.
+        """
+        cards = []
+        cards_by_id = {}
+        for row in self.conn.execute("SELECT * FROM cards WHERE deck_id = ? ORDER BY rowid", (deck_id,)):
+            card = Card(row["id"], row["front"], row["back"], to_timestamp(row["created_at"]),
+                        row["correct_count"], row["incorrect_count"],
+                        row["ease"], row["interval"], row["repetitions"], row["due"])
+            cards.append(card)
+            cards_by_id[card.id] = card
+
+        media_rows = self.conn.execute(
+            """
+            SELECT media.* FROM media JOIN cards ON cards.id = media.card_id
+            WHERE cards.deck_id = ? ORDER BY media.rowid
+            """,
+            (deck_id,)
+        )
+        for row in media_rows:
+            cards_by_id[row["card_id"]].media.append(Media(row["id"], row["type"], row["path"]))
+
+        return cards
+
+    def load_card_fronts(self, deck_id):
+        """
+        Lit l'identifiant et le recto des cartes sans construire d'objets Card ni lire les médias.
+        """
+        rows = self.conn.execute("SELECT id, front FROM cards WHERE deck_id = ? ORDER BY rowid", (deck_id,))
+        return [(row[0], row[1]) for row in rows]
+
+    def save_all(self, decks):
+        """
+        Remplace le contenu de la base par la collection fournie, en une seule transaction.
+        """
+        with self.transaction():
+            self.conn.execute("DELETE FROM decks")
+            for deck in decks:
+                self._upsert_deck(deck)
+                for card in deck.cards or []:
+                    self._upsert_card(deck.id, card)
+
+    def save_deck(self, deck):
+        with self.transaction():
+            self._upsert_deck(deck)
+
+    def delete_deck(self, deck_id):
+        # Les cartes et médias sont supprimés par cascade
+        with self.transaction():
+            self.conn.execute("DELETE FROM decks WHERE id = ?", (deck_id,))
+
+    def save_card(self, deck, card):
+        with self.transaction():
+            self._upsert_card(deck.id, card)
+
+    def save_cards(self, deck, cards):
+        """
+        Enregistre un lot de cartes avec des requêtes groupées (executemany) dans une seule transaction.
+        """
+        with self.transaction():
+            self.conn.executemany(self.CARD_UPSERT, [self._card_values(deck.id, card) for card in cards])
+            self.conn.executemany("DELETE FROM media WHERE card_id = ?", [(card.id,) for card in cards])
+            self.conn.executemany(
+                "INSERT INTO media (id, card_id, type, path) VALUES (?, ?, ?, ?)",
+                [(media.id, card.id, media.type, media.path)
+                 for card in cards if card.has_media for media in card.media]
+            )
+
+    def delete_card(self, deck, card_id):
+        with self.transaction():
+            self.conn.execute("DELETE FROM cards WHERE id = ?", (card_id,))
+
+    def delete_cards(self, deck, card_ids):
+        with self.transaction():
+            self.conn.executemany("DELETE FROM cards WHERE id = ?", [(card_id,) for card_id in card_ids])
+
+    def record_result(self, deck, card):
+        """
+        Met à jour uniquement les compteurs de la carte ainsi que la date d'étude et le résumé du deck.
+        """
+        assignments = ", ".join(f"{field} = ?" for field in RESULT_FIELDS)
+        values = [getattr(card, field) for field in RESULT_FIELDS]
+        with self.transaction():
+            self.conn.execute(f"UPDATE cards SET {assignments} WHERE id = ?", values + [card.id])
+            self._upsert_deck(deck)
+
+    def search_cards(self, query, limit):
+        """
+        Recherche dans l'index FTS5 : tous les mots doivent être présents, le dernier
+        peut être un début de mot ; les résultats sont classés par bm25.
+        """
+        words, prefix = parse_query(query)
+        terms = [f'"{word}"' for word in words]
+        if prefix is not None:
+            terms.append(f'"{prefix}"*')
+        if not terms:
+            return []
+
+        rows = self.conn.execute(
+            """
+            SELECT cards.deck_id, cards.id, cards.front, cards.back,
+                   bm25(cards_fts, ?, ?) AS rank
+            FROM cards_fts JOIN cards ON cards.rowid = cards_fts.rowid
+            WHERE cards_fts MATCH ?
+            ORDER BY rank
+            LIMIT ?
+            """,
+            (*self.SEARCH_WEIGHTS, " ".join(terms), limit)
+        )
+        # bm25 est négatif, d'autant plus petit que la carte est pertinente
+        return [(row[0], row[1], row[2], row[3], -row[4]) for row in rows]
+
+    def is_empty(self):
+        return self.conn.execute("SELECT 1 FROM decks LIMIT 1").fetchone() is None
+
+    def _upsert_deck(self, deck):
+        """Insère ou met à jour la ligne d'un deck sans changer son rang d'insertion."""
+        self.conn.execute(
+            """
+            INSERT INTO decks (id, name, description, created_at, last_studied,
+                               card_count, correct_answers, incorrect_answers,
+                               study_day, new_studied, reviews_studied)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(id) DO UPDATE SET
+                name = excluded.name,
+                description = excluded.description,
+                created_at = excluded.created_at,
+                last_studied = excluded.last_studied,
+                card_count = excluded.card_count,
+                correct_answers = excluded.correct_answers,
+                incorrect_answers = excluded.incorrect_answers,
+                study_day = excluded.study_day,
+                new_studied = excluded.new_studied,
+                reviews_studied = excluded.reviews_studied
+            """,
+            (deck.id, deck.name, deck.description,
+             to_iso(deck.created_at), to_iso(deck.last_studied), *summary_values(deck),
+             *progress_values(deck))
+        )
+
+    # Insertion ou mise à jour d'une carte sans changer son rang d'insertion
+    CARD_UPSERT = """
+            INSERT INTO cards (id, deck_id, front, back, created_at, correct_count, incorrect_count,
+                               ease, interval, repetitions, due)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(id) DO UPDATE SET
+                deck_id = excluded.deck_id,
+                front = excluded.front,
+                back = excluded.back,
+                created_at = excluded.created_at,
+                correct_count = excluded.correct_count,
+                incorrect_count = excluded.incorrect_count,
+                ease = excluded.ease,
+                interval = excluded.interval,
+                repetitions = excluded.repetitions,
+                due = excluded.due
+            """
+
+    @staticmethod
+    def _card_values(deck_id, card):
+        """Paramètres de CARD_UPSERT pour une carte."""
+        return (card.id, deck_id, card.front, card.back, to_iso(card.created_at),
+                card.correct_count, card.incorrect_count,
+                card.ease, card.interval, card.repetitions, card.due)
+
+    def _upsert_card(self, deck_id, card):
+        """Insère ou met à jour une carte et remplace la liste de ses médias."""
+        self.conn.execute(self.CARD_UPSERT, self._card_values(deck_id, card))
+        self.conn.execute("DELETE FROM media WHERE card_id = ?", (card.id,))
+        if card.has_media:
+            self.conn.executemany(
+                "INSERT INTO media (id, card_id, type, path) VALUES (?, ?, ?, ?)",
+                [(media.id, card.id, media.type, media.path) for media in card.media]
+            )
+
+    def close(self):
+        self.conn.close()
+
+
+class ShardedStorage(StorageBackend):
+    """
+    Moteur fragmenté : un fichier JSON par deck (ses cartes) et un petit manifeste
+    contenant les métadonnées et le résumé de tous les decks.
+
+    Au démarrage seul le manifeste est lu ; le fichier d'un deck n'est lu que lorsque
+    ses cartes sont demandées, et enregistrer un deck ne réécrit que son propre fichier.
+    Les résultats de révision passent par un journal commun, réintégré dans les fichiers
+    des decks concernés tous les COMPACT_THRESHOLD résultats et à la fermeture.
+    Dans une transaction, ils ne sont journalisés qu'à la fin du bloc, sauf pour les decks
+    dont le fichier est de toute façon réécrit.
+    """
+
+    lazy_loading = True
+    COMPACT_THRESHOLD = 500
+    MANIFEST_VERSION = 2
+
+    def __init__(self, shards_dir):
+        """
+        Initialise le moteur fragmenté.
+
+        Args:
+            shards_dir: Dossier contenant le manifeste et les fichiers des decks.
+        """
+        self.shards_dir = shards_dir
+        self.manifest_file = os.path.join(shards_dir, "manifest.json")
+        self.journal = ReviewJournal(os.path.join(shards_dir, "reviews.journal"))
+        self._decks = []              # Decks suivis, dans l'ordre du manifeste
+        self._decks_by_id = {}
+        self._pending_results = {}    # id de deck -> {id de carte: champs} issus du journal
+        self._transaction_depth = 0
+        self._dirty_decks = set()
+        self._deleted_decks = set()   # Fichiers de decks à supprimer à la prochaine écriture
+        self._manifest_dirty = False
+        self._pending_entries = []    # Résultats à journaliser à la fin de la transaction
+        self._truncate_journal = False  # Instantané complet en cours : le journal sera vidé
+
+        if not os.path.exists(shards_dir):
+            os.makedirs(shards_dir)
+
+    def _shard_file(self, deck_id):
+        """Chemin du fichier contenant les cartes d'un deck."""
+        return os.path.join(self.shards_dir, f"{deck_id}.json")
+
+    def load_decks(self):
+        """
+        Lit le manifeste et le journal, sans ouvrir les fichiers des decks.
+        """
+        entries = []
+        if os.path.exists(self.manifest_file):
+            with open(self.manifest_file, 'r', encoding='utf-8') as f:
+                entries = json.load(f).get("decks", [])
+
+        # Les entrées du manifeste n'ont pas de clé "cards" : les cartes restent à charger.
+        # Celles de version 1 n'ont pas de résumé, recalculé alors par le DeckManager.
+        self._decks = [Deck.from_dict(entry) for entry in entries]
+        self._decks_by_id = {deck.id: deck for deck in self._decks}
+
+        # Les résultats journalisés sont appliqués au chargement de chaque deck
+        self._pending_results = {}
+        for deck_id, card_id, card_fields, deck_fields in self.journal.replay():
+            deck = self._decks_by_id.get(deck_id)
+            if deck is None:
+                continue
+            self._pending_results.setdefault(deck_id, {}).setdefault(card_id, {}).update(card_fields)
+            apply_deck_fields(deck, deck_fields)
+
+        return list(self._decks)
+
+    def load_cards(self, deck_id):
+        """
+        Lit le fichier d'un deck et y applique les résultats encore dans le journal.
+
+        Fichier et résultats sont lus sous snapshot_lock, sous lequel la réintégration du journal
+        les remplace : le fichier lu est soit l'ancien, complété par les résultats journalisés,
+        soit le nouveau, qui les contient déjà.
+        """
+        cards = []
+        shard_file = self._shard_file(deck_id)
+        with self.snapshot_lock:
+            if os.path.exists(shard_file):
+                with open(shard_file, 'r', encoding='utf-8') as f:
+                    cards = [Card.from_dict(data) for data in json.load(f)]
+            pending = self._pending_results.get(deck_id)
+        if pending:
+            for card in cards:
+                fields = pending.get(card.id)
+                if fields:
+                    apply_card_fields(card, fields)
+        return cards
+
+    def save_all(self, decks):
+        """
+        Écrit le fichier de chaque deck puis le manifeste, et vide le journal
+        (à la fin de la transaction en cours, s'il y en a une).
+        """
+        with self.transaction():
+            for deck_id in list(self._decks_by_id):
+                if all(deck.id != deck_id for deck in decks):
+                    self.delete_deck(deck_id)
+            self._decks = list(decks)
+            self._decks_by_id = {deck.id: deck for deck in decks}
+            for deck in decks:
+                self._dirty_decks.add(deck.id)
+            self._manifest_dirty = True
+            self._truncate_journal = True
+
+    def save_deck(self, deck):
+        if deck.id not in self._decks_by_id:
+            self._decks.append(deck)
+            self._decks_by_id[deck.id] = deck
+            self._dirty_decks.add(deck.id)
+        self._manifest_dirty = True
+        self._flush()
+
+    def delete_deck(self, deck_id):
+        deck = self._decks_by_id.pop(deck_id, None)
+        if deck is None:
+            return
+        self._decks.remove(deck)
+        self._pending_results.pop(deck_id, None)
+        self._dirty_decks.discard(deck_id)
+        self._deleted_decks.add(deck_id)
+        self._manifest_dirty = True
+        self._flush()
+
+    # Le résumé du deck, stocké dans le manifeste, est enregistré séparément par save_deck
+    def save_card(self, deck, card):
+        self._dirty_decks.add(deck.id)
+        self._flush()
+
+    def delete_card(self, deck, card_id):
+        self._dirty_decks.add(deck.id)
+        self._flush()
+
+    def record_result(self, deck, card):
+        """
+        Ajoute le résultat au journal ; seul le fichier du deck sera réécrit au compactage.
+        Dans une transaction, le résultat n'est journalisé qu'à la fin du bloc,
+        pour pouvoir être annulé avec le reste.
+        """
+        card_fields, deck_fields = result_fields(deck, card)
+        if self._transaction_depth > 0:
+            self._pending_entries.append((deck.id, card.id, card_fields, deck_fields))
+            return
+        self._append_result(deck.id, card.id, card_fields, deck_fields)
+        if len(self.journal) >= self.COMPACT_THRESHOLD:
+            self.compact()
+
+    def _append_result(self, deck_id, card_id, card_fields, deck_fields):
+        """Écrit un résultat dans le journal et le retient pour le prochain chargement du deck."""
+        self.journal.append(deck_id, card_id, card_fields, deck_fields)
+        self._pending_results.setdefault(deck_id, {}).setdefault(card_id, {}).update(card_fields)
+
+    def compact(self):
+        """
+        Réintègre le journal : réécrit uniquement les decks ayant reçu des résultats,
+        puis le manifeste (dates de dernière étude, résumés), et vide le journal.
+        """
+        if len(self.journal) == 0:
+            return
+        self._dirty_decks.update(deck_id for deck_id in self._pending_results if deck_id in self._decks_by_id)
+        self._manifest_dirty = True
+        self._flush()
+        with self.snapshot_lock:
+            self._pending_results = {}
+            self.journal.truncate()
+
+    @contextmanager
+    def transaction(self):
+        """
+        Diffère les écritures de fichiers jusqu'à la fin du bloc le plus externe.
+        Si une exception est levée, rien n'est écrit.
+        """
+        self._transaction_depth += 1
+        try:
+            yield
+        except BaseException:
+            self._transaction_depth -= 1
+            if self._transaction_depth == 0:
+                self._dirty_decks.clear()
+                self._deleted_decks.clear()
+                self._manifest_dirty = False
+                self._pending_entries = []
+                self._truncate_journal = False
+            raise
+        self._transaction_depth -= 1
+        if self._transaction_depth > 0:
+            return
+
+        # Les résultats des decks réécrits sont déjà dans leur fichier et dans le manifeste
+        entries = []
+        for entry in self._pending_entries:
+            if entry[0] in self._dirty_decks:
+                self._manifest_dirty = True
+            elif entry[0] in self._decks_by_id:
+                entries.append(entry)
+        self._pending_entries = []
+        self._flush()
+        for entry in entries:
+            self._append_result(*entry)
+        if entries and len(self.journal) >= self.COMPACT_THRESHOLD:
+            self.compact()
+
+    def _flush(self):
+        """Écrit les fichiers des decks modifiés et le manifeste, hors transaction."""
+        if self._transaction_depth > 0:
+            return
+
+        for deck_id in self._deleted_decks:
+            if os.path.exists(self._shard_file(deck_id)):
+                os.remove(self._shard_file(deck_id))
+        self._deleted_decks.clear()
+
+        # Le fichier réécrit d'un deck contient déjà ses résultats journalisés : le journal est
+        # alors réintégré en entier, pour ne pas réappliquer d'anciens résultats au prochain chargement
+        compact = any(deck_id in self._pending_results for deck_id in self._dirty_decks)
+        if compact:
+            self._dirty_decks.update(deck_id for deck_id in self._pending_results if deck_id in self._decks_by_id)
+            self._manifest_dirty = True
+
+        with self.snapshot_lock:
+            shards = []
+            for deck_id in self._dirty_decks:
+                deck = self._decks_by_id.get(deck_id)
+                if deck is None:
+                    continue
+                cards = deck.cards if deck.cards is not None else self.load_cards(deck_id)
+                shards.append((self._shard_file(deck_id), [card.to_dict() for card in cards]))
+            manifest = None
+            if self._manifest_dirty:
+                manifest = {
+                    "version": self.MANIFEST_VERSION,
+                    "decks": [deck.to_dict(include_cards=False) for deck in self._decks]
+                }
+        self._dirty_decks.clear()
+        self._manifest_dirty = False
+
+        for shard_file, data in shards:
+            write_json_atomic(shard_file, data)
+        if manifest is not None:
+            write_json_atomic(self.manifest_file, manifest)
+        if compact or self._truncate_journal:
+            # Les fichiers sont écrits : résultats journalisés et journal sont vidés sous le verrou,
+            # pour qu'un deck chargé en même temps ne lise pas l'ancien fichier sans ses résultats
+            with self.snapshot_lock:
+                self._truncate_journal = False
+                self._pending_results = {}
+                self.journal.truncate()
+
+    def is_empty(self):
+        return not os.path.exists(self.manifest_file)
+
+    def close(self):
+        self.compact()
+        self.journal.close()
+
+
+# Moteurs disponibles et nom du fichier de données de chacun
+BACKENDS = {
+    "json": (JsonStorage, "decks.json"),
+    "sqlite": (SqliteStorage, "flashmaster.db"),
+    "shards": (ShardedStorage, "decks"),
+}
+
+DEFAULT_BACKEND = "sqlite"
+LEGACY_DECKS_FILE = "decks.json"
+
+
+def create_storage(backend, data_dir):
+    """
+    Instancie un moteur de stockage à partir de son nom.
+
+    Args:
+        backend: Nom du moteur ('json', 'sqlite' ou 'shards').
+        data_dir: Le répertoire des données.
+
+    Returns:
+        L'instance du moteur de stockage.
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Moteur de stockage inconnu: {backend}")
+    storage_class, file_name = BACKENDS[backend]
+    return storage_class(os.path.join(data_dir, file_name))
+
+
+def migrate_legacy_json(data_dir, storage):
+    """
+    Importe une seule fois le fichier decks.json historique dans un autre moteur.
+
+    L'import n'a lieu que si le moteur cible est vide ; le fichier JSON est ensuite
+    renommé en decks.json.migrated pour ne pas être réimporté.
+
+    Args:
+        data_dir: Le répertoire des données.
+        storage: Le moteur de stockage cible.
+
+    Returns:
+        Le nombre de decks importés (0 si aucune migration n'a eu lieu).
+    """
+    legacy_file = os.path.join(data_dir, LEGACY_DECKS_FILE)
+    if isinstance(storage, JsonStorage) or not os.path.exists(legacy_file):
+        return 0
+    if not storage.is_empty():
+        return 0
+
+    legacy_storage = JsonStorage(legacy_file)
+    decks = legacy_storage.load_decks()
+    for deck in decks:
+        # Les fichiers antérieurs aux résumés n'en ont pas : un moteur qui stocke le résumé
+        # en colonnes le relirait comme vide, il est donc calculé avant l'import
+        if not deck.summary:
+            deck.summary = DeckSummary(
+                len(deck.cards),
+                sum(card.correct_count for card in deck.cards),
+                sum(card.incorrect_count for card in deck.cards)
+            )
+    storage.save_all(decks)
+    os.replace(legacy_file, legacy_file + ".migrated")
+    if os.path.exists(legacy_storage.journal.journal_file):
+        os.remove(legacy_storage.journal.journal_file)
+    return len(decks)
@@ -0,0 +1,120 @@
+import random
+import time
+from array import array
+
+
+class StudySession:
+    """
+    Session d'étude d'un deck : l'ordre de présentation des cartes, la position atteinte
+    et les résultats de la session.
+
+    La session garde les identifiants des cartes sélectionnées au démarrage (dans l'ordre
+    du planificateur) et une permutation compacte de leurs positions (array d'entiers non signés) :
+    mélanger ou reproposer une carte ne modifie que cette permutation, jamais la liste des cartes
+    du deck ni leur ordre enregistré.
+
+    Une carte ratée est reproposée REQUEUE_GAP cartes plus loin, au plus MAX_REQUEUES fois.
+    Seule la première réponse à une carte doit être enregistrée (statistiques et planification) :
+    les passages suivants ne servent qu'à la réapprendre pendant la session.
+    """
+
+    REQUEUE_GAP = 5     # Nombre de cartes présentées avant de reproposer une carte ratée
+    MAX_REQUEUES = 2    # Nombre maximal de nouveaux passages d'une même carte
+
+    def __init__(self, deck_id, card_ids, limit=None, shuffle=False, requeue_failed=True, session_id=0):
+        """
+        Démarre une session.
+
+        Args:
+            deck_id: L'identifiant du deck étudié.
+            card_ids: Les identifiants des cartes à étudier, dans l'ordre du planificateur.
+            limit: Nombre maximal de cartes de la session (None pour toutes).
+            shuffle: Si True, les cartes sont présentées dans un ordre aléatoire.
+            requeue_failed: Si True, les cartes ratées sont reproposées plus loin dans la session.
+            session_id: Numéro de la session dans l'historique des révisions.
+        """
+        card_ids = list(card_ids)
+        if limit is not None:
+            card_ids = card_ids[:max(0, limit)]
+
+        self.deck_id = deck_id
+        self.session_id = session_id
+        self.card_ids = tuple(card_ids)
+        self.requeue_failed = requeue_failed
+        self._order = array('I', range(len(card_ids)))  # Positions dans card_ids, dans l'ordre de présentation
+        if shuffle:
+            random.shuffle(self._order)
+        self._requeues = array('B', bytes(len(card_ids)))  # Nombre de nouveaux passages par carte
+        self.position = 0           # Position de la carte actuelle dans l'ordre de présentation
+        self.correct_answers = 0
+        self.total_answers = 0
+        self.started_at = time.time()
+
+    def __len__(self):
+        """Nombre de passages prévus, y compris ceux des cartes ratées reproposées."""
+        return len(self._order)
+
+    @property
+    def card_count(self):
+        """Nombre de cartes distinctes de la session."""
+        return len(self.card_ids)
+
+    @property
+    def finished(self):
+        return self.position >= len(self._order)
+
+    @property
+    def remaining(self):
+        """Nombre de passages restants, carte actuelle comprise."""
+        return max(0, len(self._order) - self.position)
+
+    def current_card_id(self):
+        """Retourne l'identifiant de la carte actuelle, ou None si la session est terminée."""
+        if self.finished:
+            return None
+        return self.card_ids[self._order[self.position]]
+
+    def upcoming_card_ids(self, count):
+        """
+        Retourne les identifiants des count cartes qui suivent la carte actuelle.
+
+        Args:
+            count: Nombre de cartes.
+        """
+        start = self.position + 1
+        return [self.card_ids[index] for index in self._order[start:start + count]]
+
+    def is_first_attempt(self):
+        """Indique si la carte actuelle est présentée pour la première fois dans la session."""
+        return not self.finished and self._requeues[self._order[self.position]] == 0
+
+    def answer(self, is_correct):
+        """
+        Enregistre la réponse à la carte actuelle et passe à la suivante.
+        Une carte ratée est reproposée plus loin, dans la limite de MAX_REQUEUES passages.
+
+        Args:
+            is_correct: True si la réponse était correcte, False sinon.
+
+        Returns:
+            True si c'était la première réponse de la session à cette carte, False sinon
+            (ou si la session était terminée).
+        """
+        if self.finished:
+            return False
+
+        index = self._order[self.position]
+        first_attempt = self._requeues[index] == 0
+        self.total_answers += 1
+        if is_correct:
+            self.correct_answers += 1
+        elif self.requeue_failed and self._requeues[index] < self.MAX_REQUEUES:
+            self._requeues[index] += 1
+            self._order.insert(min(len(self._order), self.position + 1 + self.REQUEUE_GAP), index)
+        self.position += 1
+        return first_attempt
+
+    def skip(self):
+        """Passe la carte actuelle sans réponse (carte supprimée pendant la session)."""
+        if not self.finished:
+            self.position += 1
@@ -1,6 +1,8 @@
+import os
+
 from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
-                             QTextEdit, QFormLayout, QFrame)
-from ui.style import get_style  # Importation de la fonction pour appliquer des styles
+                             QTextEdit, QFormLayout, QFrame, QFileDialog)
+from ui.style import set_role  # Importation de la fonction pour appliquer des styles
 
 class CardEditorDialog(QDialog):
     def __init__(self, parent=None, front="", back=""):
@@ -14,6 +16,7 @@ class CardEditorDialog(QDialog):
         super().__init__(parent)
         self.front = front  # Texte de la question
         self.back = back    # Texte de la réponse
+        self.image_paths = []  # Images choisies, ajoutées à la carte après l'enregistrement
         self.init_ui()      # Appel à la méthode pour initialiser l'interface
 
     def init_ui(self):
@@ -29,18 +32,18 @@ class CardEditorDialog(QDialog):
 
         # Titre de la boîte de dialogue
         title_label = QLabel("Créer ou modifier une carte")
-        title_label.setStyleSheet(get_style("header_label"))  # Application du style "header_label"
+        set_role(title_label, "header_label")  # Application du style "header_label"
         layout.addWidget(title_label)
 
         # Instruction affichée sous le titre
         instruction_label = QLabel("Entrez la question et la réponse pour cette carte.")
-        instruction_label.setStyleSheet(get_style("info_label"))  # Application du style "info_label"
+        set_role(instruction_label, "info_label")  # Application du style "info_label"
         layout.addWidget(instruction_label)
 
         # Séparateur horizontal entre les sections
         separator = QFrame()
         separator.setFrameShape(QFrame.HLine)  # Ligne horizontale
-        separator.setStyleSheet(get_style("separator"))  # Application du style pour le séparateur
+        set_role(separator, "separator")  # Application du style pour le séparateur
         layout.addWidget(separator)
 
         # Formulaire avec des champs pour entrer la question et la réponse
@@ -66,6 +69,17 @@ class CardEditorDialog(QDialog):
 
         layout.addLayout(form_layout)  # Ajout du formulaire au layout principal
 
+        # Ajout d'images à la carte
+        images_layout = QHBoxLayout()
+        images_layout.setSpacing(10)
+        add_image_btn = QPushButton("Ajouter une image...")
+        add_image_btn.clicked.connect(self.choose_images)
+        images_layout.addWidget(add_image_btn)
+        self.images_label = QLabel("")
+        set_role(self.images_label, "info_label")
+        images_layout.addWidget(self.images_label, 1)
+        layout.addLayout(images_layout)
+
         # Disposition des boutons d'annulation et d'enregistrement
         buttons_layout = QHBoxLayout()  # Disposition horizontale des boutons
         buttons_layout.setSpacing(10)
@@ -81,4 +95,14 @@ class CardEditorDialog(QDialog):
         save_btn.clicked.connect(self.accept)  # Accepte et ferme la boîte de dialogue
         buttons_layout.addWidget(save_btn)
 
-        layout.addLayout(buttons_layout)  # Ajout des boutons au layout principal
\ No newline at end of file
+        layout.addLayout(buttons_layout)  # Ajout des boutons au layout principal
+
+    def choose_images(self):
+        """Ouvre un sélecteur de fichiers et retient les images choisies."""
+        paths, _ = QFileDialog.getOpenFileNames(
+            self, "Ajouter une image", "",
+            "Images (*.png *.jpg *.jpeg *.gif *.bmp *.webp);;Tous les fichiers (*)"
+        )
+        if paths:
+            self.image_paths.extend(paths)
+            self.images_label.setText(", ".join(os.path.basename(path) for path in self.image_paths))
@@ -0,0 +1,248 @@
+from PyQt5.QtWidgets import QStyledItemDelegate, QStyleOptionButton, QStyle, QApplication
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, QRect, QSize, QEvent, pyqtSignal
+
+
+class CardTableModel(QAbstractTableModel):
+    """
+    Modèle de la table des cartes d'un deck, lu directement dans les données du DeckManager.
+
+    Le modèle ne garde que la liste des identifiants de cartes, dans l'ordre d'affichage ;
+    le texte de chaque cellule est calculé à la demande pour les seules lignes visibles.
+    Les lignes sont exposées à la vue par tranches de FETCH_SIZE (canFetchMore / fetchMore),
+    et une modification sur une carte ne met à jour que sa ligne.
+
+    La question d'une carte illustrée est précédée de la miniature de sa première image ;
+    une miniature encore en cours de génération met à jour la ligne dès qu'elle est prête.
+    """
+
+    COLUMNS = ["Question", "Réponse", "Stats", "Actions"]
+    ACTIONS_COLUMN = 3
+    FETCH_SIZE = 1000
+    THUMBNAIL_SIZE = 28
+
+    def __init__(self, deck_manager, deck_id, parent=None, thumbnails=None):
+        """
+        Constructeur du modèle.
+
+        :param deck_manager: Objet qui gère les decks et les cartes
+        :param deck_id: ID du deck affiché
+        :param parent: Objet parent Qt
+        :param thumbnails: Cache des miniatures (ThumbnailCache), facultatif
+        """
+        super().__init__(parent)
+        self.deck_manager = deck_manager
+        self.deck_id = deck_id
+        self.thumbnails = thumbnails
+        self._card_ids = []   # Identifiants des cartes, dans l'ordre des lignes
+        self._rows = {}       # id de carte -> numéro de ligne
+        self._fetched = 0     # Nombre de lignes déjà exposées à la vue
+        self._waiting = {}    # nom d'image en cours de génération -> ids des cartes à rafraîchir
+        if thumbnails is not None:
+            thumbnails.thumbnail_ready.connect(self.on_thumbnail_ready)
+        self._load_ids()
+
+    def _load_ids(self):
+        """Relit la liste des cartes du deck et réindexe les lignes."""
+        self._card_ids = [card.id for card in self.deck_manager.get_cards(self.deck_id)]
+        self._rows = {card_id: row for row, card_id in enumerate(self._card_ids)}
+        self._fetched = min(len(self._card_ids), self.FETCH_SIZE)
+
+    # -------- Interface QAbstractTableModel --------
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return self._fetched
+
+    def columnCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.COLUMNS)
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self._fetched < len(self._card_ids)
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return
+        count = min(self.FETCH_SIZE, len(self._card_ids) - self._fetched)
+        if count <= 0:
+            return
+        self.beginInsertRows(QModelIndex(), self._fetched, self._fetched + count - 1)
+        self._fetched += count
+        self.endInsertRows()
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.COLUMNS[section]
+        return None
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or index.row() >= self._fetched:
+            return None
+
+        card_id = self._card_ids[index.row()]
+        if role == Qt.UserRole:
+            return card_id
+        if role == Qt.DecorationRole and index.column() == 0:
+            return self._thumbnail(card_id)
+        if role not in (Qt.DisplayRole, Qt.ToolTipRole):
+            return None
+
+        card = self.deck_manager.get_card(self.deck_id, card_id)
+        if card is None:
+            return None
+
+        column = index.column()
+        if column == 0:
+            return card.front
+        if column == 1:
+            return card.back
+        if column == 2:
+            total = card.correct_count + card.incorrect_count
+            if total > 0:
+                success_rate = (card.correct_count / total) * 100
+                return f"{card.correct_count}/{total} ({success_rate:.1f}%)"
+            return "Aucune donnée"
+        return None
+
+    def _thumbnail(self, card_id):
+        """Retourne la miniature de la première image d'une carte, ou None."""
+        if self.thumbnails is None:
+            return None
+        card = self.deck_manager.get_card(self.deck_id, card_id)
+        if card is None or not card.has_media:
+            return None
+        for media in card.media:
+            if media.type == "image" and self.deck_manager.media_store.is_stored_name(media.path):
+                pixmap = self.thumbnails.thumbnail(media.path, self.THUMBNAIL_SIZE)
+                if pixmap is None:
+                    self._waiting.setdefault(media.path, set()).add(card_id)
+                return pixmap
+        return None
+
+    def on_thumbnail_ready(self, name, size):
+        """Rafraîchit les lignes qui attendaient une miniature."""
+        if size != self.THUMBNAIL_SIZE:
+            return
+        for card_id in self._waiting.pop(name, ()):
+            self.card_changed(card_id)
+
+    # -------- Accès et notifications ciblées --------
+
+    def card_id(self, row):
+        """Retourne l'identifiant de la carte affichée à une ligne."""
+        return self._card_ids[row]
+
+    def row_of(self, card_id):
+        """
+        Retourne la ligne d'une carte (ou None), en exposant à la vue les tranches
+        nécessaires si la carte n'est pas encore affichée.
+        """
+        row = self._rows.get(card_id)
+        if row is None:
+            return None
+        if row >= self._fetched:
+            self.beginInsertRows(QModelIndex(), self._fetched, row)
+            self._fetched = row + 1
+            self.endInsertRows()
+        return row
+
+    def total_count(self):
+        """Nombre total de cartes, y compris les lignes pas encore exposées à la vue."""
+        return len(self._card_ids)
+
+    def card_added(self, card_id):
+        """Ajoute une ligne à la fin de la table pour une nouvelle carte."""
+        row = len(self._card_ids)
+        if row > self._fetched:
+            # Les lignes précédentes ne sont pas encore affichées : la carte viendra avec elles
+            self._card_ids.append(card_id)
+            self._rows[card_id] = row
+            return
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._card_ids.append(card_id)
+        self._rows[card_id] = row
+        self._fetched += 1
+        self.endInsertRows()
+
+    def card_changed(self, card_id):
+        """Signale à la vue que le contenu d'une carte a changé."""
+        row = self._rows.get(card_id)
+        if row is None or row >= self._fetched:
+            return
+        self.dataChanged.emit(self.index(row, 0), self.index(row, len(self.COLUMNS) - 1))
+
+    def card_removed(self, card_id):
+        """Retire la ligne d'une carte supprimée."""
+        row = self._rows.pop(card_id, None)
+        if row is None:
+            return
+
+        visible = row < self._fetched
+        if visible:
+            self.beginRemoveRows(QModelIndex(), row, row)
+        del self._card_ids[row]
+        for later_row in range(row, len(self._card_ids)):
+            self._rows[self._card_ids[later_row]] = later_row
+        if visible:
+            self._fetched -= 1
+            self.endRemoveRows()
+
+    def refresh(self):
+        """Relit toutes les cartes du deck (après une opération groupée ou une session d'étude)."""
+        self.beginResetModel()
+        self._load_ids()
+        self.endResetModel()
+
+
+class CardActionsDelegate(QStyledItemDelegate):
+    """
+    Délégué de la colonne Actions : dessine les boutons Modifier / Supprimer de chaque ligne
+    au lieu de créer des widgets, et émet un signal avec l'ID de la carte lors d'un clic.
+    """
+
+    edit_requested = pyqtSignal(str)
+    delete_requested = pyqtSignal(str)
+
+    LABELS = ("Modifier", "Supprimer")
+    MARGIN = 4
+
+    def _button_rects(self, rect):
+        """Retourne les rectangles des deux boutons dans la cellule."""
+        width = (rect.width() - 3 * self.MARGIN) // 2
+        height = rect.height() - 2 * self.MARGIN
+        edit_rect = QRect(rect.left() + self.MARGIN, rect.top() + self.MARGIN, width, height)
+        delete_rect = QRect(edit_rect.right() + 1 + self.MARGIN, edit_rect.top(), width, height)
+        return edit_rect, delete_rect
+
+    def paint(self, painter, option, index):
+        # Fond de la cellule (sélection, lignes alternées) puis les deux boutons
+        super().paint(painter, option, index)
+        style = option.widget.style() if option.widget else QApplication.style()
+        for label, rect in zip(self.LABELS, self._button_rects(option.rect)):
+            button = QStyleOptionButton()
+            button.rect = rect
+            button.text = label
+            button.state = QStyle.State_Enabled | QStyle.State_Raised
+            style.drawControl(QStyle.CE_PushButton, button, painter, option.widget)
+
+    def sizeHint(self, option, index):
+        return QSize(190, 34)
+
+    def editorEvent(self, event, model, option, index):
+        if event.type() == QEvent.MouseButtonRelease and event.button() == Qt.LeftButton:
+            edit_rect, delete_rect = self._button_rects(option.rect)
+            card_id = index.data(Qt.UserRole)
+            if edit_rect.contains(event.pos()):
+                self.edit_requested.emit(card_id)
+                return True
+            if delete_rect.contains(event.pos()):
+                self.delete_requested.emit(card_id)
+                return True
+        return super().editorEvent(event, model, option, index)
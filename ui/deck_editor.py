@@ -1,6 +1,6 @@
 from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
                              QLineEdit, QTextEdit, QFormLayout, QFrame)
-from ui.style import get_style  # Importation de la fonction pour appliquer des styles
+from ui.style import set_role  # Importation de la fonction pour appliquer des styles
 
 class DeckEditorDialog(QDialog):
     def __init__(self, parent=None, name="", description=""):
@@ -29,18 +29,18 @@ class DeckEditorDialog(QDialog):
 
         # Titre de la boîte de dialogue
         title_label = QLabel("Créer ou modifier un deck")
-        title_label.setStyleSheet(get_style("header_label"))  # Application du style "header_label"
+        set_role(title_label, "header_label")  # Application du style "header_label"
         layout.addWidget(title_label)
 
         # Instruction affichée sous le titre
         instruction_label = QLabel("Donnez un nom et une description à votre deck de cartes.")
-        instruction_label.setStyleSheet(get_style("info_label"))  # Application du style "info_label"
+        set_role(instruction_label, "info_label")  # Application du style "info_label"
         layout.addWidget(instruction_label)
 
         # Séparateur horizontal entre les sections
         separator = QFrame()
         separator.setFrameShape(QFrame.HLine)  # Ligne horizontale
-        separator.setStyleSheet(get_style("separator"))  # Application du style pour le séparateur
+        set_role(separator, "separator")  # Application du style pour le séparateur
         layout.addWidget(separator)
 
         # Formulaire avec des champs pour entrer le nom et la description du deck
@@ -0,0 +1,159 @@
+from PyQt5.QtWidgets import QStyledItemDelegate, QStyle, QApplication
+from PyQt5.QtCore import Qt, QAbstractListModel, QModelIndex, QRect, QSize
+from PyQt5.QtGui import QColor, QFont, QFontMetrics
+
+from ui.style import theme_color
+
+# Rôle de données donnant le résumé du deck (dictionnaire de DeckManager.get_deck_summary)
+SummaryRole = Qt.UserRole + 1
+
+
+class DeckListModel(QAbstractListModel):
+    """
+    Modèle de la liste des decks du panneau latéral.
+
+    Le modèle garde la liste des identifiants de decks et un index id -> ligne ; le nom et
+    les statistiques de chaque ligne sont lus à la demande dans les résumés du DeckManager,
+    sans charger aucune carte. Chaque création, modification ou suppression de deck ne met à
+    jour que sa propre ligne.
+    """
+
+    def __init__(self, deck_manager, parent=None):
+        """
+        Constructeur du modèle.
+
+        :param deck_manager: Objet qui gère les decks et les cartes
+        :param parent: Objet parent Qt
+        """
+        super().__init__(parent)
+        self.deck_manager = deck_manager
+        self._deck_ids = []   # Identifiants des decks, dans l'ordre des lignes
+        self._rows = {}       # id de deck -> numéro de ligne
+        self._load_ids()
+
+    def _load_ids(self):
+        """Relit la liste des decks et réindexe les lignes."""
+        self._deck_ids = [deck.id for deck in self.deck_manager.get_decks()]
+        self._rows = {deck_id: row for row, deck_id in enumerate(self._deck_ids)}
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self._deck_ids)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+
+        deck_id = self._deck_ids[index.row()]
+        if role == Qt.UserRole:
+            return deck_id
+        if role in (Qt.DisplayRole, Qt.ToolTipRole):
+            deck = self.deck_manager.get_deck(deck_id)
+            return deck.name if deck else None
+        if role == SummaryRole:
+            return self.deck_manager.get_deck_summary(deck_id)
+        return None
+
+    def index_of(self, deck_id):
+        """Retourne l'index du modèle correspondant à un deck, en temps constant."""
+        row = self._rows.get(deck_id)
+        if row is None:
+            return QModelIndex()
+        return self.index(row, 0)
+
+    def deck_added(self, deck_id):
+        """Ajoute la ligne d'un nouveau deck à la fin de la liste."""
+        if deck_id in self._rows:
+            return
+        row = len(self._deck_ids)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._deck_ids.append(deck_id)
+        self._rows[deck_id] = row
+        self.endInsertRows()
+
+    def deck_changed(self, deck_id):
+        """Signale à la vue que le nom ou les statistiques d'un deck ont changé."""
+        index = self.index_of(deck_id)
+        if index.isValid():
+            self.dataChanged.emit(index, index)
+
+    def deck_removed(self, deck_id):
+        """Retire la ligne d'un deck supprimé."""
+        row = self._rows.pop(deck_id, None)
+        if row is None:
+            return
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self._deck_ids[row]
+        for later_row in range(row, len(self._deck_ids)):
+            self._rows[self._deck_ids[later_row]] = later_row
+        self.endRemoveRows()
+
+    def refresh(self):
+        """Relit toute la liste des decks."""
+        self.beginResetModel()
+        self._load_ids()
+        self.endResetModel()
+
+
+class DeckItemDelegate(QStyledItemDelegate):
+    """
+    Délégué de la liste des decks : dessine le nom du deck en gras, puis sur une seconde
+    ligne le nombre de cartes et le taux de réussite.
+    """
+
+    PADDING = 8
+
+    def _fonts(self, option):
+        """Polices du nom (gras) et de la ligne de détail."""
+        name_font = QFont(option.font)
+        name_font.setBold(True)
+        return name_font, QFont(option.font)
+
+    @staticmethod
+    def detail_text(summary):
+        """Texte de la seconde ligne : nombre de cartes et taux de réussite s'il existe."""
+        text = f"{summary['card_count']} cartes"
+        if summary["correct_answers"] + summary["incorrect_answers"] > 0:
+            text += f" • {summary['success_rate']:.1f}% de réussite"
+        return text
+
+    def paint(self, painter, option, index):
+        summary = index.data(SummaryRole)
+        if summary is None:
+            super().paint(painter, option, index)
+            return
+
+        # Fond de l'élément (survol, sélection, lignes alternées) sans le texte
+        self.initStyleOption(option, index)
+        option.text = ""
+        style = option.widget.style() if option.widget else QApplication.style()
+        style.drawControl(QStyle.CE_ItemViewItem, option, painter, option.widget)
+
+        name_font, detail_font = self._fonts(option)
+        name_height = QFontMetrics(name_font).height()
+        rect = option.rect.adjusted(self.PADDING, self.PADDING // 2, -self.PADDING, -self.PADDING // 2)
+        name_rect = QRect(rect.left(), rect.top(), rect.width(), name_height)
+        detail_rect = QRect(rect.left(), name_rect.bottom() + 1, rect.width(), rect.bottom() - name_rect.bottom())
+
+        selected = option.state & QStyle.State_Selected
+        painter.save()
+        painter.setFont(name_font)
+        if selected:
+            painter.setPen(option.palette.highlightedText().color())
+        else:
+            painter.setPen(option.palette.text().color())
+        name = QFontMetrics(name_font).elidedText(summary["name"], Qt.ElideRight, name_rect.width())
+        painter.drawText(name_rect, Qt.AlignLeft | Qt.AlignVCenter, name)
+
+        painter.setFont(detail_font)
+        if not selected:
+            painter.setPen(QColor(theme_color("light_text")))
+        painter.drawText(detail_rect, Qt.AlignLeft | Qt.AlignVCenter, self.detail_text(summary))
+        painter.restore()
+
+    def sizeHint(self, option, index):
+        name_font, detail_font = self._fonts(option)
+        height = QFontMetrics(name_font).height() + QFontMetrics(detail_font).height() + self.PADDING * 2
+        # Pas de largeur propre : le nom est élidé à la largeur de la liste
+        return QSize(0, height)
@@ -1,18 +1,27 @@
+import csv
+
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
-                             QTableWidget, QTableWidgetItem, QMenu,
-                             QAction, QMessageBox, QDialog, QHeaderView, QFrame)
-from PyQt5.QtCore import Qt
+                             QTableView, QMenu,
+                             QAction, QMessageBox, QDialog, QHeaderView, QFrame,
+                             QFileDialog, QProgressDialog, QApplication,
+                             QAbstractItemView, QInputDialog)
+from PyQt5.QtCore import Qt, QSize
 from PyQt5.QtGui import QCursor
 
-# Importation des boîtes de dialogue personnalisées pour les cartes et les decks
-from ui.card_editor import CardEditorDialog
-from ui.deck_editor import DeckEditorDialog
+# Les boîtes de dialogue (éditeurs de cartes et de decks, import) sont importées
+# à leur première ouverture, pour ne pas ralentir l'ouverture de la vue
+
+# Modèle et délégué de la table des cartes
+from ui.card_table_model import CardTableModel, CardActionsDelegate
+
+# Lecture des fichiers CSV/TSV pour l'import en masse
+from models.importer import count_lines, read_card_rows
 
 # Pour gérer les dates de dernière étude
 from datetime import datetime
 
 # Importation du système de styles centralisé
-from ui.style import get_style
+from ui.style import set_role
 
 
 class DeckView(QWidget):
@@ -22,13 +31,13 @@ class DeckView(QWidget):
 
         :param parent: le widget parent (probablement la fenêtre principale)
         :param deck_manager: objet responsable de la gestion des données (decks et cartes)
-        :param deck: dictionnaire contenant les informations du deck affiché
+        :param deck: objet Deck contenant les informations du deck affiché
         """
         super().__init__(parent)
         self.parent = parent
         self.deck_manager = deck_manager
         self.deck = deck
-        self.deck_id = deck["id"]
+        self.deck_id = deck.id
         self.init_ui()
 
     def init_ui(self):
@@ -45,15 +54,14 @@ class DeckView(QWidget):
 
         # Titre et description du deck
         title_desc_layout = QVBoxLayout()
-        self.title_label = QLabel(self.deck["name"])
-        self.title_label.setStyleSheet(get_style("header_label"))
+        self.title_label = QLabel(self.deck.name)
+        set_role(self.title_label, "header_label")
         title_desc_layout.addWidget(self.title_label)
 
-        if self.deck["description"]:
-            description_label = QLabel(self.deck["description"])
-            description_label.setWordWrap(True)
-            description_label.setStyleSheet(get_style("info_label"))
-            title_desc_layout.addWidget(description_label)
+        self.description_label = QLabel()
+        self.description_label.setWordWrap(True)
+        set_role(self.description_label, "info_label")
+        title_desc_layout.addWidget(self.description_label)
 
         header_layout.addLayout(title_desc_layout)
 
@@ -67,23 +75,13 @@ class DeckView(QWidget):
         stats_layout.setContentsMargins(0, 0, 0, 0)
         stats_layout.setSpacing(15)
 
-        card_count = self.deck_manager.get_card_count(self.deck_id)
-        card_count_label = QLabel(f"{card_count} cartes")
-        card_count_label.setStyleSheet(get_style("info_label"))
-        stats_layout.addWidget(card_count_label)
-
-        stats = self.deck_manager.get_deck_stats(self.deck_id)
-        if stats and stats["correct_answers"] + stats["incorrect_answers"] > 0:
-            success_rate = stats["success_rate"]
-            stats_label = QLabel(f"{success_rate:.1f}% de réussite")
-            stats_label.setStyleSheet(get_style("info_label"))
-            stats_layout.addWidget(stats_label)
-
-        if self.deck["last_studied"]:
-            last_studied = datetime.fromisoformat(self.deck["last_studied"]).strftime("%d/%m/%Y %H:%M")
-            last_studied_label = QLabel(f"Dernière étude: {last_studied}")
-            last_studied_label.setStyleSheet(get_style("info_label"))
-            stats_layout.addWidget(last_studied_label)
+        # Textes remplis par update_header, aussi appelée quand la vue est réaffichée
+        self.card_count_label = QLabel()
+        self.stats_label = QLabel()
+        self.last_studied_label = QLabel()
+        for label in (self.card_count_label, self.stats_label, self.last_studied_label):
+            set_role(label, "info_label")
+            stats_layout.addWidget(label)
 
         info_layout.addWidget(stats_widget)
         info_layout.addStretch()
@@ -92,6 +90,10 @@ class DeckView(QWidget):
         action_layout = QHBoxLayout()
         action_layout.setSpacing(10)
 
+        self.stats_btn = QPushButton("Statistiques")
+        self.stats_btn.clicked.connect(lambda: self.parent.show_stats_view(self.deck_id))
+        action_layout.addWidget(self.stats_btn)
+
         self.edit_deck_btn = QPushButton("Modifier")
         action_layout.addWidget(self.edit_deck_btn)
 
@@ -108,12 +110,6 @@ class DeckView(QWidget):
         self.study_btn.setObjectName("accent_button")
         self.study_btn.setMinimumHeight(50)
         self.study_btn.clicked.connect(self.start_study)
-
-        # Désactivation si aucune carte
-        if card_count == 0:
-            self.study_btn.setEnabled(False)
-            self.study_btn.setText("Ajoutez des cartes pour étudier")
-
         layout.addWidget(self.study_btn)
 
         # -------- Liste des cartes --------
@@ -125,28 +121,81 @@ class DeckView(QWidget):
 
         cards_header_layout = QHBoxLayout()
         cards_label = QLabel("Mes cartes")
-        cards_label.setStyleSheet(get_style("subheader_label"))
+        set_role(cards_label, "subheader_label")
         cards_header_layout.addWidget(cards_label)
 
         self.add_card_btn = QPushButton("+ Ajouter une carte")
-        self.add_card_btn.setStyleSheet(get_style("action_button"))
+        set_role(self.add_card_btn, "action_button")
         self.add_card_btn.clicked.connect(self.add_card)
         cards_header_layout.addWidget(self.add_card_btn)
 
+        self.import_btn = QPushButton("Importer...")
+        self.import_btn.clicked.connect(self.import_cards)
+        cards_header_layout.addWidget(self.import_btn)
+
         cards_layout.addLayout(cards_header_layout)
 
-        # Tableau des cartes (question, réponse, stats, actions)
-        self.cards_table = QTableWidget()
-        self.cards_table.setColumnCount(4)
-        self.cards_table.setHorizontalHeaderLabels(["Question", "Réponse", "Stats", "Actions"])
-        self.cards_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
-        self.cards_table.horizontalHeader().setSectionResizeMode(1, QHeaderView.Stretch)
-        self.cards_table.horizontalHeader().setSectionResizeMode(2, QHeaderView.ResizeToContents)
-        self.cards_table.horizontalHeader().setSectionResizeMode(3, QHeaderView.ResizeToContents)
+        # Actions groupées sur les cartes sélectionnées
+        bulk_layout = QHBoxLayout()
+        bulk_layout.setSpacing(10)
+
+        self.selection_label = QLabel()
+        set_role(self.selection_label, "info_label")
+        bulk_layout.addWidget(self.selection_label)
+        bulk_layout.addStretch()
+
+        self.move_selected_btn = QPushButton("Déplacer...")
+        self.move_selected_btn.clicked.connect(self.move_selected_cards)
+        bulk_layout.addWidget(self.move_selected_btn)
+
+        self.reset_selected_btn = QPushButton("Réinitialiser les stats")
+        self.reset_selected_btn.clicked.connect(self.reset_selected_cards)
+        bulk_layout.addWidget(self.reset_selected_btn)
+
+        self.delete_selected_btn = QPushButton("Supprimer la sélection")
+        self.delete_selected_btn.setObjectName("danger_button")
+        self.delete_selected_btn.clicked.connect(self.delete_selected_cards)
+        bulk_layout.addWidget(self.delete_selected_btn)
+
+        cards_layout.addLayout(bulk_layout)
+
+        # Tableau des cartes (question, réponse, stats, actions) : vue sur un modèle
+        # qui ne calcule que les lignes affichées, sans widget par ligne
+        self.card_model = CardTableModel(self.deck_manager, self.deck_id, self, self.parent.thumbnails)
+        self.cards_table = QTableView()
+        self.cards_table.setModel(self.card_model)
+        self.cards_table.setIconSize(QSize(CardTableModel.THUMBNAIL_SIZE, CardTableModel.THUMBNAIL_SIZE))
+
+        self.actions_delegate = CardActionsDelegate(self.cards_table)
+        self.actions_delegate.edit_requested.connect(self.edit_card)
+        self.actions_delegate.delete_requested.connect(self.delete_card)
+        self.cards_table.setItemDelegateForColumn(CardTableModel.ACTIONS_COLUMN, self.actions_delegate)
+
+        # Largeurs et hauteurs fixes : aucune ligne n'a besoin d'être mesurée
+        header = self.cards_table.horizontalHeader()
+        header.setSectionResizeMode(0, QHeaderView.Stretch)
+        header.setSectionResizeMode(1, QHeaderView.Stretch)
+        header.setSectionResizeMode(2, QHeaderView.Fixed)
+        header.setSectionResizeMode(3, QHeaderView.Fixed)
+        header.resizeSection(2, 150)
+        header.resizeSection(3, 190)
+        self.cards_table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.cards_table.verticalHeader().setDefaultSectionSize(36)
+        self.cards_table.verticalHeader().setVisible(False)
+        self.cards_table.setWordWrap(False)
+
         self.cards_table.setContextMenuPolicy(Qt.CustomContextMenu)
         self.cards_table.customContextMenuRequested.connect(self.show_context_menu)
-        self.cards_table.verticalHeader().setVisible(False)
+        self.cards_table.doubleClicked.connect(
+            lambda index: self.edit_card(index.data(Qt.UserRole))
+            if index.column() != CardTableModel.ACTIONS_COLUMN else None
+        )
         self.cards_table.setAlternatingRowColors(True)
+        # Sélection de plusieurs lignes (Ctrl/Maj + clic) pour les actions groupées
+        self.cards_table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.cards_table.setSelectionMode(QAbstractItemView.ExtendedSelection)
+        self.cards_table.selectionModel().selectionChanged.connect(self.update_selection_actions)
+        self.card_model.modelReset.connect(self.update_selection_actions)
 
         cards_layout.addWidget(self.cards_table)
         layout.addWidget(cards_frame, 1)  # Le "1" permet à ce widget de s'étendre
@@ -155,76 +204,109 @@ class DeckView(QWidget):
         self.edit_deck_btn.clicked.connect(self.edit_deck)
         self.delete_deck_btn.clicked.connect(self.delete_deck)
 
-        # Chargement initial des cartes
-        self.refresh_cards()
-
-    def refresh_cards(self):
-        """Rafraîchit la liste des cartes affichées dans le tableau."""
-        self.cards_table.setRowCount(0)
-        cards = self.deck_manager.get_cards(self.deck_id)
-
-        for i, card in enumerate(cards):
-            self.cards_table.insertRow(i)
-
-            # Colonne 1 : Question
-            front_item = QTableWidgetItem(card["front"])
-            self.cards_table.setItem(i, 0, front_item)
-
-            # Colonne 2 : Réponse
-            back_item = QTableWidgetItem(card["back"])
-            self.cards_table.setItem(i, 1, back_item)
-
-            # Colonne 3 : Statistiques de réussite
-            correct = card.get("correct_count", 0)
-            incorrect = card.get("incorrect_count", 0)
-            total = correct + incorrect
-
-            if total > 0:
-                success_rate = (correct / total) * 100
-                stats_text = f"{correct}/{total} ({success_rate:.1f}%)"
-            else:
-                stats_text = "Aucune donnée"
+        # Les cartes sont chargées par le modèle ; seuls l'en-tête et les boutons restent à mettre à jour
+        self.update_header()
+        self.update_selection_actions()
 
-            stats_item = QTableWidgetItem(stats_text)
-            self.cards_table.setItem(i, 2, stats_item)
+    def update_header(self):
+        """Met à jour le titre, la description et les statistiques de l'en-tête."""
+        self.title_label.setText(self.deck.name)
+        self.description_label.setText(self.deck.description)
+        self.description_label.setVisible(bool(self.deck.description))
 
-            # Colonne 4 : Boutons Modifier / Supprimer
-            actions_widget = QWidget()
-            actions_layout = QHBoxLayout(actions_widget)
-            actions_layout.setContentsMargins(0, 0, 0, 0)
-
-            edit_btn = QPushButton("Modifier")
-            edit_btn.clicked.connect(lambda _, card_id=card["id"]: self.edit_card(card_id))
-            actions_layout.addWidget(edit_btn)
+        stats = self.deck_manager.get_deck_stats(self.deck_id)
+        self.card_count_label.setText(f"{stats['total_cards']} cartes")
+        answered = stats["correct_answers"] + stats["incorrect_answers"] > 0
+        self.stats_label.setText(f"{stats['success_rate']:.1f}% de réussite" if answered else "")
+        self.stats_label.setVisible(answered)
+
+        if self.deck.last_studied:
+            last_studied = datetime.fromtimestamp(self.deck.last_studied).strftime("%d/%m/%Y %H:%M")
+            self.last_studied_label.setText(f"Dernière étude: {last_studied}")
+        self.last_studied_label.setVisible(bool(self.deck.last_studied))
+        self.update_study_button()
+
+    def refresh_view(self):
+        """
+        Remet la vue à jour quand elle est réaffichée depuis le cache : en-tête et tableau
+        des cartes sont relus sans reconstruire les widgets, et la position de défilement est conservée.
+        """
+        self.deck = self.deck_manager.get_deck(self.deck_id)
+        scroll_position = self.cards_table.verticalScrollBar().value()
+        self.card_model.refresh()
+        self.update_header()
+        self.update_selection_actions()
+        self.cards_table.verticalScrollBar().setValue(scroll_position)
 
-            delete_btn = QPushButton("Supprimer")
-            delete_btn.clicked.connect(lambda _, card_id=card["id"]: self.delete_card(card_id))
-            actions_layout.addWidget(delete_btn)
+    def refresh_cards(self):
+        """Relit toutes les cartes du deck dans le tableau (après une opération groupée ou une étude)."""
+        self.card_model.refresh()
+        self.update_header()
 
-            self.cards_table.setCellWidget(i, 3, actions_widget)
+    def select_card(self, card_id):
+        """
+        Sélectionne une carte dans le tableau et la fait défiler jusqu'à elle.
 
-            # Stockage de l'ID dans la première cellule
-            front_item.setData(Qt.UserRole, card["id"])
+        :param card_id: ID de la carte à sélectionner
+        """
+        row = self.card_model.row_of(card_id)
+        if row is None:
+            return
+        self.cards_table.selectRow(row)
+        self.cards_table.scrollTo(self.card_model.index(row, 0))
 
-        # Mise à jour de l'état du bouton d'étude
-        card_count = len(cards)
-        if card_count > 0:
+    def update_study_button(self):
+        """Met à jour l'état du bouton d'étude selon le nombre de cartes."""
+        if self.deck_manager.get_card_count(self.deck_id) > 0:
             self.study_btn.setEnabled(True)
             self.study_btn.setText("Étudier maintenant")
         else:
             self.study_btn.setEnabled(False)
             self.study_btn.setText("Ajoutez des cartes pour étudier")
 
+    def selected_card_ids(self):
+        """Retourne les identifiants des cartes sélectionnées dans le tableau."""
+        rows = sorted(index.row() for index in self.cards_table.selectionModel().selectedRows())
+        return [self.card_model.card_id(row) for row in rows]
+
+    def update_selection_actions(self):
+        """Active les actions groupées selon le nombre de cartes sélectionnées."""
+        count = len(self.cards_table.selectionModel().selectedRows())
+        self.selection_label.setText(f"{count} carte(s) sélectionnée(s)" if count else "")
+        self.delete_selected_btn.setEnabled(count > 0)
+        self.reset_selected_btn.setEnabled(count > 0)
+        # Le déplacement nécessite un autre deck de destination
+        self.move_selected_btn.setEnabled(count > 0 and len(self.deck_manager.get_decks()) > 1)
+
     def show_context_menu(self, position):
-        """Affiche le menu contextuel (clic droit) pour une carte."""
-        row = self.cards_table.rowAt(position.y())
-        if row < 0:
+        """Affiche le menu contextuel (clic droit) pour une carte ou pour la sélection."""
+        index = self.cards_table.indexAt(position)
+        if not index.isValid():
             return
 
-        card_id = self.cards_table.item(row, 0).data(Qt.UserRole)
+        card_id = self.card_model.card_id(index.row())
 
         menu = QMenu(self)
 
+        # Clic droit sur une sélection de plusieurs cartes : actions groupées
+        selected_ids = self.selected_card_ids()
+        if len(selected_ids) > 1 and card_id in selected_ids:
+            move_action = QAction(f"Déplacer {len(selected_ids)} cartes...", self)
+            move_action.setEnabled(self.move_selected_btn.isEnabled())
+            move_action.triggered.connect(self.move_selected_cards)
+            menu.addAction(move_action)
+
+            reset_action = QAction("Réinitialiser les stats", self)
+            reset_action.triggered.connect(self.reset_selected_cards)
+            menu.addAction(reset_action)
+
+            delete_action = QAction(f"Supprimer {len(selected_ids)} cartes", self)
+            delete_action.triggered.connect(self.delete_selected_cards)
+            menu.addAction(delete_action)
+
+            menu.exec_(QCursor.pos())
+            return
+
         edit_action = QAction("Modifier", self)
         edit_action.triggered.connect(lambda: self.edit_card(card_id))
         menu.addAction(edit_action)
@@ -237,7 +319,9 @@ class DeckView(QWidget):
 
     def edit_deck(self):
         """Ouvre la boîte de dialogue pour modifier le nom et la description du deck."""
-        dialog = DeckEditorDialog(self.parent, self.deck["name"], self.deck["description"])
+        from ui.deck_editor import DeckEditorDialog
+
+        dialog = DeckEditorDialog(self.parent, self.deck.name, self.deck.description)
         if dialog.exec_() == QDialog.Accepted:
             name = dialog.name_edit.text()
             description = dialog.description_edit.toPlainText()
@@ -245,34 +329,95 @@ class DeckView(QWidget):
             if name:
                 self.deck_manager.update_deck(self.deck_id, name, description)
                 self.deck = self.deck_manager.get_deck(self.deck_id)
-                self.title_label.setText(name)
-                self.parent.refresh_deck_list()
+                self.update_header()
+                self.parent.update_deck_item(self.deck_id)
 
     def delete_deck(self):
         """Supprime le deck après confirmation de l'utilisateur."""
         reply = QMessageBox.question(
             self,
             "Confirmation",
-            f"Êtes-vous sûr de vouloir supprimer le deck '{self.deck['name']}' et toutes ses cartes ?",
+            f"Êtes-vous sûr de vouloir supprimer le deck '{self.deck.name}' et toutes ses cartes ?",
             QMessageBox.Yes | QMessageBox.No,
             QMessageBox.No
         )
 
         if reply == QMessageBox.Yes:
             self.deck_manager.delete_deck(self.deck_id)
-            self.parent.refresh_deck_list()
+            self.parent.remove_deck_item(self.deck_id)
             self.parent.right_panel.setCurrentIndex(0)  # Retour à la vue d'accueil
+            self.parent.close_deck_views(self.deck_id)  # Détruit cette vue et la session d'étude éventuelle
 
     def add_card(self):
         """Ajoute une nouvelle carte au deck via une boîte de dialogue."""
+        from ui.card_editor import CardEditorDialog
+
         dialog = CardEditorDialog(self.parent)
         if dialog.exec_() == QDialog.Accepted:
             front = dialog.front_edit.toPlainText()
             back = dialog.back_edit.toPlainText()
 
             if front and back:
-                self.deck_manager.create_card(self.deck_id, front, back)
-                self.refresh_cards()
+                card_id = self.deck_manager.create_card(self.deck_id, front, back)
+                if card_id:
+                    self.add_images(card_id, dialog.image_paths)
+                    self.card_model.card_added(card_id)
+                    self.update_header()
+
+    def import_cards(self, path=None):
+        """
+        Importe des cartes depuis un fichier CSV/TSV, avec une barre de progression.
+
+        :param path: Chemin du fichier ; s'il est absent, il est demandé à l'utilisateur
+        """
+        if not path:
+            path, _ = QFileDialog.getOpenFileName(
+                self, "Importer des cartes", "",
+                "Fichiers CSV/TSV (*.csv *.tsv *.txt);;Tous les fichiers (*)"
+            )
+            if not path:
+                return
+
+        from ui.import_dialog import ImportDialog
+
+        dialog = ImportDialog(self.parent, path)
+        if dialog.exec_() != QDialog.Accepted:
+            return
+
+        progress_dialog = QProgressDialog("Import des cartes...", "Annuler", 0, 0, self)
+        progress_dialog.setWindowTitle("Import")
+        progress_dialog.setWindowModality(Qt.WindowModal)
+        progress_dialog.setMinimumDuration(500)
+
+        def report(rows_read):
+            progress_dialog.setValue(min(rows_read, progress_dialog.maximum()))
+            QApplication.processEvents()
+            return not progress_dialog.wasCanceled()
+
+        try:
+            # Le nombre de lignes du fichier sert de maximum à la barre de progression
+            progress_dialog.setMaximum(count_lines(path))
+            result = self.deck_manager.import_cards(
+                self.deck_id, read_card_rows(path, **dialog.options()), progress=report
+            )
+        except (OSError, UnicodeDecodeError, csv.Error) as e:
+            QMessageBox.warning(self, "Import impossible", f"Le fichier n'a pas pu être lu :\n{e}")
+            return
+        finally:
+            progress_dialog.close()
+
+        if result is None:
+            return
+
+        imported, skipped = result
+        message = f"{imported} carte(s) importée(s)."
+        if skipped:
+            message += f"\n{skipped} ligne(s) ignorée(s) (question ou réponse vide)."
+        QMessageBox.information(self, "Import terminé", message)
+
+        if imported:
+            self.refresh_cards()
+            self.parent.update_deck_item(self.deck_id)
 
     def edit_card(self, card_id):
         """Modifie une carte existante via une boîte de dialogue."""
@@ -280,14 +425,30 @@ class DeckView(QWidget):
         if not card:
             return
 
-        dialog = CardEditorDialog(self.parent, card["front"], card["back"])
+        from ui.card_editor import CardEditorDialog
+
+        dialog = CardEditorDialog(self.parent, card.front, card.back)
         if dialog.exec_() == QDialog.Accepted:
             front = dialog.front_edit.toPlainText()
             back = dialog.back_edit.toPlainText()
 
             if front and back:
                 self.deck_manager.update_card(self.deck_id, card_id, front, back)
-                self.refresh_cards()
+                self.add_images(card_id, dialog.image_paths)
+                self.card_model.card_changed(card_id)
+
+    def add_images(self, card_id, paths):
+        """
+        Ajoute à une carte les images choisies dans l'éditeur (copiées dans le magasin de médias).
+
+        :param card_id: ID de la carte
+        :param paths: Chemins des fichiers image
+        """
+        failed = [path for path in paths
+                  if not self.deck_manager.add_media_to_card(self.deck_id, card_id, "image", path)]
+        if failed:
+            QMessageBox.warning(self, "Image non ajoutée",
+                                "Ces fichiers n'ont pas pu être lus :\n" + "\n".join(failed))
 
     def delete_card(self, card_id):
         """Supprime une carte après confirmation."""
@@ -305,7 +466,86 @@ class DeckView(QWidget):
 
         if reply == QMessageBox.Yes:
             self.deck_manager.delete_card(self.deck_id, card_id)
+            self.card_model.card_removed(card_id)
+            self.update_header()
+
+    def delete_selected_cards(self):
+        """Supprime toutes les cartes sélectionnées après confirmation, en une seule écriture."""
+        card_ids = self.selected_card_ids()
+        if not card_ids:
+            return
+
+        reply = QMessageBox.question(
+            self,
+            "Confirmation",
+            f"Êtes-vous sûr de vouloir supprimer {len(card_ids)} carte(s) ?",
+            QMessageBox.Yes | QMessageBox.No,
+            QMessageBox.No
+        )
+
+        if reply == QMessageBox.Yes:
+            self.deck_manager.delete_cards(self.deck_id, card_ids)
             self.refresh_cards()
+            self.parent.update_deck_item(self.deck_id)
+
+    def move_selected_cards(self):
+        """Déplace les cartes sélectionnées vers un autre deck choisi par l'utilisateur."""
+        card_ids = self.selected_card_ids()
+        if not card_ids:
+            return
+
+        targets = [deck for deck in self.deck_manager.get_decks() if deck.id != self.deck_id]
+        if not targets:
+            return
+
+        # Les noms de decks ne sont pas uniques : les homonymes sont numérotés, et le deck
+        # choisi est retrouvé par la position de son libellé
+        labels = []
+        for deck in targets:
+            label, number = deck.name, 1
+            while label in labels:
+                number += 1
+                label = f"{deck.name} ({number})"
+            labels.append(label)
+
+        label, ok = QInputDialog.getItem(
+            self,
+            "Déplacer des cartes",
+            f"Déplacer {len(card_ids)} carte(s) vers le deck :",
+            labels,
+            0,
+            False
+        )
+        if not ok:
+            return
+
+        target = targets[labels.index(label)]
+        self.deck_manager.move_cards(self.deck_id, card_ids, target.id)
+        self.refresh_cards()
+        self.parent.update_deck_item(self.deck_id)
+        self.parent.update_deck_item(target.id)
+
+    def reset_selected_cards(self):
+        """Remet à zéro les statistiques et la planification des cartes sélectionnées."""
+        card_ids = self.selected_card_ids()
+        if not card_ids:
+            return
+
+        reply = QMessageBox.question(
+            self,
+            "Confirmation",
+            f"Réinitialiser les statistiques de {len(card_ids)} carte(s) ? "
+            "Elles seront de nouveau proposées comme des cartes nouvelles.",
+            QMessageBox.Yes | QMessageBox.No,
+            QMessageBox.No
+        )
+
+        if reply == QMessageBox.Yes:
+            self.deck_manager.reset_cards(self.deck_id, card_ids)
+            for card_id in card_ids:
+                self.card_model.card_changed(card_id)
+            self.update_header()
+            self.parent.update_deck_item(self.deck_id)
 
     def start_study(self):
         """Lance une session d'étude avec ce deck."""
@@ -0,0 +1,111 @@
+from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
+                             QComboBox, QSpinBox, QCheckBox, QFormLayout, QFrame)
+from ui.style import set_role  # Importation de la fonction pour appliquer des styles
+
+from models.importer import guess_delimiter
+
+# Séparateurs proposés : (libellé, caractère)
+DELIMITER_CHOICES = [
+    ("Virgule ( , )", ","),
+    ("Point-virgule ( ; )", ";"),
+    ("Tabulation", "\t"),
+    ("Barre verticale ( | )", "|"),
+]
+
+
+class ImportDialog(QDialog):
+    def __init__(self, parent=None, path=""):
+        """
+        Constructeur de la boîte de dialogue des options d'import d'un fichier CSV/TSV.
+
+        :param parent: Parent widget (par défaut None)
+        :param path: Chemin du fichier à importer (sert à deviner le séparateur)
+        """
+        super().__init__(parent)
+        self.path = path  # Fichier à importer
+        self.init_ui()    # Appel à la méthode pour initialiser l'interface
+
+    def init_ui(self):
+        """Initialise l'interface utilisateur de la boîte de dialogue d'import."""
+        self.setWindowTitle("Importer des cartes")  # Titre de la fenêtre
+        self.setMinimumWidth(450)  # Largeur minimale de la fenêtre
+
+        # Layout principal vertical pour l'organisation des widgets
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(20, 20, 20, 20)
+        layout.setSpacing(15)
+
+        # Titre de la boîte de dialogue
+        title_label = QLabel("Importer des cartes")
+        set_role(title_label, "header_label")
+        layout.addWidget(title_label)
+
+        # Instruction affichée sous le titre (nom du fichier)
+        instruction_label = QLabel(f"Choisissez comment lire le fichier :\n{self.path}")
+        instruction_label.setWordWrap(True)
+        set_role(instruction_label, "info_label")
+        layout.addWidget(instruction_label)
+
+        # Séparateur horizontal entre les sections
+        separator = QFrame()
+        separator.setFrameShape(QFrame.HLine)
+        set_role(separator, "separator")
+        layout.addWidget(separator)
+
+        # Formulaire des options
+        form_layout = QFormLayout()
+        form_layout.setSpacing(15)
+        form_layout.setContentsMargins(0, 10, 0, 10)
+
+        # Séparateur de colonnes, présélectionné d'après l'extension du fichier
+        self.delimiter_combo = QComboBox()
+        for label, delimiter in DELIMITER_CHOICES:
+            self.delimiter_combo.addItem(label, delimiter)
+        guessed = self.delimiter_combo.findData(guess_delimiter(self.path))
+        self.delimiter_combo.setCurrentIndex(max(guessed, 0))
+        form_layout.addRow(QLabel("Séparateur:"), self.delimiter_combo)
+
+        # Colonnes de la question et de la réponse (numérotées à partir de 1)
+        self.front_column_spin = QSpinBox()
+        self.front_column_spin.setRange(1, 99)
+        self.front_column_spin.setValue(1)
+        form_layout.addRow(QLabel("Colonne des questions:"), self.front_column_spin)
+
+        self.back_column_spin = QSpinBox()
+        self.back_column_spin.setRange(1, 99)
+        self.back_column_spin.setValue(2)
+        form_layout.addRow(QLabel("Colonne des réponses:"), self.back_column_spin)
+
+        # Ligne d'en-tête à ignorer
+        self.header_check = QCheckBox("La première ligne contient les titres des colonnes")
+        form_layout.addRow(self.header_check)
+
+        layout.addLayout(form_layout)
+
+        # Disposition des boutons d'annulation et d'import
+        buttons_layout = QHBoxLayout()
+        buttons_layout.setSpacing(10)
+
+        cancel_btn = QPushButton("Annuler")
+        cancel_btn.clicked.connect(self.reject)
+        buttons_layout.addWidget(cancel_btn)
+
+        import_btn = QPushButton("Importer")
+        import_btn.setObjectName("accent_button")
+        import_btn.clicked.connect(self.accept)
+        buttons_layout.addWidget(import_btn)
+
+        layout.addLayout(buttons_layout)
+
+    def options(self):
+        """
+        Retourne les options choisies, sous forme d'arguments pour read_card_rows.
+
+        :return: Dictionnaire (delimiter, front_column, back_column, skip_header)
+        """
+        return {
+            "delimiter": self.delimiter_combo.currentData(),
+            "front_column": self.front_column_spin.value() - 1,
+            "back_column": self.back_column_spin.value() - 1,
+            "skip_header": self.header_check.isChecked(),
+        }
@@ -1,23 +1,55 @@
 from PyQt5.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
-                             QLabel, QPushButton, QListWidget, QStackedWidget,
-                             QLineEdit, QDialog, QFrame, QSplitter)
-from PyQt5.QtCore import Qt
-from PyQt5.QtGui import QFont
-
-# Importation des vues internes
-from ui.deck_view import DeckView
-from ui.study_view import StudyView
-from ui.deck_editor import DeckEditorDialog
-from ui.style import get_style
+                             QLabel, QPushButton, QListView, QStackedWidget,
+                             QLineEdit, QDialog, QFrame, QSplitter, QShortcut, QApplication)
+from PyQt5.QtCore import Qt, QSortFilterProxyModel, pyqtSignal
+from PyQt5.QtGui import QFont, QKeySequence
+import threading
+import time
+
+# Les vues et les boîtes de dialogue (DeckView, StudyView, StatsView, éditeurs, recherche)
+# sont importées à leur première ouverture : le démarrage n'attend pas leurs modules (NumPy...)
+from ui.deck_list_model import DeckListModel, DeckItemDelegate
+from ui.view_cache import ViewCache
+from ui.thumbnails import ThumbnailCache
+from ui.style import set_role, set_theme, current_theme
 
 # Définition de la fenêtre principale de l'application
 class MainWindow(QMainWindow):
-    def __init__(self, deck_manager):
+    """
+    Fenêtre principale : liste des decks à gauche, vue d'accueil, de deck, d'étude ou de statistiques à droite.
+
+    Si le gestionnaire de decks n'a pas encore chargé les decks (DeckManager créé avec load=False),
+    la fenêtre s'affiche aussitôt et les decks sont chargés dans un thread de travail : la liste
+    se remplit dès qu'ils sont arrivés, et les actions qui en ont besoin restent désactivées jusque-là.
+    """
+
+    decks_ready = pyqtSignal()       # Émis (dans le thread de l'interface) quand la liste des decks est remplie
+
+    # Émis depuis le thread de chargement : transmis au thread de l'interface (connexion en file d'attente)
+    loading_finished = pyqtSignal()
+
+    def __init__(self, deck_manager, max_cached_views=8):
+        """
+        Constructeur de la fenêtre principale.
+
+        :param deck_manager: Objet qui gère les decks et les cartes (chargé ou non)
+        :param max_cached_views: Nombre maximal de vues de decks et d'étude gardées en mémoire
+        """
         super().__init__()
         self.deck_manager = deck_manager  # Gestionnaire de decks (base de données)
         self.current_deck_id = None       # Identifiant du deck actuellement sélectionné
+        self.quick_open_dialog = None     # Palette d'ouverture rapide, créée au premier usage
+        self.max_cached_views = max_cached_views
+        # Miniatures des images des cartes, partagées par toutes les vues
+        self.thumbnails = ThumbnailCache(deck_manager.media_store, parent=self)
+        self.loader = None                # Thread de chargement des decks
+        self.loading_time = None          # Durée du chargement en arrière-plan, en secondes
         self.init_ui()                    # Initialisation de l'interface graphique
 
+        self.loading_finished.connect(self.on_loading_finished)
+        if not deck_manager.loaded:
+            self.start_loading()
+
     def init_ui(self):
         """Initialise l'interface utilisateur principale."""
         self.setWindowTitle("FlashMaster")        # Titre de la fenêtre
@@ -48,23 +80,42 @@ class MainWindow(QMainWindow):
 
         # Titre de la section
         deck_header = QLabel("Mes Decks")
-        deck_header.setStyleSheet(get_style("header_label"))
+        set_role(deck_header, "header_label")
         left_layout.addWidget(deck_header)
 
         # Barre de recherche
         search_layout = QHBoxLayout()
         self.search_edit = QLineEdit()
         self.search_edit.setPlaceholderText("Rechercher un deck...")
+        self.search_edit.setToolTip("Ctrl+P : ouverture rapide d'un deck ou d'une carte, même mal orthographié")
         self.search_edit.textChanged.connect(self.filter_decks)  # Filtrage dynamique
         search_layout.addWidget(self.search_edit)
         left_layout.addLayout(search_layout)
 
+        # Recherche dans le texte des cartes de tous les decks (aussi accessible par Ctrl+F)
+        self.search_cards_btn = QPushButton("Rechercher dans les cartes...")
+        self.search_cards_btn.clicked.connect(self.search_cards)
+        left_layout.addWidget(self.search_cards_btn)
+
+        # Tableau de bord des statistiques de tous les decks
+        self.stats_btn = QPushButton("Statistiques")
+        self.stats_btn.clicked.connect(lambda: self.show_stats_view())
+        left_layout.addWidget(self.stats_btn)
+
+        # Passage du thème clair au thème sombre, sans recréer les vues
+        self.theme_btn = QPushButton()
+        self.theme_btn.clicked.connect(self.toggle_theme)
+        self.update_theme_button()
+        left_layout.addWidget(self.theme_btn)
+        QShortcut(QKeySequence.Find, self, activated=self.search_cards)
+        QShortcut(QKeySequence("Ctrl+P"), self, activated=self.quick_open)
+
         # Bouton pour créer un nouveau deck
         deck_actions = QWidget()
         deck_actions_layout = QHBoxLayout(deck_actions)
         deck_actions_layout.setContentsMargins(0, 0, 0, 0)
         self.add_deck_btn = QPushButton("+ Nouveau Deck")
-        self.add_deck_btn.setStyleSheet(get_style("action_button"))
+        set_role(self.add_deck_btn, "action_button")
         self.add_deck_btn.clicked.connect(self.add_deck)
         deck_actions_layout.addWidget(self.add_deck_btn)
         left_layout.addWidget(deck_actions)
@@ -72,19 +123,36 @@ class MainWindow(QMainWindow):
         # Ligne de séparation esthétique
         separator = QFrame()
         separator.setFrameShape(QFrame.HLine)
-        separator.setStyleSheet(get_style("separator"))
+        set_role(separator, "separator")
         left_layout.addWidget(separator)
 
-        # Liste des decks disponibles
-        self.deck_list = QListWidget()
-        self.deck_list.itemClicked.connect(self.on_deck_selected)  # Sélection d'un deck
+        # Liste des decks disponibles : modèle tenu à jour ligne par ligne,
+        # filtré par la barre de recherche et dessiné par un délégué
+        self.deck_model = DeckListModel(self.deck_manager, self)
+        self.deck_filter = QSortFilterProxyModel(self)
+        self.deck_filter.setSourceModel(self.deck_model)
+        self.deck_filter.setFilterCaseSensitivity(Qt.CaseInsensitive)
+
+        self.deck_list = QListView()
+        self.deck_list.setModel(self.deck_filter)
+        self.deck_list.setItemDelegate(DeckItemDelegate(self.deck_list))
+        self.deck_list.setUniformItemSizes(True)  # Toutes les lignes ont la même hauteur
+        self.deck_list.clicked.connect(self.on_deck_selected)  # Sélection d'un deck
         self.deck_list.setAlternatingRowColors(True)
         left_layout.addWidget(self.deck_list, 1)  # Occupe l'espace restant
 
+        # Indication affichée pendant le chargement des decks en arrière-plan
+        self.loading_label = QLabel("Chargement des decks...")
+        set_role(self.loading_label, "info_label")
+        self.loading_label.setVisible(not self.deck_manager.loaded)
+        left_layout.addWidget(self.loading_label)
+
         # ------------ PANNEAU DROIT : Contenu principal ------------
 
         # Stack de widgets pour alterner entre vue d'accueil, vue deck, vue étude
         self.right_panel = QStackedWidget()
+        # Vues des decks et d'étude déjà ouvertes, les moins récentes sont détruites
+        self.view_cache = ViewCache(self.right_panel, self.max_cached_views)
 
         # Création de la page d'accueil par défaut
         home_page = QFrame()
@@ -98,12 +166,12 @@ class MainWindow(QMainWindow):
         logo_label.setAlignment(Qt.AlignCenter)
         logo_font = QFont("Arial", 32, QFont.Bold)
         logo_label.setFont(logo_font)
-        logo_label.setStyleSheet("color: #3498db;")
+        set_role(logo_label, "logo")
         home_layout.addWidget(logo_label)
 
         # Slogan
         welcome_label = QLabel("Améliorez votre mémoire avec des flashcards")
-        welcome_label.setStyleSheet(get_style("header_label"))
+        set_role(welcome_label, "header_label")
         welcome_label.setAlignment(Qt.AlignCenter)
         home_layout.addWidget(welcome_label)
 
@@ -122,12 +190,18 @@ class MainWindow(QMainWindow):
         # Bouton de création de deck depuis l'accueil
         start_btn = QPushButton("+ Créer mon premier deck")
         start_btn.setMinimumHeight(50)
-        start_btn.setStyleSheet(get_style("action_button"))
+        set_role(start_btn, "action_button")
         start_btn.clicked.connect(self.add_deck)
         home_layout.addWidget(start_btn)
 
+        # Actions qui ont besoin des decks, désactivées tant qu'ils ne sont pas chargés
+        self.data_actions = [self.search_cards_btn, self.stats_btn, self.add_deck_btn, start_btn]
+        for action in self.data_actions:
+            action.setEnabled(self.deck_manager.loaded)
+
         # Étirement final pour équilibrer la mise en page
         home_layout.addStretch()
+        self.home_page = home_page
         self.right_panel.addWidget(home_page)
 
         # Ajout des panneaux gauche et droit dans le splitter
@@ -139,48 +213,108 @@ class MainWindow(QMainWindow):
         # Ajout du splitter dans le layout principal
         main_layout.addWidget(splitter)
 
-        # Chargement initial des decks
-        self.refresh_deck_list()
+    def start_loading(self):
+        """Charge les decks dans un thread de travail ; la fenêtre reste utilisable pendant ce temps."""
+        self.loader = threading.Thread(target=self._load_decks, name="flashmaster-loader")
+        self.loader.start()
+
+    def _load_decks(self):
+        """Chargement des decks, exécuté dans le thread de chargement."""
+        start = time.perf_counter()
+        try:
+            self.deck_manager.load_decks()
+        except Exception as e:
+            print(f"Erreur lors du chargement des decks: {e}")
+        self.loading_time = time.perf_counter() - start
+        self.loading_finished.emit()
+
+    def on_loading_finished(self):
+        """Remplit la liste des decks chargés et active les actions qui en ont besoin."""
+        self.loader = None
+        self.deck_model.refresh()
+        self.loading_label.setVisible(False)
+        for action in self.data_actions:
+            action.setEnabled(True)
+        self.decks_ready.emit()
 
     def refresh_deck_list(self):
-        """Rafraîchit la liste des decks avec un formatage amélioré."""
-        self.deck_list.clear()
-        decks = self.deck_manager.get_decks()
-
-        for deck in decks:
-            deck_name = deck["name"]
-            card_count = self.deck_manager.get_card_count(deck["id"])
-            stats = self.deck_manager.get_deck_stats(deck["id"])
-
-            # Par défaut, nom + nombre de cartes
-            item_widget = QLabel(f"<b>{deck_name}</b><br/>"
-                                 f"<span style='color: #7f8c8d;'>{card_count} cartes")
-
-            # Ajout du taux de réussite si dispo
-            if stats and stats["correct_answers"] + stats["incorrect_answers"] > 0:
-                success_rate = stats["success_rate"]
-                item_widget.setText(f"<b>{deck_name}</b><br/>"
-                                    f"<span style='color: #7f8c8d;'>{card_count} cartes • "
-                                    f"{success_rate:.1f}% de réussite</span>")
-
-            # Ajout à la liste graphique
-            list_item = deck_name
-            self.deck_list.addItem(list_item)
-            item = self.deck_list.item(self.deck_list.count() - 1)
-            item.setData(Qt.UserRole, deck["id"])  # Stocke l'ID du deck
+        """Relit toute la liste des decks (les résumés suffisent : aucune carte n'est chargée)."""
+        self.deck_model.refresh()
+
+    def update_deck_item(self, deck_id):
+        """Redessine la ligne d'un deck dont le nom ou les statistiques ont changé."""
+        self.deck_model.deck_changed(deck_id)
+
+    def remove_deck_item(self, deck_id):
+        """Retire de la liste la ligne d'un deck supprimé."""
+        self.deck_model.deck_removed(deck_id)
 
     def filter_decks(self, text):
         """Filtre la liste des decks selon le texte de recherche."""
-        text = text.lower()
-        for i in range(self.deck_list.count()):
-            item = self.deck_list.item(i)
-            if text in item.text().lower():
-                item.setHidden(False)
-            else:
-                item.setHidden(True)
+        self.deck_filter.setFilterFixedString(text)
+
+    def select_deck(self, deck_id):
+        """
+        Sélectionne un deck dans la liste et affiche sa vue.
+
+        :param deck_id: ID du deck à sélectionner
+        """
+        index = self.deck_filter.mapFromSource(self.deck_model.index_of(deck_id))
+        if index.isValid():
+            self.deck_list.setCurrentIndex(index)
+            self.deck_list.scrollTo(index)
+        self.show_deck(deck_id)
+
+    def search_cards(self):
+        """Ouvre la recherche plein texte dans les cartes de tous les decks."""
+        if not self.deck_manager.loaded:
+            return
+        from ui.search_dialog import SearchDialog
+
+        dialog = SearchDialog(self, self.deck_manager)
+        dialog.card_selected.connect(self.show_card)
+        dialog.exec_()
+
+    def quick_open(self):
+        """Ouvre la palette de recherche approximative des decks et des cartes."""
+        if not self.deck_manager.loaded:
+            return
+        if self.quick_open_dialog is None:
+            from ui.quick_open import QuickOpenDialog
+
+            self.quick_open_dialog = QuickOpenDialog(self, self.deck_manager)
+            self.quick_open_dialog.deck_selected.connect(self.select_deck)
+            self.quick_open_dialog.card_selected.connect(self.show_card)
+        self.quick_open_dialog.open_palette()
+
+    def closeEvent(self, event):
+        """
+        Arrête le thread de la palette d'ouverture rapide et le pool des miniatures avant la fermeture,
+        après la fin du chargement des decks s'il est encore en cours.
+        """
+        if self.loader is not None:
+            self.loader.join()
+        if self.quick_open_dialog is not None:
+            self.quick_open_dialog.stop_worker()
+        self.thumbnails.shutdown()
+        super().closeEvent(event)
+
+    def show_card(self, deck_id, card_id):
+        """
+        Affiche le deck d'une carte et sélectionne la carte dans son tableau.
+
+        :param deck_id: ID du deck contenant la carte
+        :param card_id: ID de la carte
+        """
+        self.select_deck(deck_id)
+        deck_view = self.view_cache.get(("deck", deck_id))
+        if deck_view is not None:
+            deck_view.select_card(card_id)
 
     def add_deck(self):
         """Ajoute un nouveau deck avec interface améliorée."""
+        from ui.deck_editor import DeckEditorDialog
+
         dialog = DeckEditorDialog(self)
         if dialog.exec_() == QDialog.Accepted:
             name = dialog.name_edit.text()
@@ -188,49 +322,83 @@ class MainWindow(QMainWindow):
 
             if name:
                 deck_id = self.deck_manager.create_deck(name, description)
-                self.refresh_deck_list()
+                self.deck_model.deck_added(deck_id)
 
                 # Sélection du deck fraîchement créé
-                for i in range(self.deck_list.count()):
-                    item = self.deck_list.item(i)
-                    if item.data(Qt.UserRole) == deck_id:
-                        self.deck_list.setCurrentItem(item)
-                        self.on_deck_selected(item)
-                        break
-
-    def on_deck_selected(self, item):
+                self.select_deck(deck_id)
+
+    def on_deck_selected(self, index):
         """Gère la sélection d'un deck dans la liste avec une transition fluide."""
-        deck_id = item.data(Qt.UserRole)
+        self.show_deck(index.data(Qt.UserRole))
+
+    def show_deck(self, deck_id):
+        """
+        Affiche la vue d'un deck : la vue en cache est remise à jour, sinon elle est créée.
+
+        :param deck_id: ID du deck à afficher
+        """
         self.current_deck_id = deck_id
-        deck = self.deck_manager.get_deck(deck_id)
-
-        # Vérifie si la vue du deck existe déjà
-        deck_view = None
-        for i in range(self.right_panel.count()):
-            widget = self.right_panel.widget(i)
-            if isinstance(widget, DeckView) and widget.deck_id == deck_id:
-                deck_view = widget
-                self.right_panel.setCurrentWidget(deck_view)
-                break
-
-        # Sinon, crée la vue et l'ajoute
-        if not deck_view:
-            deck_view = DeckView(self, self.deck_manager, deck)
-            self.right_panel.addWidget(deck_view)
-            self.right_panel.setCurrentWidget(deck_view)
+        key = ("deck", deck_id)
+        deck_view = self.view_cache.get(key)
+        if deck_view is not None:
+            deck_view.refresh_view()
+        else:
+            from ui.deck_view import DeckView
+
+            deck_view = DeckView(self, self.deck_manager, self.deck_manager.get_deck(deck_id))
+        self.view_cache.show(key, deck_view)
 
     def show_study_view(self, deck_id):
-        """Affiche la vue d'étude pour un deck avec transition améliorée."""
-        study_view = None
-        for i in range(self.right_panel.count()):
-            widget = self.right_panel.widget(i)
-            if isinstance(widget, StudyView) and widget.deck_id == deck_id:
-                study_view = widget
-                self.right_panel.setCurrentWidget(study_view)
-                break
-
-        # Si elle n'existe pas, on la crée
-        if not study_view:
+        """Affiche la vue d'étude d'un deck, en reprenant la session en cours s'il y en a une."""
+        key = ("study", deck_id)
+        study_view = self.view_cache.get(key)
+        if study_view is None:
+            from ui.study_view import StudyView
+
             study_view = StudyView(self, self.deck_manager, deck_id)
-            self.right_panel.addWidget(study_view)
-            self.right_panel.setCurrentWidget(study_view)
\ No newline at end of file
+        self.view_cache.show(key, study_view)
+
+    def show_stats_view(self, deck_id=None):
+        """
+        Affiche le tableau de bord des statistiques d'un deck ou de tous les decks, recalculé.
+
+        :param deck_id: ID du deck analysé (None pour tous les decks)
+        """
+        key = ("stats", deck_id)
+        stats_view = self.view_cache.get(key)
+        if stats_view is not None:
+            stats_view.refresh_view()
+        else:
+            from ui.stats_view import StatsView
+
+            stats_view = StatsView(self, self.deck_manager, deck_id)
+        self.view_cache.show(key, stats_view)
+
+    def show_home(self):
+        """Affiche la page d'accueil."""
+        self.right_panel.setCurrentWidget(self.home_page)
+
+    def toggle_theme(self):
+        """Passe du thème clair au thème sombre (ou l'inverse) : les vues ouvertes sont restylées, pas recréées."""
+        set_theme(QApplication.instance(), "light" if current_theme() == "dark" else "dark")
+        self.update_theme_button()
+
+    def update_theme_button(self):
+        """Met à jour le texte du bouton de thème selon le thème actif."""
+        self.theme_btn.setText("Thème clair" if current_theme() == "dark" else "Thème sombre")
+
+    def close_study_view(self, deck_id):
+        """
+        Termine la session d'étude d'un deck et revient à la vue du deck, remise à jour.
+
+        :param deck_id: ID du deck étudié
+        """
+        self.show_deck(deck_id)
+        self.update_deck_item(deck_id)  # Statistiques du deck dans la liste
+        self.view_cache.remove(("study", deck_id))
+
+    def close_deck_views(self, deck_id):
+        """Détruit les vues d'un deck supprimé."""
+        if self.current_deck_id == deck_id:
+            self.current_deck_id = None
+        self.view_cache.remove_deck(deck_id)
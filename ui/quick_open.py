@@ -0,0 +1,226 @@
+from PyQt5.QtWidgets import QDialog, QVBoxLayout, QLabel, QLineEdit, QListWidget, QListWidgetItem
+from PyQt5.QtCore import Qt, QObject, QThread, QTimer, QEvent, pyqtSignal
+from ui.style import set_role  # Importation de la fonction pour appliquer des styles
+
+
+class FuzzySearchWorker(QObject):
+    """
+    Travailleur exécuté dans un thread à part : charge l'index trigramme et répond aux recherches,
+    pour que la saisie dans la palette ne soit jamais ralentie.
+    """
+
+    index_loaded = pyqtSignal()
+    results_ready = pyqtSignal(int, list)  # (numéro de la requête, résultats de TrigramIndex.search)
+
+    def __init__(self):
+        super().__init__()
+        self.latest_request = 0  # Numéro de la dernière requête envoyée par l'interface
+
+    def load(self, index):
+        """Charge les entrées en attente de l'index ; s'arrête si le thread doit se terminer."""
+        if index.load_pending(QThread.currentThread().isInterruptionRequested):
+            self.index_loaded.emit()
+
+    def search(self, index, request, query, limit):
+        """Exécute une recherche, sauf si une requête plus récente a déjà été envoyée."""
+        if request < self.latest_request:
+            return
+        self.results_ready.emit(request, index.search(query, limit))
+
+
+class QuickOpenDialog(QDialog):
+    """
+    Palette d'ouverture rapide : recherche approximative, tolérante aux fautes de frappe,
+    dans les noms de decks et le recto des cartes.
+
+    Les recherches partent après une courte pause dans la saisie et s'exécutent dans un thread
+    de travail ; seuls les résultats de la dernière requête sont affichés.
+    """
+
+    deck_selected = pyqtSignal(str)
+    card_selected = pyqtSignal(str, str)  # (id du deck, id de la carte)
+
+    # Signaux vers le travailleur (connexions en file d'attente : exécutés dans son thread)
+    load_requested = pyqtSignal(object)
+    search_requested = pyqtSignal(object, int, str, int)
+
+    MAX_RESULTS = 20
+    SEARCH_DELAY_MS = 120  # Délai après la dernière frappe avant de lancer la recherche
+
+    def __init__(self, parent, deck_manager):
+        """
+        Constructeur de la palette d'ouverture rapide.
+
+        :param parent: Parent widget (la fenêtre principale)
+        :param deck_manager: Objet qui gère les decks et les cartes
+        """
+        super().__init__(parent)
+        self.deck_manager = deck_manager
+        self.index = None      # TrigramIndex du DeckManager, obtenu à l'ouverture
+        self.request = 0       # Numéro de la dernière requête envoyée
+        self.shown_request = 0  # Numéro de la requête dont les résultats sont affichés
+        self.open_when_ready = False  # Entrée pressée avant l'arrivée des résultats
+
+        # Thread de travail, gardé d'une ouverture à l'autre
+        self.worker_thread = QThread(self)
+        self.worker = FuzzySearchWorker()
+        self.worker.moveToThread(self.worker_thread)
+        self.worker_thread.finished.connect(self.worker.deleteLater)
+        self.load_requested.connect(self.worker.load)
+        self.search_requested.connect(self.worker.search)
+        self.worker.index_loaded.connect(self.on_index_loaded)
+        self.worker.results_ready.connect(self.show_results)
+        self.worker_thread.start()
+
+        # Minuterie de la recherche : relancée à chaque frappe
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(self.SEARCH_DELAY_MS)
+        self.search_timer.timeout.connect(self.request_search)
+
+        self.init_ui()  # Appel à la méthode pour initialiser l'interface
+
+    def init_ui(self):
+        """Initialise l'interface utilisateur de la palette."""
+        self.setWindowTitle("Ouverture rapide")  # Titre de la fenêtre
+        self.setMinimumSize(550, 400)  # Taille minimale de la fenêtre
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(15, 15, 15, 15)
+        layout.setSpacing(10)
+
+        # Champ de saisie ; les flèches déplacent la sélection dans les résultats
+        self.query_edit = QLineEdit()
+        self.query_edit.setPlaceholderText("Nom d'un deck ou début d'une question...")
+        self.query_edit.textChanged.connect(self.search_timer.start)
+        self.query_edit.returnPressed.connect(self.open_current_result)
+        self.query_edit.installEventFilter(self)
+        layout.addWidget(self.query_edit)
+
+        # État de l'index et nombre de résultats
+        self.status_label = QLabel("")
+        set_role(self.status_label, "info_label")
+        layout.addWidget(self.status_label)
+
+        # Résultats, du plus proche au moins proche
+        self.results_list = QListWidget()
+        self.results_list.setAlternatingRowColors(True)
+        self.results_list.itemActivated.connect(self.open_result)
+        layout.addWidget(self.results_list, 1)
+
+    def open_palette(self):
+        """Vide la palette, prépare l'index si nécessaire, puis l'affiche."""
+        self.query_edit.clear()
+        self.results_list.clear()
+        self.open_when_ready = False
+
+        index = self.deck_manager.fuzzy_index()
+        if index is not self.index:
+            # Nouvel index (première ouverture ou decks rechargés) : chargement dans le thread
+            self.index = index
+            if not index.ready:
+                self.load_requested.emit(index)
+        self.status_label.setText("" if index.ready else "Indexation des cartes...")
+
+        self.query_edit.setFocus()
+        return self.exec_()
+
+    def eventFilter(self, watched, event):
+        if watched is self.query_edit and event.type() == QEvent.KeyPress:
+            if event.key() in (Qt.Key_Down, Qt.Key_Up):
+                step = 1 if event.key() == Qt.Key_Down else -1
+                row = self.results_list.currentRow() + step
+                if 0 <= row < self.results_list.count():
+                    self.results_list.setCurrentRow(row)
+                return True
+        return super().eventFilter(watched, event)
+
+    def request_search(self):
+        """Envoie la requête saisie au thread de travail."""
+        self.search_timer.stop()
+        query = self.query_edit.text()
+        self.request += 1
+        self.worker.latest_request = self.request
+        if not query.strip() or self.index is None:
+            self.results_list.clear()
+            return
+        self.search_requested.emit(self.index, self.request, query, self.MAX_RESULTS)
+
+    def on_index_loaded(self):
+        """Relance la recherche en cours une fois toutes les cartes indexées."""
+        self.status_label.setText("")
+        if self.isVisible() and self.query_edit.text().strip():
+            self.request_search()
+
+    def show_results(self, request, results):
+        """
+        Affiche les résultats d'une recherche, s'ils correspondent à la dernière requête.
+
+        :param request: Numéro de la requête
+        :param results: Liste de tuples (clé, texte, donnée, score)
+        """
+        if request != self.request:
+            return
+
+        self.shown_request = request
+        self.results_list.clear()
+        for key, text, deck_id, score in results:
+            if key[0] == "deck":
+                deck = self.deck_manager.get_deck(key[1])
+                if deck is None:
+                    continue
+                label = f"Deck : {deck.name}"
+            else:
+                deck = self.deck_manager.get_deck(deck_id)
+                if deck is None:
+                    continue
+                label = f"{text}  —  {deck.name}"
+            item = QListWidgetItem(label)
+            item.setData(Qt.UserRole, (key, deck_id))
+            self.results_list.addItem(item)
+
+        if self.results_list.count():
+            self.results_list.setCurrentRow(0)
+        if self.index is not None and not self.index.ready:
+            self.status_label.setText("Indexation des cartes... (résultats partiels)")
+        elif not self.results_list.count():
+            self.status_label.setText("Aucun résultat")
+        else:
+            self.status_label.setText("")
+
+        if self.open_when_ready:
+            self.open_when_ready = False
+            self.open_current_result()
+
+    def open_current_result(self):
+        """
+        Ouvre le résultat sélectionné ; si la recherche de la saisie actuelle n'a pas encore
+        répondu, le premier résultat sera ouvert à son arrivée.
+        """
+        if self.search_timer.isActive():
+            self.request_search()
+        if self.shown_request != self.request and self.query_edit.text().strip():
+            self.open_when_ready = True
+            return
+        item = self.results_list.currentItem()
+        if item is not None:
+            self.open_result(item)
+
+    def open_result(self, item):
+        """
+        Signale le deck ou la carte choisi puis ferme la palette.
+
+        :param item: Élément de la liste des résultats
+        """
+        key, deck_id = item.data(Qt.UserRole)
+        self.accept()
+        if key[0] == "deck":
+            self.deck_selected.emit(key[1])
+        else:
+            self.card_selected.emit(deck_id, key[1])
+
+    def stop_worker(self):
+        """Arrête le thread de travail (à la fermeture de la fenêtre principale)."""
+        self.worker_thread.requestInterruption()
+        self.worker_thread.quit()
+        self.worker_thread.wait()
@@ -0,0 +1,127 @@
+from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
+                             QLineEdit, QListWidget, QListWidgetItem)
+from PyQt5.QtCore import Qt, QTimer, pyqtSignal
+from ui.style import set_role  # Importation de la fonction pour appliquer des styles
+
+
+class SearchDialog(QDialog):
+    """
+    Boîte de dialogue de recherche plein texte dans les cartes de tous les decks.
+    """
+
+    # Émis avec (id du deck, id de la carte) quand l'utilisateur ouvre un résultat
+    card_selected = pyqtSignal(str, str)
+
+    MAX_RESULTS = 100
+    SEARCH_DELAY_MS = 150  # Délai après la dernière frappe avant de lancer la recherche
+
+    def __init__(self, parent, deck_manager):
+        """
+        Constructeur de la boîte de dialogue de recherche.
+
+        :param parent: Parent widget (la fenêtre principale)
+        :param deck_manager: Objet qui gère les decks et les cartes
+        """
+        super().__init__(parent)
+        self.deck_manager = deck_manager
+
+        # Minuterie de la recherche : relancée à chaque frappe, la recherche ne part
+        # que lorsque l'utilisateur marque une pause
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(self.SEARCH_DELAY_MS)
+        self.search_timer.timeout.connect(self.run_search)
+
+        self.init_ui()  # Appel à la méthode pour initialiser l'interface
+
+    def init_ui(self):
+        """Initialise l'interface utilisateur de la boîte de dialogue de recherche."""
+        self.setWindowTitle("Rechercher dans les cartes")  # Titre de la fenêtre
+        self.setMinimumSize(600, 450)  # Taille minimale de la fenêtre
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(20, 20, 20, 20)
+        layout.setSpacing(15)
+
+        # Titre de la boîte de dialogue
+        title_label = QLabel("Rechercher dans les cartes")
+        set_role(title_label, "header_label")
+        layout.addWidget(title_label)
+
+        # Champ de recherche
+        self.query_edit = QLineEdit()
+        self.query_edit.setPlaceholderText("Mots de la question ou de la réponse (accents facultatifs)...")
+        self.query_edit.textChanged.connect(self.search_timer.start)
+        self.query_edit.returnPressed.connect(self.open_current_result)
+        layout.addWidget(self.query_edit)
+
+        # Nombre de résultats
+        self.status_label = QLabel("")
+        set_role(self.status_label, "info_label")
+        layout.addWidget(self.status_label)
+
+        # Liste des résultats, du plus pertinent au moins pertinent
+        self.results_list = QListWidget()
+        self.results_list.setAlternatingRowColors(True)
+        self.results_list.setWordWrap(True)
+        self.results_list.itemActivated.connect(self.open_result)
+        layout.addWidget(self.results_list, 1)
+
+        # Boutons de fermeture et d'ouverture du résultat sélectionné
+        buttons_layout = QHBoxLayout()
+        buttons_layout.setSpacing(10)
+
+        close_btn = QPushButton("Fermer")
+        close_btn.clicked.connect(self.reject)
+        buttons_layout.addWidget(close_btn)
+
+        open_btn = QPushButton("Ouvrir la carte")
+        open_btn.setObjectName("accent_button")
+        open_btn.clicked.connect(self.open_current_result)
+        buttons_layout.addWidget(open_btn)
+
+        layout.addLayout(buttons_layout)
+
+    def run_search(self):
+        """Lance la recherche sur le texte saisi et affiche les résultats."""
+        self.search_timer.stop()
+        self.results_list.clear()
+
+        query = self.query_edit.text()
+        if not query.strip():
+            self.status_label.setText("")
+            return
+
+        results = self.deck_manager.search_cards(query, self.MAX_RESULTS)
+        for result in results:
+            item = QListWidgetItem(f"{result['front']}\n{result['deck_name']} • {result['back']}")
+            item.setData(Qt.UserRole, (result["deck_id"], result["card_id"]))
+            self.results_list.addItem(item)
+
+        if not results:
+            self.status_label.setText("Aucune carte trouvée")
+        elif len(results) >= self.MAX_RESULTS:
+            self.status_label.setText(f"{self.MAX_RESULTS} premiers résultats")
+        else:
+            self.status_label.setText(f"{len(results)} carte(s) trouvée(s)")
+
+        if results:
+            self.results_list.setCurrentRow(0)
+
+    def open_current_result(self):
+        """Ouvre le résultat sélectionné (ou lance la recherche si elle est en attente)."""
+        if self.search_timer.isActive():
+            self.run_search()
+        item = self.results_list.currentItem()
+        if item is not None:
+            self.open_result(item)
+
+    def open_result(self, item):
+        """
+        Signale la carte choisie puis ferme la boîte de dialogue.
+
+        :param item: Élément de la liste des résultats
+        """
+        deck_id, card_id = item.data(Qt.UserRole)
+        self.card_selected.emit(deck_id, card_id)
+        self.accept()
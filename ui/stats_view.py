@@ -0,0 +1,384 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QGridLayout, QLabel, QPushButton,
+                             QComboBox, QFrame, QScrollArea, QTableWidget, QTableWidgetItem,
+                             QHeaderView, QAbstractItemView, QSizePolicy)
+from PyQt5.QtCore import Qt, QRectF, QPointF, pyqtSignal
+from PyQt5.QtGui import QPainter, QColor, QPen, QPolygonF
+
+from models.analytics import compute_review_stats, day_to_date, DURATION_EDGES, TREND_WINDOW
+from ui.style import set_role, theme_color
+
+
+# Thread de calcul des statistiques, partagé par les vues (un seul calcul à la fois)
+_executor = None
+
+
+def _compute_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(1, thread_name_prefix="flashmaster-analytics")
+    return _executor
+
+
+class Chart(QWidget):
+    """
+    Graphique simple dessiné avec QPainter : barres (effectifs) ou ligne (taux entre 0 et 1).
+
+    Au-delà d'un point par MIN_BAR_WIDTH pixels, les valeurs voisines sont regroupées
+    (sommées pour des barres, moyennées pour une ligne) : le dessin reste rapide quelle
+    que soit la longueur de la série.
+    """
+
+    MIN_BAR_WIDTH = 3
+    MARGIN = 6
+    LABEL_HEIGHT = 16  # Bandeau réservé au-dessus du graphique pour l'échelle
+
+    def __init__(self, kind="bars", color="secondary", parent=None):
+        """
+        Constructeur du graphique.
+
+        :param kind: "bars" pour des effectifs, "line" pour des taux entre 0 et 1
+        :param color: Couleur du thème des barres ou de la ligne ("secondary", "accent"...)
+        :param parent: Widget parent
+        """
+        super().__init__(parent)
+        self.kind = kind
+        self.color = color  # Lue dans le thème actif à chaque dessin
+        self.values = np.zeros(0)
+        self.setMinimumHeight(150)
+        self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
+
+    def set_values(self, values):
+        """Remplace la série affichée (tableau NumPy ; NaN pour un point sans donnée)."""
+        self.values = np.asarray(values, dtype=np.float64)
+        self.update()
+
+    def _downsampled(self, width):
+        """Regroupe les valeurs pour tenir dans la largeur disponible."""
+        values = self.values
+        groups = max(1, width // self.MIN_BAR_WIDTH)
+        if len(values) <= groups:
+            return values
+        starts = np.linspace(0, len(values), groups, endpoint=False).astype(np.int64)
+        if self.kind == "bars":
+            return np.add.reduceat(values, starts)
+        known = ~np.isnan(values)
+        totals = np.add.reduceat(np.where(known, values, 0.0), starts)
+        counts = np.add.reduceat(known.astype(np.float64), starts)
+        result = np.full(len(starts), np.nan)
+        np.divide(totals, counts, out=result, where=counts > 0)
+        return result
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.Antialiasing)
+        label_area = QRectF(self.rect()).adjusted(self.MARGIN, self.MARGIN, -self.MARGIN, -self.MARGIN)
+        area = label_area.adjusted(0, self.LABEL_HEIGHT, 0, 0)
+        painter.setPen(QPen(QColor(theme_color("border"))))
+        painter.drawLine(area.bottomLeft(), area.bottomRight())
+
+        values = self._downsampled(int(area.width()))
+        if not len(values) or np.isnan(values).all():
+            painter.setPen(QColor(theme_color("light_text")))
+            painter.drawText(area, Qt.AlignCenter, "Aucune donnée")
+            return
+
+        step = area.width() / len(values)
+        if self.kind == "bars":
+            top = max(1.0, float(np.nanmax(values)))
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(QColor(theme_color(self.color)))
+            for position, value in enumerate(values):
+                if value > 0:
+                    height = area.height() * value / top
+                    painter.drawRect(QRectF(area.left() + position * step, area.bottom() - height,
+                                            max(1.0, step - 1), height))
+            painter.setPen(QColor(theme_color("light_text")))
+            painter.drawText(label_area, Qt.AlignTop | Qt.AlignLeft, f"max {int(top)}")
+        else:
+            painter.setPen(QPen(QColor(theme_color(self.color)), 2))
+            line = QPolygonF()
+            for position, value in enumerate(values):
+                if np.isnan(value):
+                    if line.size() > 1:
+                        painter.drawPolyline(line)
+                    line = QPolygonF()
+                    continue
+                line.append(QPointF(area.left() + (position + 0.5) * step,
+                                    area.bottom() - area.height() * value))
+            if line.size() > 1:
+                painter.drawPolyline(line)
+            elif line.size() == 1:
+                painter.drawEllipse(line.at(0), 2, 2)
+            painter.setPen(QColor(theme_color("light_text")))
+            painter.drawText(label_area, Qt.AlignTop | Qt.AlignLeft, "100%")
+
+
+class StatsView(QWidget):
+    """
+    Tableau de bord des statistiques de l'historique des révisions, pour un deck ou pour tous.
+
+    Les statistiques sont calculées par models.analytics dans un thread de travail : l'interface
+    reste réactive même avec des millions de réponses. Seul le résultat du dernier calcul
+    demandé est affiché.
+    """
+
+    PERIODS = [("30 derniers jours", 30), ("90 derniers jours", 90), ("12 derniers mois", 365), ("Tout l'historique", None)]
+
+    # Émis depuis le thread de calcul : transmis au thread de l'interface (connexion en file d'attente)
+    stats_computed = pyqtSignal(int, object)
+
+    def __init__(self, parent, deck_manager, deck_id=None):
+        """
+        Constructeur du tableau de bord.
+
+        :param parent: Parent widget (la fenêtre principale)
+        :param deck_manager: Objet qui gère les decks et les cartes
+        :param deck_id: ID du deck analysé (None pour tous les decks)
+        """
+        super().__init__(parent)
+        self.parent = parent
+        self.deck_manager = deck_manager
+        self.deck_id = deck_id
+        self.request = 0  # Numéro du dernier calcul demandé
+        self.stats_computed.connect(self.show_stats)
+        self.init_ui()
+        self.refresh_view()
+
+    def init_ui(self):
+        """Initialise l'interface du tableau de bord."""
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(20, 20, 20, 20)
+        layout.setSpacing(15)
+
+        # En-tête : retour, titre et période analysée
+        header_frame = QFrame()
+        header_frame.setObjectName("card_frame")
+        header_layout = QHBoxLayout(header_frame)
+        header_layout.setContentsMargins(15, 15, 15, 15)
+
+        back_btn = QPushButton("◀ Retour")
+        back_btn.clicked.connect(self.go_back)
+        header_layout.addWidget(back_btn)
+
+        deck = self.deck_manager.get_deck(self.deck_id) if self.deck_id else None
+        title = f"Statistiques : {deck.name}" if deck else "Statistiques : tous les decks"
+        title_label = QLabel(title)
+        set_role(title_label, "header_label")
+        title_label.setAlignment(Qt.AlignCenter)
+        header_layout.addWidget(title_label, 1)
+
+        self.period_combo = QComboBox()
+        for label, days in self.PERIODS:
+            self.period_combo.addItem(label, days)
+        self.period_combo.setCurrentIndex(1)
+        self.period_combo.currentIndexChanged.connect(self.refresh_view)
+        header_layout.addWidget(self.period_combo)
+        layout.addWidget(header_frame)
+
+        # Chiffres clés
+        self.summary_label = QLabel("Calcul des statistiques...")
+        set_role(self.summary_label, "info_label")
+        self.summary_label.setWordWrap(True)
+        layout.addWidget(self.summary_label)
+
+        # Graphiques et tableaux, dans une zone défilante
+        scroll = QScrollArea()
+        scroll.setWidgetResizable(True)
+        scroll.setFrameShape(QFrame.NoFrame)
+        content = QWidget()
+        grid = QGridLayout(content)
+        grid.setSpacing(15)
+
+        self.load_chart = Chart("bars", "secondary")
+        self.trend_chart = Chart("line", "accent")
+        self.retention_chart = Chart("line", "secondary")
+        self.hour_chart = Chart("bars", "accent")
+        self.duration_chart = Chart("bars", "secondary")
+        self.accuracy_chart = Chart("bars", "accent")
+        self.load_caption = QLabel()
+        charts = [
+            ("Révisions par jour", self.load_chart, self.load_caption),
+            (f"Précision (moyenne sur {TREND_WINDOW} jours)", self.trend_chart, None),
+            ("Rétention par jour", self.retention_chart, None),
+            ("Heure des révisions (0 h à 23 h)", self.hour_chart, None),
+            (self._duration_title(), self.duration_chart, None),
+        ]
+        if self.deck_id is not None:
+            charts.append(("Taux de réussite des cartes (0 % à 100 %)", self.accuracy_chart, None))
+        for position, (title, chart, caption) in enumerate(charts):
+            grid.addWidget(self._chart_frame(title, chart, caption), position // 2, position % 2)
+
+        row = (len(charts) + 1) // 2
+        if self.deck_id is None:
+            self.deck_table = self._table(["Deck", "Révisions", "Précision", "Rétention", "Réussite (total)"])
+            grid.addWidget(self._table_frame("Par deck", self.deck_table), row, 0, 1, 2)
+            row += 1
+        else:
+            self.deck_table = None
+        self.hardest_table = self._table(["Question", "Deck", "Réponses", "Échecs"])
+        self.hardest_table.cellDoubleClicked.connect(self.open_hardest_card)
+        grid.addWidget(self._table_frame("Cartes les plus difficiles", self.hardest_table), row, 0, 1, 2)
+
+        scroll.setWidget(content)
+        layout.addWidget(scroll, 1)
+
+    @staticmethod
+    def _duration_title():
+        edges = [f"{edge // 1000}" for edge in DURATION_EDGES[1:-1]]
+        return f"Temps de réponse (secondes : {', '.join(edges)}, plus)"
+
+    @staticmethod
+    def _chart_frame(title, chart, caption=None):
+        """Encadre un graphique avec son titre (et une légende facultative)."""
+        frame = QFrame()
+        frame.setObjectName("card_frame")
+        frame_layout = QVBoxLayout(frame)
+        frame_layout.setContentsMargins(12, 12, 12, 12)
+        title_label = QLabel(title)
+        set_role(title_label, "subheader_label")
+        frame_layout.addWidget(title_label)
+        frame_layout.addWidget(chart)
+        if caption is not None:
+            set_role(caption, "info_label")
+            frame_layout.addWidget(caption)
+        return frame
+
+    @staticmethod
+    def _table(columns):
+        table = QTableWidget(0, len(columns))
+        table.setHorizontalHeaderLabels(columns)
+        table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        table.verticalHeader().setVisible(False)
+        table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        table.setMinimumHeight(200)
+        return table
+
+    @staticmethod
+    def _table_frame(title, table):
+        frame = QFrame()
+        frame.setObjectName("card_frame")
+        frame_layout = QVBoxLayout(frame)
+        frame_layout.setContentsMargins(12, 12, 12, 12)
+        title_label = QLabel(title)
+        set_role(title_label, "subheader_label")
+        frame_layout.addWidget(title_label)
+        frame_layout.addWidget(table)
+        return frame
+
+    def refresh_view(self):
+        """Relance le calcul des statistiques pour la période choisie."""
+        history = self.deck_manager.review_history(self.deck_id)
+        if history is None:
+            return
+        self.request += 1
+        request = self.request
+        days = self.period_combo.currentData()
+        self.summary_label.setText("Calcul des statistiques...")
+        future = _compute_executor().submit(compute_review_stats, history, days)
+        future.add_done_callback(lambda done: self._computed(request, done))
+
+    def _computed(self, request, future):
+        """Fin d'un calcul, appelée dans le thread de calcul."""
+        try:
+            stats = future.result()
+        except Exception as e:
+            print(f"Erreur lors du calcul des statistiques: {e}")
+            stats = None
+        try:
+            self.stats_computed.emit(request, stats)
+        except RuntimeError:
+            # La vue a été détruite pendant le calcul
+            pass
+
+    def show_stats(self, request, stats):
+        """
+        Affiche les statistiques d'un calcul, s'il correspond à la dernière demande.
+
+        :param request: Numéro du calcul
+        :param stats: Dictionnaire retourné par compute_review_stats (None en cas d'erreur)
+        """
+        if request != self.request:
+            return
+        if stats is None:
+            self.summary_label.setText("Les statistiques n'ont pas pu être calculées.")
+            return
+
+        if stats["total_reviews"]:
+            parts = [f"{stats['total_reviews']} réponses sur {stats['active_days']} jour(s) d'étude",
+                     f"précision {stats['accuracy'] * 100:.1f}%"]
+            if stats["retention"] is not None:
+                parts.append(f"rétention {stats['retention'] * 100:.1f}%")
+            parts.append(f"temps de réponse moyen {stats['mean_duration_ms'] / 1000:.1f} s")
+            summary = " · ".join(parts)
+        else:
+            summary = "Aucune révision sur cette période."
+        if stats["unanswered_cards"]:
+            summary += f"\n{stats['unanswered_cards']} carte(s) jamais révisée(s)."
+        self.summary_label.setText(summary)
+
+        first_day = day_to_date(stats["first_day"])
+        last_day = day_to_date(stats["first_day"] + len(stats["reviews_per_day"]) - 1)
+        self.load_caption.setText(f"Du {first_day:%d/%m/%Y} au {last_day:%d/%m/%Y}")
+        self.load_chart.set_values(stats["reviews_per_day"])
+        self.trend_chart.set_values(stats["accuracy_trend"])
+        self.retention_chart.set_values(stats["retention_per_day"])
+        self.hour_chart.set_values(stats["hour_histogram"])
+        self.duration_chart.set_values(stats["duration_histogram"])
+        if stats["accuracy_histogram"] is not None:
+            self.accuracy_chart.set_values(stats["accuracy_histogram"])
+
+        if self.deck_table is not None:
+            self._fill_deck_table(stats)
+        self._fill_hardest_table(stats)
+
+    @staticmethod
+    def _percent(value):
+        return "—" if np.isnan(value) else f"{value * 100:.1f}%"
+
+    def _fill_deck_table(self, stats):
+        """Remplit le tableau par deck, du deck le plus révisé au moins révisé."""
+        decks = stats["decks"]
+        order = np.argsort(-stats["deck_reviews"], kind="stable")
+        self.deck_table.setRowCount(len(order))
+        for row, position in enumerate(order):
+            values = [decks[position][1],
+                      str(int(stats["deck_reviews"][position])),
+                      self._percent(stats["deck_accuracy"][position]),
+                      self._percent(stats["deck_retention"][position]),
+                      self._percent(stats["deck_all_time_accuracy"][position])]
+            for column, value in enumerate(values):
+                self.deck_table.setItem(row, column, QTableWidgetItem(value))
+
+    def _fill_hardest_table(self, stats):
+        """Remplit le tableau des cartes les plus difficiles."""
+        hardest = stats["hardest"]
+        self.hardest_table.setRowCount(len(hardest))
+        for row, (card_id, deck_id, front, reviews, failures) in enumerate(hardest):
+            deck = self.deck_manager.get_deck(deck_id)
+            question = QTableWidgetItem(front)
+            question.setData(Qt.UserRole, (deck_id, card_id))
+            values = [question, QTableWidgetItem(deck.name if deck else ""),
+                      QTableWidgetItem(str(reviews)), QTableWidgetItem(f"{failures} ({failures / reviews * 100:.0f}%)")]
+            for column, item in enumerate(values):
+                self.hardest_table.setItem(row, column, item)
+
+    def open_hardest_card(self, row, column):
+        """Ouvre le deck d'une carte difficile (double-clic) en sélectionnant la carte."""
+        item = self.hardest_table.item(row, 0)
+        if item is None:
+            return
+        deck_id, card_id = item.data(Qt.UserRole)
+        if self.deck_manager.get_card(deck_id, card_id) is not None:
+            self.parent.show_card(deck_id, card_id)
+
+    def go_back(self):
+        """Revient à la vue du deck analysé (ou du deck sélectionné), sinon à l'accueil."""
+        deck_id = self.deck_id or self.parent.current_deck_id
+        if deck_id is not None:
+            self.parent.show_deck(deck_id)
+        else:
+            self.parent.show_home()
@@ -1,11 +1,27 @@
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
                              QProgressBar, QSizePolicy, QFrame, QMessageBox)
-from PyQt5.QtCore import Qt, QTimer
-from ui.style import get_style
-from ui.style import ACCENT_COLOR, SECONDARY_COLOR, CARD_COLOR, BORDER_RADIUS
+from PyQt5.QtCore import Qt
+from models.media_store import MediaStore
+from ui.style import set_role, set_state, theme_color
 import time
 
 class StudyView(QWidget):
+    """
+    Vue d'étude d'un deck : les cartes de la session sont présentées une à une.
+
+    Les cartes sont présentées dans l'ordre de la session d'étude (StudySession) du DeckManager :
+    une session quittée avant la fin reprend là où elle s'était arrêtée, et une carte ratée
+    est reproposée quelques cartes plus loin.
+
+    L'image d'une carte illustrée est affichée au-dessus de son texte. Les images des
+    PREFETCH_CARDS cartes suivantes sont préparées à l'avance (miniature générée puis décodée
+    hors du thread de l'interface, gardée dans le cache des miniatures) : passer à la carte
+    suivante n'attend pas le décodage d'une image.
+    """
+
+    IMAGE_SIZE = 360      # Taille maximale du plus grand côté des images affichées, en pixels
+    PREFETCH_CARDS = 3    # Nombre de cartes suivantes dont les images sont préparées
+
     def __init__(self, parent, deck_manager, deck_id):
         """
         Constructeur pour initialiser la vue d'étude d'un deck.
@@ -19,12 +35,12 @@ class StudyView(QWidget):
         self.deck_manager = deck_manager
         self.deck_id = deck_id
         self.deck = deck_manager.get_deck(deck_id)  # Récupérer les informations du deck
-        self.cards = deck_manager.get_study_cards(deck_id)  # Récupérer les cartes à étudier
-        self.current_card_index = 0  # Index de la carte actuelle
+        self.session = deck_manager.start_study_session(deck_id)  # Session d'étude (nouvelle ou reprise)
         self.show_answer = False  # Indicateur pour savoir si la réponse doit être montrée
-        self.study_start_time = time.time()  # Temps de début de l'étude
-        self.correct_answers = 0  # Nombre de réponses correctes
-        self.total_answers = 0  # Nombre total de réponses
+        self.card_shown_at = time.monotonic()  # Affichage de la carte actuelle, pour le temps de réponse
+        self.thumbnails = parent.thumbnails  # Cache des miniatures de la fenêtre principale
+        self.waiting_image = None  # Image de la carte actuelle en cours de préparation
+        self.thumbnails.thumbnail_ready.connect(self.on_thumbnail_ready)
         self.init_ui()  # Initialisation de l'interface utilisateur
 
     def init_ui(self):
@@ -43,14 +59,14 @@ class StudyView(QWidget):
         back_btn.clicked.connect(self.return_to_deck)  # Fonction pour revenir à la vue du deck
         header_layout.addWidget(back_btn)
 
-        title_label = QLabel(f"Étude: {self.deck['name']}")  # Titre de l'étude (nom du deck)
-        title_label.setStyleSheet(get_style("header_label"))
+        title_label = QLabel(f"Étude: {self.deck.name}")  # Titre de l'étude (nom du deck)
+        set_role(title_label, "header_label")
         title_label.setAlignment(Qt.AlignCenter)
         header_layout.addWidget(title_label, 1)
 
         # Compteur de cartes
         self.counter_label = QLabel()
-        self.counter_label.setStyleSheet(get_style("info_label"))
+        set_role(self.counter_label, "info_label")
         self.update_counter()  # Mise à jour du compteur
         header_layout.addWidget(self.counter_label)
 
@@ -63,13 +79,13 @@ class StudyView(QWidget):
         info_layout.setContentsMargins(15, 15, 15, 15)
 
         progress_label = QLabel("Progression:")  # Titre pour la barre de progression
-        progress_label.setStyleSheet(get_style("subheader_label"))
+        set_role(progress_label, "subheader_label")
         info_layout.addWidget(progress_label)
 
         # Barre de progression
         self.progress_bar = QProgressBar()
-        self.progress_bar.setMaximum(len(self.cards))
-        self.progress_bar.setValue(0)
+        self.progress_bar.setMaximum(len(self.session))
+        self.progress_bar.setValue(self.session.position)
         self.progress_bar.setTextVisible(True)
         self.progress_bar.setFormat("%v/%m cartes")
         info_layout.addWidget(self.progress_bar)
@@ -78,7 +94,7 @@ class StudyView(QWidget):
 
         # Conteneur pour la carte avec style amélioré
         self.card_container = QFrame()
-        self.card_container.setObjectName("card_frame")
+        set_role(self.card_container, "flashcard")
         self.card_container.setMinimumHeight(300)
         self.card_container.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
 
@@ -86,8 +102,15 @@ class StudyView(QWidget):
         card_layout.setContentsMargins(20, 20, 20, 20)
         card_layout.setAlignment(Qt.AlignCenter)
 
+        # Image de la carte, masquée pour les cartes sans image
+        self.card_image = QLabel()
+        self.card_image.setAlignment(Qt.AlignCenter)
+        self.card_image.setVisible(False)
+        card_layout.addWidget(self.card_image)
+
         # Contenu de la carte
         self.card_content = QLabel()
+        set_role(self.card_content, "card_text")
         self.card_content.setAlignment(Qt.AlignCenter)
         self.card_content.setWordWrap(True)
         self.card_content.setTextInteractionFlags(Qt.TextSelectableByMouse)
@@ -97,7 +120,7 @@ class StudyView(QWidget):
 
         # Bouton pour afficher la réponse
         self.show_answer_btn = QPushButton("Afficher la réponse")
-        self.show_answer_btn.setStyleSheet(get_style("action_button"))
+        set_role(self.show_answer_btn, "action_button")
         self.show_answer_btn.setMinimumHeight(50)
         self.show_answer_btn.clicked.connect(self.toggle_answer)
         layout.addWidget(self.show_answer_btn)
@@ -108,13 +131,13 @@ class StudyView(QWidget):
         response_layout.setSpacing(15)
 
         self.correct_btn = QPushButton("Correct ✓")
-        self.correct_btn.setStyleSheet(get_style("correct_button"))
+        set_role(self.correct_btn, "correct_button")
         self.correct_btn.setMinimumHeight(50)
         self.correct_btn.clicked.connect(lambda: self.process_answer(True))
         response_layout.addWidget(self.correct_btn)
 
         self.incorrect_btn = QPushButton("Incorrect ✗")
-        self.incorrect_btn.setStyleSheet(get_style("incorrect_button"))
+        set_role(self.incorrect_btn, "incorrect_button")
         self.incorrect_btn.setMinimumHeight(50)
         self.incorrect_btn.clicked.connect(lambda: self.process_answer(False))
         response_layout.addWidget(self.incorrect_btn)
@@ -123,54 +146,103 @@ class StudyView(QWidget):
         layout.addWidget(self.response_buttons)
 
         # Charger la première carte
-        if self.cards:
+        if len(self.session):
             self.load_current_card()
         else:
             self.show_no_cards_message()
 
     def update_counter(self):
         """Met à jour le compteur de cartes."""
-        current = self.current_card_index + 1
-        total = len(self.cards)
+        total = len(self.session)
+        current = min(self.session.position + 1, total)
         self.counter_label.setText(f"{current}/{total}")
 
+    def current_card(self):
+        """Retourne la carte actuelle de la session (les cartes supprimées entre-temps sont passées), ou None."""
+        card_id = self.session.current_card_id()
+        while card_id is not None:
+            card = self.deck_manager.get_card(self.deck_id, card_id)
+            if card is not None:
+                return card
+            self.session.skip()
+            card_id = self.session.current_card_id()
+        return None
+
     def load_current_card(self):
         """Charge la carte actuelle avec style amélioré."""
-        if not self.cards or self.current_card_index >= len(self.cards):
+        card = self.current_card()
+        if card is None:
             self.show_complete_message()
             return
 
-        card = self.cards[self.current_card_index]
         self.show_answer = False
+        self.card_shown_at = time.monotonic()
 
         # Affichage de la question (face avant de la carte)
-        self.card_content.setStyleSheet(get_style("card_front"))
-        self.card_content.setText(card["front"])
+        set_state(self.card_content, "side", "front")
+        self.card_content.setText(card.front)
 
         # Mise à jour du texte du bouton
         self.show_answer_btn.setText("Afficher la réponse")
         self.response_buttons.setVisible(False)
 
-        # Animer la carte (effet de transition simple)
-        self.card_container.setStyleSheet(get_style("flashcard"))
+        self.show_card_image(card)
+        self.prefetch_images()
+
+    def image_name(self, card):
+        """Retourne le nom dans le magasin de la première image d'une carte, ou None."""
+        if not card.has_media:
+            return None
+        for media in card.media:
+            if media.type == "image" and MediaStore.is_stored_name(media.path):
+                return media.path
+        return None
+
+    def show_card_image(self, card):
+        """Affiche l'image de la carte, ou la masque ; une image pas encore prête s'affichera à son arrivée."""
+        name = self.image_name(card)
+        self.waiting_image = None
+        pixmap = self.thumbnails.thumbnail(name, self.IMAGE_SIZE) if name else None
+        if pixmap is None:
+            self.waiting_image = name
+            self.card_image.clear()
+            self.card_image.setVisible(False)
+            return
+        self.card_image.setPixmap(pixmap)
+        self.card_image.setVisible(True)
+
+    def prefetch_images(self):
+        """Prépare les images des prochaines cartes de la session."""
+        for card_id in self.session.upcoming_card_ids(self.PREFETCH_CARDS):
+            card = self.deck_manager.get_card(self.deck_id, card_id)
+            name = self.image_name(card) if card is not None else None
+            if name:
+                self.thumbnails.prefetch(name, self.IMAGE_SIZE)
+
+    def on_thumbnail_ready(self, name, size):
+        """Affiche l'image de la carte actuelle dès qu'elle est prête."""
+        if size != self.IMAGE_SIZE or name != self.waiting_image:
+            return
+        card = self.current_card()
+        if card is not None:
+            self.show_card_image(card)
 
     def toggle_answer(self):
         """Affiche ou cache la réponse de la carte actuelle."""
-        if not self.cards or self.current_card_index >= len(self.cards):
+        card = self.current_card()
+        if card is None:
             return
 
-        card = self.cards[self.current_card_index]
-
         if self.show_answer:
             # Affiche la question (face avant)
-            self.card_content.setStyleSheet(get_style("card_front"))
-            self.card_content.setText(card["front"])
+            set_state(self.card_content, "side", "front")
+            self.card_content.setText(card.front)
             self.show_answer_btn.setText("Afficher la réponse")
             self.response_buttons.setVisible(False)
         else:
             # Affiche la réponse (face arrière)
-            self.card_content.setStyleSheet(get_style("card_back"))
-            self.card_content.setText(card["back"])
+            set_state(self.card_content, "side", "back")
+            self.card_content.setText(card.back)
             self.show_answer_btn.setText("Cacher la réponse")
             self.response_buttons.setVisible(True)
 
@@ -178,24 +250,23 @@ class StudyView(QWidget):
 
     def process_answer(self, is_correct):
         """Traite la réponse de l'utilisateur et passe à la carte suivante."""
-        if not self.cards or self.current_card_index >= len(self.cards):
+        card = self.current_card()
+        if card is None:
             return
 
-        card = self.cards[self.current_card_index]
+        # Chaque réponse est ajoutée à l'historique, avec le temps passé sur la carte
+        duration_ms = int((time.monotonic() - self.card_shown_at) * 1000)
+        self.deck_manager.record_review(card.id, is_correct, duration_ms, self.session.session_id)
 
-        # Mise à jour des statistiques de la carte
-        self.deck_manager.update_card_result(self.deck_id, card["id"], is_correct)
+        # Statistiques de la session et passage à la carte suivante ; une carte ratée est reproposée
+        # plus loin, mais seule sa première réponse compte pour ses statistiques et sa planification
+        if self.session.answer(is_correct):
+            self.deck_manager.update_card_result(self.deck_id, card.id, is_correct)
 
-        # Mise à jour des statistiques de la session
-        self.total_answers += 1
-        if is_correct:
-            self.correct_answers += 1
+        self.progress_bar.setMaximum(len(self.session))
+        self.progress_bar.setValue(self.session.position)
 
-        # Passer à la carte suivante
-        self.current_card_index += 1
-        self.progress_bar.setValue(self.current_card_index)
-
-        if self.current_card_index < len(self.cards):
+        if not self.session.finished:
             self.update_counter()
             self.load_current_card()
         else:
@@ -203,22 +274,29 @@ class StudyView(QWidget):
 
     def show_no_cards_message(self):
         """Affiche un message lorsqu'il n'y a pas de cartes à étudier."""
-        self.card_content.setText("Ce deck ne contient aucune carte à étudier !")
+        if self.deck.summary.card_count > 0:
+            # Toutes les cartes sont planifiées plus tard ou les limites du jour sont atteintes
+            self.card_content.setText("Aucune carte à réviser aujourd'hui, revenez demain !")
+        else:
+            self.card_content.setText("Ce deck ne contient aucune carte à étudier !")
         self.show_answer_btn.setEnabled(False)
 
     def show_complete_message(self):
         """Affiche un message de fin d'étude stylisé."""
-        elapsed_time = time.time() - self.study_start_time
+        session = self.session
+        self.deck_manager.end_study_session(self.deck_id)  # La prochaine session repartira des cartes à étudier
+
+        elapsed_time = time.time() - session.started_at
         minutes = int(elapsed_time // 60)
         seconds = int(elapsed_time % 60)
 
         success_rate = 0
-        if self.total_answers > 0:
-            success_rate = (self.correct_answers / self.total_answers) * 100
+        if session.total_answers > 0:
+            success_rate = (session.correct_answers / session.total_answers) * 100
 
         message = f"""
         <div style='text-align: center;'>
-            <h1 style='color: {ACCENT_COLOR}; font-size: 24px;'>Félicitations !</h1>
+            <h1 style='color: {theme_color('accent')}; font-size: 24px;'>Félicitations !</h1>
             <p style='font-size: 16px;'>Vous avez terminé votre session d'étude.</p>
             <br>
             <table style='margin: auto; text-align: left;'>
@@ -228,11 +306,11 @@ class StudyView(QWidget):
                 </tr>
                 <tr>
                     <td style='padding: 8px; font-weight: bold;'>Cartes étudiées:</td>
-                    <td style='padding: 8px;'>{len(self.cards)}</td>
+                    <td style='padding: 8px;'>{session.card_count}</td>
                 </tr>
                 <tr>
                     <td style='padding: 8px; font-weight: bold;'>Réponses correctes:</td>
-                    <td style='padding: 8px;'>{self.correct_answers}/{self.total_answers}</td>
+                    <td style='padding: 8px;'>{session.correct_answers}/{session.total_answers}</td>
                 </tr>
                 <tr>
                     <td style='padding: 8px; font-weight: bold;'>Taux de réussite:</td>
@@ -240,35 +318,25 @@ class StudyView(QWidget):
                 </tr>
             </table>
             <br>
-            <p style='font-style: italic; color: {SECONDARY_COLOR};'>
+            <p style='font-style: italic; color: {theme_color('secondary')};'>
                 Continuez votre progression en étudiant régulièrement !
             </p>
         </div>
         """
 
         self.card_content.setText(message)
+        self.card_image.setVisible(False)
+        self.waiting_image = None
         self.show_answer_btn.setEnabled(False)
         self.response_buttons.setVisible(False)
 
         # Application du style pour le conteneur de fin de session
-        self.card_container.setStyleSheet(f"""
-            background-color: {CARD_COLOR};
-            border: 2px solid {ACCENT_COLOR};
-            border-radius: {BORDER_RADIUS * 2}px;
-            padding: 20px;
-        """)
+        set_state(self.card_container, "state", "complete")
 
         # Affichage du message de fin de session
         QMessageBox.information(self, "Session terminée",
                                 f"Session terminée avec un taux de réussite de {success_rate:.1f}%")
 
     def return_to_deck(self):
-        """Retourne à la vue du deck."""
-        # Recherche et mise à jour de la vue du deck dans le panneau principal
-        for i in range(self.parent.right_panel.count()):
-            widget = self.parent.right_panel.widget(i)
-            if hasattr(widget, 'deck_id') and widget.deck_id == self.deck_id:
-                self.parent.right_panel.setCurrentWidget(widget)
-                widget.refresh_cards()  # Rafraîchir la vue des cartes
-                QTimer.singleShot(100, lambda: self.deleteLater())  # Supprimer cette vue après un court délai
-                break
\ No newline at end of file
+        """Termine la session et retourne à la vue du deck (mise à jour) ; cette vue est ensuite détruite."""
+        self.parent.close_study_view(self.deck_id)
@@ -1,3 +1,4 @@
+from PyQt5.QtCore import Qt
 from PyQt5.QtGui import QPalette, QColor, QFont
 
 
@@ -20,54 +21,208 @@ PADDING = 12                   # Espacement standard
 BORDER_RADIUS = 6              # Arrondi des coins
 BUTTON_HEIGHT = 36             # Hauteur des boutons standard
 
-def apply_stylesheet(app):
-    """
-    Applique la feuille de style globale à l'application Qt.
-    Personnalise la palette de couleurs et applique un thème QSS.
-    """
+# === Thèmes ===
+# Les constantes ci-dessus sont les couleurs du thème clair ; les couleurs du thème actif
+# s'obtiennent par theme_color (graphiques et éléments dessinés à la main).
+THEMES = {
+    "light": {
+        "primary": PRIMARY_COLOR,
+        "secondary": SECONDARY_COLOR,
+        "accent": ACCENT_COLOR,
+        "warning": WARNING_COLOR,
+        "danger": DANGER_COLOR,
+        "background": BACKGROUND_COLOR,
+        "card": CARD_COLOR,
+        "text": TEXT_COLOR,
+        "light_text": LIGHT_TEXT_COLOR,
+        "border": BORDER_COLOR,
+        "pressed": PRIMARY_COLOR,
+    },
+    "dark": {
+        "primary": "#ecf0f1",
+        "secondary": "#3498db",
+        "accent": "#1abc9c",
+        "warning": "#f39c12",
+        "danger": "#e74c3c",
+        "background": "#1e2226",
+        "card": "#2a2f35",
+        "text": "#ecf0f1",
+        "light_text": "#95a5a6",
+        "border": "#3d444c",
+        "pressed": "#2c3e50",
+    },
+}
 
-    # Définition de la police globale
-    font = QFont("Segoe UI", 10)
-    app.setFont(font)
+# Sélecteur de chaque rôle dans la feuille de style de l'application, et style qui lui est appliqué.
+# Un widget reçoit son rôle par set_role, et ses états (face de la carte, fin de session)
+# par set_state : la feuille de style n'est jamais modifiée, Qt réapplique seulement
+# les règles déjà compilées au widget concerné.
+ROLE_RULES = (
+    ('QFrame[role="card_container"]', "card_container"),
+    ('QLabel[role="header_label"]', "header_label"),
+    ('QLabel[role="subheader_label"]', "subheader_label"),
+    ('QLabel[role="info_label"]', "info_label"),
+    ('QFrame[role="separator"]', "separator"),
+    ('QPushButton[role="correct_button"]', "correct_button"),
+    ('QPushButton[role="incorrect_button"]', "incorrect_button"),
+    ('QPushButton[role="action_button"]', "action_button"),
+    ('QLabel[role="card_text"][side="front"]', "card_front"),
+    ('QLabel[role="card_text"][side="back"]', "card_back"),
+    ('QLabel[role="stat_label"]', "stat_label"),
+    ('QFrame[role="flashcard"]', "flashcard"),
+    ('QFrame[role="flashcard"][state="complete"]', "flashcard_complete"),
+    ('QLineEdit[role="search_box"]', "search_box"),
+    ('QLabel[role="tag_label"]', "tag_label"),
+    ('QLabel[role="logo"]', "logo"),
+)
 
-    # Création et application de la palette personnalisée
-    palette = QPalette()
-    palette.setColor(QPalette.Window, QColor(BACKGROUND_COLOR))
-    palette.setColor(QPalette.WindowText, QColor(TEXT_COLOR))
-    palette.setColor(QPalette.Base, QColor(CARD_COLOR))
-    palette.setColor(QPalette.AlternateBase, QColor(BACKGROUND_COLOR))
-    palette.setColor(QPalette.ToolTipBase, QColor(PRIMARY_COLOR))
-    palette.setColor(QPalette.ToolTipText, QColor(CARD_COLOR))
-    palette.setColor(QPalette.Text, QColor(TEXT_COLOR))
-    palette.setColor(QPalette.Button, QColor(BACKGROUND_COLOR))
-    palette.setColor(QPalette.ButtonText, QColor(TEXT_COLOR))
-    palette.setColor(QPalette.Link, QColor(SECONDARY_COLOR))
-    palette.setColor(QPalette.Highlight, QColor(SECONDARY_COLOR))
-    palette.setColor(QPalette.HighlightedText, QColor(CARD_COLOR))
-    app.setPalette(palette)
-
-    # Style général en QSS (Qt Style Sheets)
-    app.setStyleSheet(f"""
+_current_theme = "light"
+_stylesheets = {}    # Thème -> feuille de style de l'application, construite une seule fois
+_styles = {}         # Thème -> styles des composants (get_style)
+
+
+def _build_styles(colors):
+    """Construit les styles des composants pour les couleurs d'un thème."""
+    return {
+        "card_container": f"""
+            background-color: {colors['card']};
+            border-radius: {BORDER_RADIUS}px;
+            border: 1px solid {colors['border']};
+            padding: {PADDING}px;
+        """,
+        "header_label": f"""
+            color: {colors['primary']};
+            font-size: 18px;
+            font-weight: bold;
+        """,
+        "subheader_label": f"""
+            color: {colors['primary']};
+            font-size: 14px;
+            font-weight: bold;
+        """,
+        "info_label": f"""
+            color: {colors['light_text']};
+            font-size: 12px;
+        """,
+        "separator": f"""
+            background-color: {colors['border']};
+            min-height: 1px;
+            max-height: 1px;
+        """,
+        "correct_button": f"""
+            background-color: {colors['accent']};
+            color: white;
+            border-radius: {BORDER_RADIUS}px;
+            padding: 6px {PADDING}px;
+            min-height: {BUTTON_HEIGHT}px;
+            font-weight: bold;
+        """,
+        "incorrect_button": f"""
+            background-color: {colors['danger']};
+            color: white;
+            border-radius: {BORDER_RADIUS}px;
+            padding: 6px {PADDING}px;
+            min-height: {BUTTON_HEIGHT}px;
+            font-weight: bold;
+        """,
+        "action_button": f"""
+            background-color: {colors['secondary']};
+            color: white;
+            border-radius: {BORDER_RADIUS}px;
+            padding: 6px {PADDING}px;
+            min-height: {BUTTON_HEIGHT}px;
+        """,
+        "card_front": f"""
+            font-size: 20px;
+            color: {colors['text']};
+            font-weight: bold;
+        """,
+        "card_back": f"""
+            font-size: 18px;
+            color: {colors['text']};
+        """,
+        "stat_label": f"""
+            background-color: {colors['background']};
+            padding: 4px 10px;
+            border-radius: {BORDER_RADIUS}px;
+            font-size: 12px;
+            color: {colors['light_text']};
+        """,
+        "progress_bar": f"""
+            QProgressBar {{
+                background-color: {colors['background']};
+                border-radius: {BORDER_RADIUS}px;
+                text-align: center;
+                height: 20px;
+            }}
+            QProgressBar::chunk {{
+                background-color: {colors['secondary']};
+                border-radius: {BORDER_RADIUS - 1}px;
+            }}
+        """,
+        "flashcard": f"""
+            background-color: {colors['card']};
+            border: 2px solid {colors['secondary']};
+            border-radius: {BORDER_RADIUS * 2}px;
+            padding: 20px;
+        """,
+        "search_box": f"""
+            background-color: {colors['card']};
+            border: 1px solid {colors['border']};
+            border-radius: {BORDER_RADIUS}px;
+            padding: 8px 10px;
+            font-size: 13px;
+        """,
+        "tag_label": f"""
+            background-color: {colors['secondary']};
+            color: white;
+            border-radius: {BORDER_RADIUS}px;
+            padding: 2px 8px;
+            font-size: 11px;
+        """,
+        "flashcard_complete": f"""
+            border: 2px solid {colors['accent']};
+        """,
+        "logo": f"""
+            color: {colors['secondary']};
+        """
+    }
+
+
+def _theme_styles(theme):
+    """Retourne les styles des composants d'un thème (construits au premier appel)."""
+    styles = _styles.get(theme)
+    if styles is None:
+        styles = _styles[theme] = _build_styles(THEMES[theme])
+    return styles
+
+
+def _build_stylesheet(theme):
+    """Construit la feuille de style de l'application (QSS) d'un thème."""
+    colors = THEMES[theme]
+    styles = _theme_styles(theme)
+    roles = "\n".join(f"{selector} {{{styles[name]}}}" for selector, name in ROLE_RULES)
+    return f"""
         /* Style général */
         QMainWindow, QDialog {{
-            background-color: {BACKGROUND_COLOR};
+            background-color: {colors['background']};
         }}
 
         /* Widgets principaux */
         QWidget {{
-            color: {TEXT_COLOR};
+            color: {colors['text']};
         }}
 
         /* Labels */
         QLabel {{
-            color: {TEXT_COLOR};
+            color: {colors['text']};
         }}
 
         /* Boutons standard */
         QPushButton {{
-            background-color: {BACKGROUND_COLOR};
-            color: {TEXT_COLOR};
-            border: 1px solid {BORDER_COLOR};
+            background-color: {colors['background']};
+            color: {colors['text']};
+            border: 1px solid {colors['border']};
             border-radius: {BORDER_RADIUS}px;
             padding: 6px {PADDING}px;
             min-height: {BUTTON_HEIGHT}px;
@@ -75,25 +230,25 @@ def apply_stylesheet(app):
         }}
 
         QPushButton:hover {{
-            background-color: {SECONDARY_COLOR};
+            background-color: {colors['secondary']};
             color: white;
-            border: 1px solid {SECONDARY_COLOR};
+            border: 1px solid {colors['secondary']};
         }}
 
         QPushButton:pressed {{
-            background-color: {PRIMARY_COLOR};
+            background-color: {colors['pressed']};
             color: white;
         }}
 
         QPushButton:disabled {{
-            background-color: {BACKGROUND_COLOR};
-            color: {LIGHT_TEXT_COLOR};
-            border: 1px solid {BORDER_COLOR};
+            background-color: {colors['background']};
+            color: {colors['light_text']};
+            border: 1px solid {colors['border']};
         }}
 
         /* Boutons d'action positive */
         QPushButton#accent_button {{
-            background-color: {ACCENT_COLOR};
+            background-color: {colors['accent']};
             color: white;
             border: none;
         }}
@@ -104,7 +259,7 @@ def apply_stylesheet(app):
 
         /* Boutons dangereux */
         QPushButton#danger_button {{
-            background-color: {DANGER_COLOR};
+            background-color: {colors['danger']};
             color: white;
             border: none;
         }}
@@ -115,168 +270,178 @@ def apply_stylesheet(app):
 
         /* Liste et tableaux */
         QListWidget, QTableWidget {{
-            background-color: {CARD_COLOR};
-            border: 1px solid {BORDER_COLOR};
+            background-color: {colors['card']};
+            border: 1px solid {colors['border']};
             border-radius: {BORDER_RADIUS}px;
             outline: none;
         }}
 
         QListWidget::item {{
             padding: 8px {PADDING}px;
-            border-bottom: 1px solid {BORDER_COLOR};
+            border-bottom: 1px solid {colors['border']};
         }}
 
         QListWidget::item:selected {{
-            background-color: {SECONDARY_COLOR};
+            background-color: {colors['secondary']};
             color: white;
         }}
 
         QTableWidget {{
-            gridline-color: {BORDER_COLOR};
+            gridline-color: {colors['border']};
         }}
 
         QHeaderView::section {{
-            background-color: {BACKGROUND_COLOR};
-            color: {TEXT_COLOR};
+            background-color: {colors['background']};
+            color: {colors['text']};
             padding: 8px;
             border: none;
-            border-bottom: 1px solid {BORDER_COLOR};
+            border-bottom: 1px solid {colors['border']};
         }}
 
         /* Champs de texte */
         QLineEdit, QTextEdit {{
-            background-color: {CARD_COLOR};
-            border: 1px solid {BORDER_COLOR};
+            background-color: {colors['card']};
+            border: 1px solid {colors['border']};
             border-radius: {BORDER_RADIUS}px;
             padding: 8px;
         }}
 
         QLineEdit:focus, QTextEdit:focus {{
-            border: 1px solid {SECONDARY_COLOR};
+            border: 1px solid {colors['secondary']};
         }}
 
         /* Barres de progression */
         QProgressBar {{
-            border: 1px solid {BORDER_COLOR};
+            border: 1px solid {colors['border']};
             border-radius: {BORDER_RADIUS}px;
-            background-color: {BACKGROUND_COLOR};
+            background-color: {colors['background']};
             padding: 1px;
             text-align: center;
         }}
 
         QProgressBar::chunk {{
-            background-color: {SECONDARY_COLOR};
+            background-color: {colors['secondary']};
             border-radius: {BORDER_RADIUS - 1}px;
         }}
 
         /* Conteneurs de cartes */
         QFrame#card_frame {{
-            background-color: {CARD_COLOR};
+            background-color: {colors['card']};
             border-radius: {BORDER_RADIUS}px;
-            border: 1px solid {BORDER_COLOR};
+            border: 1px solid {colors['border']};
         }}
-    """)
+    
+        /* Rôles des composants (set_role) et leurs états (set_state) */
+        {roles}
+    """
 
 
-def get_style(style_name):
-    """Retourne des styles spécifiques pour différents composants."""
-    styles = {
-        "card_container": f"""
-            background-color: {CARD_COLOR};
-            border-radius: {BORDER_RADIUS}px;
-            border: 1px solid {BORDER_COLOR};
-            padding: {PADDING}px;
-        """,
-        "header_label": f"""
-            color: {PRIMARY_COLOR};
-            font-size: 18px;
-            font-weight: bold;
-        """,
-        "subheader_label": f"""
-            color: {PRIMARY_COLOR};
-            font-size: 14px;
-            font-weight: bold;
-        """,
-        "info_label": f"""
-            color: {LIGHT_TEXT_COLOR};
-            font-size: 12px;
-        """,
-        "separator": f"""
-            background-color: {BORDER_COLOR};
-            min-height: 1px;
-            max-height: 1px;
-        """,
-        "correct_button": f"""
-            background-color: {ACCENT_COLOR};
-            color: white;
-            border-radius: {BORDER_RADIUS}px;
-            padding: 6px {PADDING}px;
-            min-height: {BUTTON_HEIGHT}px;
-            font-weight: bold;
-        """,
-        "incorrect_button": f"""
-            background-color: {DANGER_COLOR};
-            color: white;
-            border-radius: {BORDER_RADIUS}px;
-            padding: 6px {PADDING}px;
-            min-height: {BUTTON_HEIGHT}px;
-            font-weight: bold;
-        """,
-        "action_button": f"""
-            background-color: {SECONDARY_COLOR};
-            color: white;
-            border-radius: {BORDER_RADIUS}px;
-            padding: 6px {PADDING}px;
-            min-height: {BUTTON_HEIGHT}px;
-        """,
-        "card_front": f"""
-            font-size: 20px;
-            color: {TEXT_COLOR};
-            font-weight: bold;
-        """,
-        "card_back": f"""
-            font-size: 18px;
-            color: {TEXT_COLOR};
-        """,
-        "stat_label": f"""
-            background-color: {BACKGROUND_COLOR};
-            padding: 4px 10px;
-            border-radius: {BORDER_RADIUS}px;
-            font-size: 12px;
-            color: {LIGHT_TEXT_COLOR};
-        """,
-        "progress_bar": f"""
-            QProgressBar {{
-                background-color: {BACKGROUND_COLOR};
-                border-radius: {BORDER_RADIUS}px;
-                text-align: center;
-                height: 20px;
-            }}
-            QProgressBar::chunk {{
-                background-color: {SECONDARY_COLOR};
-                border-radius: {BORDER_RADIUS - 1}px;
-            }}
-        """,
-        "flashcard": f"""
-            background-color: {CARD_COLOR};
-            border: 2px solid {SECONDARY_COLOR};
-            border-radius: {BORDER_RADIUS * 2}px;
-            padding: 20px;
-        """,
-        "search_box": f"""
-            background-color: {CARD_COLOR};
-            border: 1px solid {BORDER_COLOR};
-            border-radius: {BORDER_RADIUS}px;
-            padding: 8px 10px;
-            font-size: 13px;
-        """,
-        "tag_label": f"""
-            background-color: {SECONDARY_COLOR};
-            color: white;
-            border-radius: {BORDER_RADIUS}px;
-            padding: 2px 8px;
-            font-size: 11px;
-        """
-    }
+def _build_palette(colors):
+    """Construit la palette de couleurs Qt d'un thème."""
+    palette = QPalette()
+    palette.setColor(QPalette.Window, QColor(colors["background"]))
+    palette.setColor(QPalette.WindowText, QColor(colors["text"]))
+    palette.setColor(QPalette.Base, QColor(colors["card"]))
+    palette.setColor(QPalette.AlternateBase, QColor(colors["background"]))
+    palette.setColor(QPalette.ToolTipBase, QColor(colors["primary"]))
+    palette.setColor(QPalette.ToolTipText, QColor(colors["card"]))
+    palette.setColor(QPalette.Text, QColor(colors["text"]))
+    palette.setColor(QPalette.Button, QColor(colors["background"]))
+    palette.setColor(QPalette.ButtonText, QColor(colors["text"]))
+    palette.setColor(QPalette.Link, QColor(colors["secondary"]))
+    palette.setColor(QPalette.Highlight, QColor(colors["secondary"]))
+    palette.setColor(QPalette.HighlightedText, QColor(colors["card"]))
+    return palette
+
+
+def stylesheet(theme=None):
+    """
+    Retourne la feuille de style de l'application pour un thème.
+    Elle est construite au premier appel puis gardée : changer de thème ne la reconstruit pas.
+    """
+    theme = theme or _current_theme
+    sheet = _stylesheets.get(theme)
+    if sheet is None:
+        sheet = _stylesheets[theme] = _build_stylesheet(theme)
+    return sheet
+
+
+def apply_stylesheet(app, theme=None):
+    """
+    Applique la feuille de style globale à l'application Qt.
+    Personnalise la police, la palette de couleurs et applique le thème QSS.
+    """
+
+    # Définition de la police globale
+    font = QFont("Segoe UI", 10)
+    app.setFont(font)
+
+    set_theme(app, theme or _current_theme)
+
+
+def set_theme(app, theme):
+    """
+    Change le thème de l'application pendant son exécution.
+    Les widgets ne sont pas recréés : Qt réapplique la palette et la feuille de style du thème.
+
+    :param app: L'application Qt
+    :param theme: Le nom du thème ("light" ou "dark")
+    :return: True si le thème a été appliqué, False s'il n'existe pas
+    """
+    global _current_theme
+    if theme not in THEMES:
+        print(f"Thème inconnu: {theme}")
+        return False
+
+    _current_theme = theme
+    app.setPalette(_build_palette(THEMES[theme]))
+    app.setStyleSheet(stylesheet(theme))
+    return True
+
+
+def current_theme():
+    """Retourne le nom du thème actif."""
+    return _current_theme
+
+
+def theme_color(name):
+    """Retourne une couleur du thème actif ("primary", "secondary", "text", "light_text"...)."""
+    return THEMES[_current_theme][name]
 
-    return styles.get(style_name, "")
\ No newline at end of file
+
+def set_role(widget, role):
+    """
+    Donne un rôle à un widget : il reçoit le style de ce rôle dans la feuille de style de l'application.
+
+    :param widget: Le widget
+    :param role: Le nom du rôle ("header_label", "action_button"... voir ROLE_RULES)
+    """
+    set_state(widget, "role", role)
+
+
+def set_state(widget, name, value):
+    """
+    Change une propriété dynamique d'un widget (face de la carte, fin de session...)
+    et réapplique le style du widget si elle a changé.
+
+    Seul ce widget est restylé, avec les règles déjà compilées de la feuille de style :
+    c'est bien moins coûteux qu'un setStyleSheet, qui analyse une nouvelle feuille de style
+    et restyle le widget et tous ses enfants.
+
+    :param widget: Le widget
+    :param name: Le nom de la propriété
+    :param value: La nouvelle valeur
+    """
+    if widget.property(name) == value:
+        return
+    widget.setProperty(name, value)
+    if widget.testAttribute(Qt.WA_WState_Polished):
+        # Le style des feuilles de style oublie les règles gardées pour le widget à chaque polish :
+        # l'unpolish habituel est inutile (et double le coût d'un changement d'état)
+        widget.style().polish(widget)
+        widget.update()
+
+
+def get_style(style_name):
+    """Retourne des styles spécifiques pour différents composants (thème actif)."""
+    return _theme_styles(_current_theme).get(style_name, "")
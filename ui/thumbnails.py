@@ -0,0 +1,214 @@
+import os
+from collections import OrderedDict
+
+from PyQt5.QtCore import QObject, pyqtSignal
+from PyQt5.QtGui import QImage, QPixmap
+
+
+def make_thumbnail(source, target, size):
+    """
+    Génère la miniature d'une image (exécuté dans un processus du pool).
+
+    :param source: Chemin de l'image d'origine
+    :param target: Chemin de la miniature PNG à écrire
+    :param size: Taille maximale du plus grand côté, en pixels
+    :return: True si la miniature a été écrite, False si l'image n'a pas pu être lue
+    """
+    # Importations locales : seules les classes d'image de Qt sont nécessaires dans le processus
+    from PyQt5.QtCore import Qt
+    from PyQt5.QtGui import QImage
+
+    image = QImage(source)
+    if image.isNull():
+        return False
+    if image.width() > size or image.height() > size:
+        image = image.scaled(size, size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    temp_file = f"{target}.{os.getpid()}.tmp"
+    if not image.save(temp_file, "PNG"):
+        return False
+    os.replace(temp_file, target)
+    return True
+
+
+class ThumbnailCache(QObject):
+    """
+    Miniatures des images du magasin de médias, pour la table des cartes et la vue d'étude.
+
+    Une miniature demandée est cherchée dans le cache mémoire, puis dans le cache sur disque
+    (dossier thumbnails/ du magasin). Si elle n'existe pas encore, elle est générée dans un pool
+    de processus, sans bloquer l'interface : thumbnail retourne alors None, et le signal
+    thumbnail_ready est émis quand elle est prête.
+
+    prefetch prépare une miniature à l'avance (images des prochaines cartes d'une session d'étude) :
+    même le décodage du fichier du cache sur disque se fait dans un thread, et la miniature est
+    gardée en mémoire, prête à être affichée sans attente.
+    """
+
+    thumbnail_ready = pyqtSignal(str, int)  # (nom du fichier dans le magasin, taille)
+
+    # Émis depuis un thread du pool : transmis au thread de l'interface (connexion en file d'attente)
+    generation_finished = pyqtSignal(str, int, bool)
+    image_decoded = pyqtSignal(str, int, object)  # (nom, taille, QImage ou None)
+
+    # Miniatures gardées en mémoire, les moins récemment utilisées sont oubliées au-delà
+    # de l'une ou l'autre limite (les grandes miniatures de la vue d'étude pèsent lourd)
+    MAX_PIXMAPS = 512
+    MAX_PIXMAP_BYTES = 64 * 1024 * 1024
+
+    def __init__(self, media_store, max_workers=None, parent=None):
+        """
+        Constructeur du cache de miniatures.
+
+        :param media_store: Magasin de médias (MediaStore)
+        :param max_workers: Nombre de processus de génération (par défaut, selon le nombre de cœurs)
+        :param parent: Objet parent Qt
+        """
+        super().__init__(parent)
+        self.media_store = media_store
+        self.max_workers = max_workers or max(1, min(4, (os.cpu_count() or 2) - 1))
+        self._pool = None         # Créé à la première miniature à générer
+        self._decoder = None      # Thread de décodage, créé à la première miniature à précharger
+        self._pixmaps = OrderedDict()  # (nom, taille) -> QPixmap
+        self._pixmap_bytes = 0    # Taille en mémoire des miniatures gardées
+        self._pending = set()     # (nom, taille) en cours de génération ou de décodage
+        self._failed = set()      # (nom, taille) qui ne sont pas des images lisibles
+        self.generation_finished.connect(self._on_generation_finished)
+        self.image_decoded.connect(self._on_image_decoded)
+
+    def thumbnail(self, name, size):
+        """
+        Retourne la miniature d'un fichier du magasin, ou None si elle est en cours de génération
+        (ou si le fichier n'est pas une image lisible).
+
+        :param name: Nom du fichier dans le magasin
+        :param size: Taille maximale du plus grand côté, en pixels
+        """
+        key = (name, size)
+        pixmap = self._pixmaps.get(key)
+        if pixmap is not None:
+            self._pixmaps.move_to_end(key)
+            return pixmap
+        if key in self._pending or key in self._failed:
+            return None
+
+        thumbnail_file = self.media_store.thumbnail_path(name, size)
+        if os.path.exists(thumbnail_file):
+            pixmap = QPixmap(thumbnail_file)
+            if not pixmap.isNull():
+                self._remember(key, pixmap)
+                return pixmap
+
+        self._generate(key, thumbnail_file)
+        return None
+
+    def prefetch(self, name, size):
+        """
+        Prépare une miniature sans bloquer l'interface : génération dans le pool si nécessaire,
+        puis décodage dans un thread. thumbnail_ready est émis quand elle est en mémoire.
+
+        :param name: Nom du fichier dans le magasin
+        :param size: Taille maximale du plus grand côté, en pixels
+        """
+        key = (name, size)
+        if key in self._pixmaps or key in self._pending or key in self._failed:
+            return
+        thumbnail_file = self.media_store.thumbnail_path(name, size)
+        if os.path.exists(thumbnail_file):
+            self._decode(key, thumbnail_file)
+        else:
+            self._generate(key, thumbnail_file)
+
+    @staticmethod
+    def _pixmap_size(pixmap):
+        """Taille approximative d'une miniature en mémoire, en octets."""
+        return pixmap.width() * pixmap.height() * max(1, pixmap.depth() // 8)
+
+    def _remember(self, key, pixmap):
+        """Garde une miniature en mémoire, en oubliant les moins récemment utilisées."""
+        previous = self._pixmaps.pop(key, None)
+        if previous is not None:
+            self._pixmap_bytes -= self._pixmap_size(previous)
+        self._pixmaps[key] = pixmap
+        self._pixmap_bytes += self._pixmap_size(pixmap)
+        while len(self._pixmaps) > 1 and (len(self._pixmaps) > self.MAX_PIXMAPS
+                                          or self._pixmap_bytes > self.MAX_PIXMAP_BYTES):
+            _, forgotten = self._pixmaps.popitem(last=False)
+            self._pixmap_bytes -= self._pixmap_size(forgotten)
+
+    def _generate(self, key, thumbnail_file):
+        """Confie la génération d'une miniature au pool de processus."""
+        name, size = key
+        source = self.media_store.path(name)
+        if not os.path.exists(source):
+            self._failed.add(key)
+            return
+
+        if self._pool is None:
+            # Importations différées : le démarrage de l'application n'attend pas ces modules
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+
+            # "spawn" : les processus ne doivent pas hériter de l'état de l'application Qt
+            self._pool = ProcessPoolExecutor(self.max_workers,
+                                             mp_context=multiprocessing.get_context("spawn"))
+        self._pending.add(key)
+        future = self._pool.submit(make_thumbnail, source, thumbnail_file, size)
+        future.add_done_callback(lambda done: self._generated(key, done))
+
+    def _generated(self, key, future):
+        """Fin d'une génération, appelée dans un thread du pool."""
+        try:
+            generated = not future.cancelled() and future.result()
+        except Exception as e:
+            print(f"Erreur lors de la génération d'une miniature: {e}")
+            generated = False
+        self.generation_finished.emit(key[0], key[1], generated)
+
+    def _on_generation_finished(self, name, size, generated):
+        key = (name, size)
+        self._pending.discard(key)
+        if generated:
+            # La miniature écrite est décodée hors du thread de l'interface avant d'être signalée
+            self._decode(key, self.media_store.thumbnail_path(name, size))
+        else:
+            self._failed.add(key)
+
+    def _decode(self, key, thumbnail_file):
+        """Confie le décodage d'une miniature du cache sur disque au thread de décodage."""
+        if self._decoder is None:
+            from concurrent.futures import ThreadPoolExecutor
+
+            self._decoder = ThreadPoolExecutor(1, thread_name_prefix="flashmaster-decoder")
+        self._pending.add(key)
+        future = self._decoder.submit(QImage, thumbnail_file)
+        future.add_done_callback(lambda done: self._decoded(key, done))
+
+    def _decoded(self, key, future):
+        """Fin d'un décodage, appelée dans le thread de décodage."""
+        try:
+            image = None if future.cancelled() else future.result()
+        except Exception as e:
+            print(f"Erreur lors du décodage d'une miniature: {e}")
+            image = None
+        self.image_decoded.emit(key[0], key[1], image)
+
+    def _on_image_decoded(self, name, size, image):
+        # La conversion en QPixmap doit se faire dans le thread de l'interface
+        key = (name, size)
+        self._pending.discard(key)
+        if image is None or image.isNull():
+            self._failed.add(key)
+            return
+        self._remember(key, QPixmap.fromImage(image))
+        self.thumbnail_ready.emit(name, size)
+
+    def shutdown(self):
+        """Arrête le pool de processus et le thread de décodage (à la fermeture de la fenêtre principale)."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+        if self._decoder is not None:
+            self._decoder.shutdown(wait=False, cancel_futures=True)
+            self._decoder = None
@@ -0,0 +1,85 @@
+from collections import OrderedDict
+
+
+class ViewCache:
+    """
+    Cache des vues (DeckView, StudyView) affichées dans le panneau de droite.
+
+    Les vues sont rangées par clé (type de vue, id du deck) du moins au plus récemment
+    affichée. Au-delà de max_views vues, les moins récemment affichées sont retirées
+    du QStackedWidget et détruites ; la vue affichée n'est jamais retirée.
+    """
+
+    def __init__(self, stack, max_views=8):
+        """
+        Constructeur du cache.
+
+        :param stack: QStackedWidget du panneau de droite
+        :param max_views: Nombre maximal de vues gardées (au moins 1)
+        """
+        self.stack = stack
+        self.max_views = max(1, max_views)
+        self._views = OrderedDict()  # (type de vue, id du deck) -> widget
+
+    def __len__(self):
+        return len(self._views)
+
+    def __contains__(self, key):
+        return key in self._views
+
+    def get(self, key):
+        """
+        Retourne la vue d'une clé en la marquant comme la plus récente, ou None.
+
+        :param key: Tuple (type de vue, id du deck)
+        """
+        view = self._views.get(key)
+        if view is not None:
+            self._views.move_to_end(key)
+        return view
+
+    def show(self, key, view):
+        """
+        Ajoute une vue au panneau (en remplaçant l'éventuelle vue de même clé), l'affiche,
+        puis retire les vues les moins récentes en trop.
+
+        :param key: Tuple (type de vue, id du deck)
+        :param view: Widget de la vue
+        """
+        previous = self._views.pop(key, None)
+        self._views[key] = view
+        if self.stack.indexOf(view) < 0:
+            self.stack.addWidget(view)
+        self.stack.setCurrentWidget(view)
+        if previous is not None and previous is not view:
+            self._dispose(previous)
+        self._evict()
+
+    def _evict(self):
+        """Détruit les vues les moins récemment affichées au-delà de max_views."""
+        current = self.stack.currentWidget()
+        for key in list(self._views):
+            if len(self._views) <= self.max_views:
+                break
+            if self._views[key] is not current:
+                self._dispose(self._views.pop(key))
+
+    def remove(self, key):
+        """
+        Retire et détruit la vue d'une clé, si elle existe.
+
+        :param key: Tuple (type de vue, id du deck)
+        """
+        view = self._views.pop(key, None)
+        if view is not None:
+            self._dispose(view)
+
+    def remove_deck(self, deck_id):
+        """Retire et détruit toutes les vues d'un deck (après sa suppression)."""
+        for key in [key for key in self._views if key[1] == deck_id]:
+            self.remove(key)
+
+    def _dispose(self, view):
+        """Retire une vue du panneau et planifie sa destruction."""
+        self.stack.removeWidget(view)
+        view.deleteLater()